@@ -2,14 +2,32 @@
 Core implementation of :mod:`sklearndf`
 """
 
+import asyncio
 import logging
 from abc import ABCMeta, abstractmethod
-from typing import Any, List, Mapping, Optional, Sequence, TypeVar, Union, cast
+from concurrent.futures import Executor
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+from weakref import WeakKeyDictionary, ref
 
+import numpy as np
 import pandas as pd
 from sklearn.base import (
     BaseEstimator,
     ClassifierMixin,
+    ClusterMixin,
     RegressorMixin,
     TransformerMixin,
     clone,
@@ -20,12 +38,20 @@ from pytools.fit import FittableMixin
 
 log = logging.getLogger(__name__)
 
-__all__ = ["EstimatorDF", "LearnerDF", "ClassifierDF", "RegressorDF", "TransformerDF"]
+__all__ = [
+    "EstimatorDF",
+    "LearnerDF",
+    "ClassifierDF",
+    "ClusterDF",
+    "RegressorDF",
+    "TransformerDF",
+]
 
 #
 # type variables
 #
 
+T = TypeVar("T")
 T_Self = TypeVar("T_Self")
 T_EstimatorDF = TypeVar("T_EstimatorDF")
 
@@ -211,6 +237,50 @@ class LearnerDF(EstimatorDF, metaclass=ABCMeta):
         """
         pass
 
+    # noinspection PyPep8Naming
+    async def apredict(
+        self,
+        X: pd.DataFrame,
+        *,
+        executor: Optional[Executor] = None,
+        max_wait: Optional[float] = None,
+        max_batch_size: int = 1000,
+        **predict_params: Any,
+    ) -> Union[pd.Series, pd.DataFrame]:
+        """
+        Predict outputs for the given inputs, without blocking the event loop.
+
+        Runs :meth:`.predict` in the given executor, or in the default executor of
+        the running event loop.
+
+        If a maximum wait time is given, concurrent calls are coalesced into
+        micro-batches: the inputs of all calls received within the wait time are
+        predicted in a single call to :meth:`.predict`, and each caller receives the
+        predictions for its own inputs, indexed by the index of its inputs.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param executor: the executor to run the prediction in; if ``None``, use the
+            default executor of the running event loop
+        :param max_wait: maximum time in seconds to wait for further calls to join a
+            micro-batch; if ``None``, do not batch calls
+        :param max_batch_size: maximum number of observations in a micro-batch; a
+            micro-batch is processed without further waiting once this size is
+            reached
+        :param predict_params: optional keyword parameters as required by specific
+            learner implementations
+        :return: predictions per observation as a series, or as a data frame in case
+            of multiple outputs
+        """
+        return await _call_async(
+            self,
+            "predict",
+            X,
+            executor=executor,
+            max_wait=max_wait,
+            max_batch_size=max_batch_size,
+            params=predict_params,
+        )
+
 
 class TransformerDF(EstimatorDF, TransformerMixin, metaclass=ABCMeta):
     """
@@ -277,6 +347,34 @@ class TransformerDF(EstimatorDF, TransformerMixin, metaclass=ABCMeta):
         """
         pass
 
+    # noinspection PyPep8Naming
+    def transform_xy(
+        self,
+        X: pd.DataFrame,
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        sample_weight: Optional[pd.Series] = None,
+    ) -> Tuple[
+        pd.DataFrame, Optional[Union[pd.Series, pd.DataFrame]], Optional[pd.Series]
+    ]:
+        """
+        Transform the given inputs along with the outputs and sample weights of all
+        observations.
+
+        Unlike :meth:`.transform`, which always preserves the index of its inputs,
+        transformers may remove observations using this method, e.g.,
+        :class:`.OutlierRemoverDF` in ``"drop"`` mode, returning the outputs and
+        sample weights of the remaining observations.
+        All other transformers return the result of :meth:`.transform`, and the given
+        outputs and sample weights unchanged.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param y: an optional series or data frame with one or more outputs
+        :param sample_weight: optional weights for all observations
+        :return: a tuple of the transformed inputs, and the outputs and sample weights
+            of the transformed observations
+        """
+        return self.transform(X), y, sample_weight
+
     # noinspection PyPep8Naming
     def fit_transform(
         self, X: pd.DataFrame, y: Optional[pd.Series] = None, **fit_params: Any
@@ -292,6 +390,40 @@ class TransformerDF(EstimatorDF, TransformerMixin, metaclass=ABCMeta):
         """
         return self.fit(X, y, **fit_params).transform(X)
 
+    # noinspection PyPep8Naming
+    def fit_transform_xy(
+        self,
+        X: pd.DataFrame,
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        sample_weight: Optional[pd.Series] = None,
+        **fit_params: Any,
+    ) -> Tuple[
+        pd.DataFrame, Optional[Union[pd.Series, pd.DataFrame]], Optional[pd.Series]
+    ]:
+        """
+        Fit this transformer using the given inputs, then transform the inputs along
+        with the outputs and sample weights of all observations.
+
+        Transformers that remove or merge observations, e.g., :class:`.DeduplicateDF`
+        or :class:`.OutlierRemoverDF` in ``"drop"`` mode, return the outputs and sample
+        weights of the remaining observations; all other transformers return the
+        given outputs and sample weights unchanged.
+        Pipelines use this method to fit their preprocessing steps, so that all
+        subsequent steps are fitted only to the remaining observations.
+
+        The sample weights are not used to fit this transformer, but are only passed
+        on along with the remaining observations.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param y: an optional series or data frame with one or more outputs
+        :param sample_weight: optional weights for all observations
+        :param fit_params: additional keyword parameters as required by specific
+            transformer implementations
+        :return: a tuple of the transformed inputs, and the outputs and sample weights
+            of the transformed observations
+        """
+        return self.fit_transform(X, y, **fit_params), y, sample_weight
+
     # noinspection PyPep8Naming
     @abstractmethod
     def inverse_transform(self, X: pd.DataFrame) -> pd.DataFrame:
@@ -308,6 +440,46 @@ class TransformerDF(EstimatorDF, TransformerMixin, metaclass=ABCMeta):
         """
         pass
 
+    # noinspection PyPep8Naming
+    async def atransform(
+        self,
+        X: pd.DataFrame,
+        *,
+        executor: Optional[Executor] = None,
+        max_wait: Optional[float] = None,
+        max_batch_size: int = 1000,
+    ) -> pd.DataFrame:
+        """
+        Transform the given inputs, without blocking the event loop.
+
+        Runs :meth:`.transform` in the given executor, or in the default executor of
+        the running event loop.
+
+        If a maximum wait time is given, concurrent calls are coalesced into
+        micro-batches: the inputs of all calls received within the wait time are
+        transformed in a single call to :meth:`.transform`, and each caller receives
+        the transformed rows for its own inputs, indexed by the index of its inputs.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param executor: the executor to run the transformation in; if ``None``, use
+            the default executor of the running event loop
+        :param max_wait: maximum time in seconds to wait for further calls to join a
+            micro-batch; if ``None``, do not batch calls
+        :param max_batch_size: maximum number of observations in a micro-batch; a
+            micro-batch is processed without further waiting once this size is
+            reached
+        :return: the transformed inputs
+        """
+        return await _call_async(
+            self,
+            "transform",
+            X,
+            executor=executor,
+            max_wait=max_wait,
+            max_batch_size=max_batch_size,
+            params={},
+        )
+
     @abstractmethod
     def _get_features_original(self) -> pd.Series:
         # return a mapping from this transformer's output columns to the original
@@ -319,6 +491,54 @@ class TransformerDF(EstimatorDF, TransformerMixin, metaclass=ABCMeta):
         # default behaviour: get index returned by feature_names_original_
         return self.feature_names_original_.index
 
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        # return the input columns required to compute the given output columns
+        # default behaviour: any output column may depend on all input columns
+        return self.feature_names_in_
+
+    def _get_features_in_required_by_lineage(self, features_out: pd.Index) -> pd.Index:
+        # return the original input columns of the given output columns, for
+        # transformers where each output column only depends on its original column
+        features_original = self.feature_names_original_
+        features_in = self.feature_names_in_
+        return features_in[
+            features_in.isin(
+                features_original[features_original.index.isin(features_out)]
+            )
+        ]
+
+    def _prune_features_in(
+        self, features_in: pd.Index
+    ) -> Union["TransformerDF", str, None]:
+        # return a fitted copy of this transformer that only requires the given
+        # subset of its input columns, producing only the output columns derived from
+        # them; "passthrough" if the copy would not alter its inputs; or None if
+        # this transformer cannot be pruned
+        return None
+
+    def _get_affine_parameters(
+        self,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        # for fitted transformers computing each output column as an affine function
+        # of the input column with the same name and position, return arrays with
+        # the scale, offset, and missing value replacement (or nan) per column;
+        # otherwise return None
+        return None
+
+    def _get_linear_map(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        # for fitted transformers computing their output as a linear function of their
+        # input, return the matrix and offset such that the output is computed as
+        # X @ matrix + offset; otherwise return None
+        # default behaviour: derive the linear map from the affine parameters
+        affine_parameters = self._get_affine_parameters()
+        if affine_parameters is None:
+            return None
+        scale, offset, fill = affine_parameters
+        if not np.isnan(fill).all():
+            # replacing missing values is not linear
+            return None
+        return np.diag(scale), offset
+
 
 class RegressorDF(LearnerDF, RegressorMixin, metaclass=ABCMeta):
     """
@@ -412,5 +632,273 @@ class ClassifierDF(LearnerDF, ClassifierMixin, metaclass=ABCMeta):
             per output
         """
 
+    # noinspection PyPep8Naming
+    async def apredict_proba(
+        self,
+        X: pd.DataFrame,
+        *,
+        executor: Optional[Executor] = None,
+        max_wait: Optional[float] = None,
+        max_batch_size: int = 1000,
+        **predict_params: Any,
+    ) -> Union[pd.DataFrame, List[pd.DataFrame]]:
+        """
+        Predict class probabilities for the given inputs, without blocking the event
+        loop.
+
+        Runs :meth:`.predict_proba` in the given executor, or in the default executor
+        of the running event loop.
+
+        If a maximum wait time is given, concurrent calls are coalesced into
+        micro-batches as described for :meth:`.apredict`.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param executor: the executor to run the prediction in; if ``None``, use the
+            default executor of the running event loop
+        :param max_wait: maximum time in seconds to wait for further calls to join a
+            micro-batch; if ``None``, do not batch calls
+        :param max_batch_size: maximum number of observations in a micro-batch; a
+            micro-batch is processed without further waiting once this size is
+            reached
+        :param predict_params: optional keyword parameters as required by specific
+            learner implementations
+        :return: a data frame with observations as rows and classes as columns, and
+            values as probabilities per observation and class; for multi-output
+            classifiers, a list of one observation/class data frames per output
+        """
+        return await _call_async(
+            self,
+            "predict_proba",
+            X,
+            executor=executor,
+            max_wait=max_wait,
+            max_batch_size=max_batch_size,
+            params=predict_params,
+        )
+
+
+class ClusterDF(LearnerDF, ClusterMixin, metaclass=ABCMeta):
+    """
+    Base class for augmented scikit-learn `clusterers`.
+
+    Provides enhanced support for data frames.
+    """
+
+    # noinspection PyPep8Naming
+    @abstractmethod
+    def fit_predict(
+        self,
+        X: pd.DataFrame,
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        **fit_params: Any,
+    ) -> pd.Series:
+        """
+        Fit this clusterer using the given inputs, then predict the cluster of each
+        observation.
+
+        :param X: data frame with observations as rows and features as columns
+        :param y: ignored; present for consistency with the scikit-learn API
+        :param fit_params: optional keyword parameters as required by specific
+            clusterer implementations
+        :return: the cluster labels per observation as a series
+        """
+        pass
+
+    # noinspection PyPep8Naming
+    @abstractmethod
+    def score(
+        self,
+        X: pd.DataFrame,
+        y: Optional[pd.Series] = None,
+        sample_weight: Optional[pd.Series] = None,
+    ) -> float:
+        """
+        Score this clusterer using the given inputs.
+
+        :param X: data frame with observations as rows and features as columns
+        :param y: ignored; present for consistency with the scikit-learn API
+        :param sample_weight: optional series of scalar weights per observation
+        :return: the score
+        :raises NotImplementedError: if this clusterer does not support scoring
+        """
+        pass
+
+
+#
+# Asynchronous execution and micro-batching
+#
+
+# micro-batchers for asynchronous calls, per estimator and call configuration
+_micro_batchers: WeakKeyDictionary = WeakKeyDictionary()
+
+
+# noinspection PyPep8Naming
+async def _call_async(
+    estimator: EstimatorDF,
+    method: str,
+    X: pd.DataFrame,
+    *,
+    executor: Optional[Executor],
+    max_wait: Optional[float],
+    max_batch_size: int,
+    params: Mapping[str, Any],
+) -> Any:
+    # run the given method of the estimator in an executor, optionally coalescing
+    # concurrent calls into micro-batches
+
+    if not isinstance(X, pd.DataFrame):
+        raise TypeError("arg X must be a DataFrame")
+
+    loop = asyncio.get_event_loop()
+
+    if max_wait is None:
+        return await loop.run_in_executor(
+            executor, partial(getattr(estimator, method), X, **params)
+        )
+
+    if max_wait < 0:
+        raise ValueError(f"arg max_wait must not be negative but is {max_wait}")
+    if max_batch_size < 1:
+        raise ValueError(
+            f"arg max_batch_size must be a positive integer but is {max_batch_size}"
+        )
+    if params:
+        raise ValueError(
+            f"additional parameters are not supported for micro-batched calls: "
+            f"{', '.join(params)}"
+        )
+
+    batchers: Dict[Tuple[Any, ...], _MicroBatcher] = _micro_batchers.setdefault(
+        estimator, {}
+    )
+    key = (method, loop, executor, max_wait, max_batch_size)
+    batcher = batchers.get(key)
+    if batcher is None:
+        batcher = batchers[key] = _MicroBatcher(
+            # refer to the estimator weakly, so that it can be garbage-collected
+            get_function=partial(_get_method, ref(estimator), method),
+            loop=loop,
+            executor=executor,
+            max_wait=max_wait,
+            max_batch_size=max_batch_size,
+        )
+
+    return await batcher.submit(X)
+
+
+def _get_method(
+    estimator_ref: "ref[EstimatorDF]", method: str
+) -> Callable[[pd.DataFrame], Any]:
+    # get the method of the weakly referenced estimator, as a bound method that
+    # refers to the estimator strongly and can be pickled for worker processes
+    estimator = estimator_ref()
+    if estimator is None:
+        raise ReferenceError("estimator no longer exists")
+    return getattr(estimator, method)
+
+
+class _MicroBatcher:
+    """
+    Coalesces concurrent calls of a function with a data frame argument into
+    micro-batches, and fans the results back out to the individual callers.
+
+    The function is obtained anew for each micro-batch, in the thread running the
+    event loop, and passed to the executor along with the micro-batch.
+    """
+
+    def __init__(
+        self,
+        get_function: Callable[[], Callable[[pd.DataFrame], Any]],
+        *,
+        loop: asyncio.AbstractEventLoop,
+        executor: Optional[Executor],
+        max_wait: float,
+        max_batch_size: int,
+    ) -> None:
+        self.get_function = get_function
+        self.loop = loop
+        self.executor = executor
+        self.max_wait = max_wait
+        self.max_batch_size = max_batch_size
+
+        self._pending: List[Tuple[pd.DataFrame, asyncio.Future]] = []
+        self._pending_rows = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    # noinspection PyPep8Naming
+    async def submit(self, X: pd.DataFrame) -> Any:
+        future = self.loop.create_future()
+        self._pending.append((X, future))
+        self._pending_rows += len(X)
+
+        if self._pending_rows >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = self.loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch = self._pending
+        self._pending = []
+        self._pending_rows = 0
+
+        if batch:
+            self.loop.create_task(self._process(batch))
+
+    async def _process(self, batch: List[Tuple[pd.DataFrame, asyncio.Future]]) -> None:
+        frames = [X for X, _ in batch]
+
+        if len(batch) > 1 and not all(
+            X.columns.equals(frames[0].columns) for X in frames[1:]
+        ):
+            # concatenating inputs with different columns would introduce missing
+            # values, so process each call on its own
+            await asyncio.gather(*(self._process([call]) for call in batch))
+            return
+
+        try:
+            result = await self.loop.run_in_executor(
+                self.executor,
+                self.get_function(),
+                frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True),
+            )
+        except Exception as cause:
+            if len(batch) > 1:
+                # process each call on its own, so that invalid inputs of one call
+                # do not fail the other calls coalesced into the same batch
+                await asyncio.gather(*(self._process([call]) for call in batch))
+                return
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(cause)
+            return
+
+        start = 0
+        for X, future in batch:
+            end = start + len(X)
+            if not future.done():
+                future.set_result(_slice_rows(result, start, end, X.index))
+            start = end
+
+
+def _slice_rows(
+    result: Union[pd.Series, pd.DataFrame, List[pd.DataFrame]],
+    start: int,
+    end: int,
+    index: pd.Index,
+) -> Union[pd.Series, pd.DataFrame, List[pd.DataFrame]]:
+    # get the rows start:end of a batch result, re-indexed with the given index
+    if isinstance(result, list):
+        return [_slice_rows(output, start, end, index) for output in result]
+
+    rows = result.iloc[start:end].copy()
+    rows.index = index
+    return rows
+
 
 __tracker.validate()
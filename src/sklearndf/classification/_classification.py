@@ -46,14 +46,23 @@ from sklearn.tree import DecisionTreeClassifier, ExtraTreeClassifier
 
 from pytools.api import AllTracker
 
+from .. import __sklearn_1_0__, __sklearn_version__
 from ..wrapper import make_df_classifier
 from .wrapper import (
     ClassifierChainWrapperDF,
+    HistGradientBoostingClassifierWrapperDF,
     LinearDiscriminantAnalysisWrapperDF,
     MultiOutputClassifierWrapperDF,
 )
 from .wrapper._wrapper import MetaClassifierWrapperDF
 
+if __sklearn_version__ < __sklearn_1_0__:
+    # histogram-based gradient boosting is experimental before scikit-learn 1.0
+    # noinspection PyUnresolvedReferences
+    from sklearn.experimental import enable_hist_gradient_boosting  # noqa: F401
+
+from sklearn.ensemble import HistGradientBoostingClassifier
+
 log = logging.getLogger(__name__)
 
 __all__ = [
@@ -70,6 +79,7 @@ __all__ = [
     "GaussianNBDF",
     "GaussianProcessClassifierDF",
     "GradientBoostingClassifierDF",
+    "HistGradientBoostingClassifierDF",
     "KNeighborsClassifierDF",
     "LabelPropagationDF",
     "LabelSpreadingDF",
@@ -145,6 +155,9 @@ VotingClassifierDF = make_df_classifier(
 RandomForestClassifierDF = make_df_classifier(RandomForestClassifier)
 ExtraTreesClassifierDF = make_df_classifier(ExtraTreesClassifier)
 GradientBoostingClassifierDF = make_df_classifier(GradientBoostingClassifier)
+HistGradientBoostingClassifierDF = make_df_classifier(
+    HistGradientBoostingClassifier, base_wrapper=HistGradientBoostingClassifierWrapperDF
+)
 AdaBoostClassifierDF = make_df_classifier(AdaBoostClassifier)
 BaggingClassifierDF = make_df_classifier(BaggingClassifier)
 
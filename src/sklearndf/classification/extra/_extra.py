@@ -7,6 +7,7 @@ import warnings
 from pytools.api import AllTracker
 
 from ...wrapper import make_df_classifier
+from ..wrapper import LGBMClassifierWrapperDF
 
 # since we install LGBM via conda, the warning about the Clang compiler is irrelevant
 warnings.filterwarnings("ignore", message=r"Starting from version 2\.2\.1")
@@ -34,7 +35,9 @@ __tracker = AllTracker(globals(), allow_imported_definitions=True)
 # Class definitions
 #
 
-LGBMClassifierDF = make_df_classifier(LGBMClassifier)
+LGBMClassifierDF = make_df_classifier(
+    LGBMClassifier, base_wrapper=LGBMClassifierWrapperDF
+)
 
 
 #
@@ -17,6 +17,8 @@ from pytools.api import AllTracker
 from sklearndf.transformation.wrapper import NComponentsDimensionalityReductionWrapperDF
 from sklearndf.wrapper import (
     ClassifierWrapperDF,
+    HistGradientBoostingWrapperDF,
+    LGBMWrapperDF,
     MetaEstimatorWrapperDF,
     StackingEstimatorWrapperDF,
 )
@@ -25,6 +27,8 @@ log = logging.getLogger(__name__)
 
 __all__ = [
     "ClassifierChainWrapperDF",
+    "HistGradientBoostingClassifierWrapperDF",
+    "LGBMClassifierWrapperDF",
     "LinearDiscriminantAnalysisWrapperDF",
     "MetaClassifierWrapperDF",
     "MultiOutputClassifierWrapperDF",
@@ -63,6 +67,57 @@ class LinearDiscriminantAnalysisWrapperDF(
     pass
 
 
+class HistGradientBoostingClassifierWrapperDF(
+    HistGradientBoostingWrapperDF[T_NativeClassifier],
+    ClassifierWrapperDF,
+    Generic[T_NativeClassifier],
+    metaclass=ABCMeta,
+):
+    """
+    DF wrapper for :class:`sklearn.ensemble.HistGradientBoostingClassifier`, supporting
+    early stopping on validation data frames and a cap on OpenMP threads; see
+    :class:`.HistGradientBoostingWrapperDF`.
+    """
+
+    # noinspection PyPep8Naming
+    def predict_proba(
+        self, X: pd.DataFrame, **predict_params: Any
+    ) -> Union[pd.DataFrame, List[pd.DataFrame]]:
+        """[see superclass]"""
+        with self._limit_threads():
+            return super().predict_proba(X, **predict_params)
+
+    # noinspection PyPep8Naming
+    def predict_log_proba(
+        self, X: pd.DataFrame, **predict_params: Any
+    ) -> Union[pd.DataFrame, List[pd.DataFrame]]:
+        """[see superclass]"""
+        with self._limit_threads():
+            return super().predict_log_proba(X, **predict_params)
+
+    # noinspection PyPep8Naming
+    def decision_function(
+        self, X: pd.DataFrame, **predict_params: Any
+    ) -> Union[pd.Series, pd.DataFrame]:
+        """[see superclass]"""
+        with self._limit_threads():
+            return super().decision_function(X, **predict_params)
+
+
+class LGBMClassifierWrapperDF(
+    LGBMWrapperDF[T_NativeClassifier],
+    ClassifierWrapperDF,
+    Generic[T_NativeClassifier],
+    metaclass=ABCMeta,
+):
+    """
+    DF wrapper for :class:`lightgbm.LGBMClassifier`, supporting fit parameter
+    ``dataset_cache``; see :class:`.LGBMDatasetCache`.
+    """
+
+    pass
+
+
 class MetaClassifierWrapperDF(
     MetaEstimatorWrapperDF[T_NativeClassifier],
     ClassifierWrapperDF,
@@ -0,0 +1,5 @@
+"""
+Extended versions of scikit-learn clusterers with enhanced E2E support for data
+frames.
+"""
+from ._clustering import *
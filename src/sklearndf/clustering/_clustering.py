@@ -0,0 +1,71 @@
+"""
+Core implementation of :mod:`sklearndf.clustering`
+"""
+import logging
+
+from sklearn.cluster import Birch, KMeans, MiniBatchKMeans
+
+from pytools.api import AllTracker
+
+from ..wrapper import make_df_clusterer
+from .wrapper import BirchWrapperDF, KMeansWrapperDF, MiniBatchKMeansWrapperDF
+
+log = logging.getLogger(__name__)
+
+__all__ = ["BirchDF", "KMeansDF", "MiniBatchKMeansDF"]
+
+__imported_estimators = {name for name in globals().keys() if name.endswith("DF")}
+
+
+#
+# Ensure all symbols introduced below are included in __all__
+#
+
+__tracker = AllTracker(globals(), allow_imported_definitions=True)
+
+
+#
+# Class definitions
+#
+
+
+#
+# k-means
+#
+
+KMeansDF = make_df_clusterer(KMeans, base_wrapper=KMeansWrapperDF)
+MiniBatchKMeansDF = make_df_clusterer(
+    MiniBatchKMeans, base_wrapper=MiniBatchKMeansWrapperDF
+)
+
+
+#
+# hierarchical
+#
+
+BirchDF = make_df_clusterer(Birch, base_wrapper=BirchWrapperDF)
+
+
+#
+# validate __all__
+#
+
+__tracker.validate()
+
+
+#
+# validate that __all__ comprises all symbols ending in "DF", and no others
+#
+
+__estimators = {
+    sym
+    for sym in dir()
+    if sym.endswith("DF")
+    and sym not in __imported_estimators
+    and not sym.startswith("_")
+}
+if __estimators != set(__all__):
+    raise RuntimeError(
+        "__all__ does not contain exactly all DF estimators; expected value is:\n"
+        f"{__estimators}"
+    )
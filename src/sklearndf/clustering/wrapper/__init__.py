@@ -0,0 +1,6 @@
+"""
+Wrapper classes to enhance the functionality of native clusterers conforming with the
+scikit-learn API.
+"""
+
+from ._wrapper import *
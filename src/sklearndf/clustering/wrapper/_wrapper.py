@@ -0,0 +1,204 @@
+"""
+Core implementation of :mod:`sklearndf.clustering.wrapper`
+"""
+
+import logging
+from abc import ABCMeta, abstractmethod
+from typing import Any, Generic, Optional, TypeVar, Union
+
+import pandas as pd
+from sklearn.base import ClusterMixin
+from sklearn.cluster import Birch, MiniBatchKMeans
+
+from pytools.api import AllTracker
+
+from sklearndf.transformation.wrapper import (
+    BaseMultipleInputsPerOutputTransformerWrapperDF,
+)
+from sklearndf.wrapper import ClusterWrapperDF
+
+log = logging.getLogger(__name__)
+
+__all__ = [
+    "BirchWrapperDF",
+    "ClusterTransformerWrapperDF",
+    "IncrementalClusterWrapperDF",
+    "KMeansWrapperDF",
+    "MiniBatchKMeansWrapperDF",
+]
+
+
+#
+# type variables
+#
+
+T_Self = TypeVar("T_Self")
+T_Cluster = TypeVar("T_Cluster", bound=ClusterMixin)
+
+
+#
+# Ensure all symbols introduced below are included in __all__
+#
+
+__tracker = AllTracker(globals())
+
+
+#
+# Class definitions
+#
+
+
+class ClusterTransformerWrapperDF(
+    ClusterWrapperDF[T_Cluster],
+    BaseMultipleInputsPerOutputTransformerWrapperDF[T_Cluster],
+    Generic[T_Cluster],
+    metaclass=ABCMeta,
+):
+    """
+    Base class of DF wrappers for clusterers transforming observations into their
+    distances to the cluster centers.
+
+    The transformed data frame has one column per cluster center, named
+    ``cluster_<i>`` for the `i`-th cluster center.
+    Each of these columns depends on all input columns, hence
+    :attr:`.feature_names_original_` is not supported.
+
+    Like :meth:`.predict`, method :meth:`.transform` can process large inputs in
+    chunks of rows.
+    """
+
+    # noinspection PyPep8Naming
+    def transform(
+        self, X: pd.DataFrame, chunk_size: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Transform the given inputs into their distances to the cluster centers.
+
+        The inputs must have the same features as the inputs used to fit
+        this clusterer.
+        The features can be provided in any order since they are identified by their
+        column names.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param chunk_size: if given, transform the inputs in chunks of at most this
+            many rows
+        :return: a data frame with observations as rows and the distances to the
+            cluster centers as columns
+        """
+        if chunk_size is None:
+            return super().transform(X)
+
+        self._check_parameter_types(X, None)
+
+        return self._transformed_to_df(
+            transformed=self._call_in_chunks("transform", X, chunk_size),
+            index=X.index,
+            columns=self.feature_names_out_,
+        )
+
+    @property
+    @abstractmethod
+    def _n_clusters_(self) -> int:
+        # the number of cluster centers of the fitted clusterer
+        pass
+
+    def _get_features_out(self) -> pd.Index:
+        return pd.Index([f"cluster_{i}" for i in range(self._n_clusters_)])
+
+
+class IncrementalClusterWrapperDF(
+    ClusterTransformerWrapperDF[T_Cluster], Generic[T_Cluster], metaclass=ABCMeta
+):
+    """
+    Base class of DF wrappers for clusterers that can be fitted incrementally, over
+    consecutive chunks of a data set, using :meth:`.partial_fit`.
+    """
+
+    # noinspection PyPep8Naming
+    def partial_fit(
+        self: T_Self,
+        X: pd.DataFrame,
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        **fit_params: Any,
+    ) -> T_Self:
+        """
+        Update this clusterer with an additional chunk of observations.
+
+        If this clusterer is not fitted yet, it is fitted to the given chunk.
+
+        :param X: input data frame with observations as rows and features as columns;
+            after the first chunk, must have the same columns as the first chunk, in
+            any order
+        :param y: ignored; present for consistency with the scikit-learn API
+        :param fit_params: optional keyword parameters as required by the
+            ``partial_fit`` method of the native clusterer
+        :return: ``self``
+        """
+
+        self: IncrementalClusterWrapperDF  # support type hinting in PyCharm
+
+        fitted = self.is_fitted
+
+        try:
+            self._check_parameter_types(X, y)
+            self.native_estimator.partial_fit(
+                self._convert_X_for_delegate(X),
+                self._convert_y_for_delegate(y),
+                **fit_params,
+            )
+            if not fitted:
+                self._post_fit(X, y, **fit_params)
+
+        except Exception as cause:
+            if not fitted:
+                self._reset_fit()
+            raise self._make_verbose_exception(
+                self.partial_fit.__name__, cause
+            ) from cause
+
+        return self
+
+
+class KMeansWrapperDF(
+    ClusterTransformerWrapperDF[T_Cluster], Generic[T_Cluster], metaclass=ABCMeta
+):
+    """
+    DF wrapper for :class:`sklearn.cluster.KMeans` and
+    :class:`sklearn.cluster.MiniBatchKMeans`.
+    """
+
+    @property
+    def _n_clusters_(self) -> int:
+        return len(self.native_estimator.cluster_centers_)
+
+
+class MiniBatchKMeansWrapperDF(
+    IncrementalClusterWrapperDF[MiniBatchKMeans],
+    KMeansWrapperDF[MiniBatchKMeans],
+    metaclass=ABCMeta,
+):
+    """
+    DF wrapper for :class:`sklearn.cluster.MiniBatchKMeans`, supporting incremental
+    fitting with :meth:`.partial_fit`.
+    """
+
+
+class BirchWrapperDF(IncrementalClusterWrapperDF[Birch], metaclass=ABCMeta):
+    """
+    DF wrapper for :class:`sklearn.cluster.Birch`, supporting incremental fitting with
+    :meth:`.partial_fit`.
+
+    The transformed data frame has one column per subcluster center of the
+    clustering feature tree.
+    """
+
+    @property
+    def _n_clusters_(self) -> int:
+        return len(self.native_estimator.subcluster_centers_)
+
+
+#
+# validate __all__
+#
+
+__tracker.validate()
@@ -0,0 +1,6 @@
+"""
+Parallel scoring of fitted `sklearndf` estimators across worker processes, and
+parallel execution of transformer branches.
+"""
+from ._branches import *
+from ._parallel import *
@@ -0,0 +1,554 @@
+"""
+Additional implementation of :mod:`sklearndf.parallel`, running the branches of
+feature unions and column transformers in parallel
+"""
+
+import logging
+import pickle
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import clone
+from sklearn.decomposition import PCA, IncrementalPCA, KernelPCA, TruncatedSVD
+from sklearn.feature_selection import (
+    GenericUnivariateSelect,
+    SelectFdr,
+    SelectFpr,
+    SelectFwe,
+    SelectKBest,
+    SelectPercentile,
+    VarianceThreshold,
+)
+from sklearn.impute import MissingIndicator, SimpleImputer
+from sklearn.kernel_approximation import Nystroem, RBFSampler
+from sklearn.preprocessing import (
+    Binarizer,
+    KBinsDiscretizer,
+    MaxAbsScaler,
+    MinMaxScaler,
+    Normalizer,
+    PolynomialFeatures,
+    PowerTransformer,
+    QuantileTransformer,
+    RobustScaler,
+    StandardScaler,
+)
+from sklearn.random_projection import GaussianRandomProjection, SparseRandomProjection
+
+from pytools.api import AllTracker
+
+from .. import TransformerDF
+
+log = logging.getLogger(__name__)
+
+__all__ = ["BranchExecutor"]
+
+
+#
+# Ensure all symbols introduced below are included in __all__
+#
+
+__tracker = AllTracker(globals())
+
+
+#
+# Class definitions
+#
+
+
+class BranchExecutor:
+    """
+    Fits and applies multiple transformers in parallel, e.g., the branches of a
+    :class:`.FeatureUnionDF` or :class:`.ColumnTransformerDF`.
+
+    Each branch runs either in a thread of the current process, or in a worker
+    process, depending on the native transformers of the branch:
+    transformers listed in :attr:`.GIL_RELEASING_TRANSFORMERS` spend most of their
+    time in numerical code that releases the Python global interpreter lock, and are
+    run in threads, sharing their input with the current process; all other branches
+    are run in worker processes.
+
+    Worker processes are managed by :mod:`joblib` using the `loky` backend.
+    Input arrays larger than ``max_nbytes`` are passed to the worker processes as
+    read-only memory maps instead of being pickled; workers return only the fitted
+    transformers and the transformed data as arrays.
+
+    Unless disabled, steps common to multiple branches are run only once, and their
+    results are shared across branches.
+    Branches share their leading steps if they get the same input data frame object
+    and, when fitting, if the steps have the same types and parameters or, when
+    transforming, if the steps have the same types, parameters and fitted state.
+    The fitted state of steps is compared once after fitting, using
+    :meth:`.fitted_step_keys`; steps without such keys are shared when transforming
+    only if they are the same objects.
+    Pipeline branches are split into their steps for this purpose.
+    Sharing only avoids running a step more than once: each fitted branch gets its
+    own copy of the shared steps, so that the parameters of one branch can be changed
+    without affecting other branches, and the lineage of all features stays intact.
+    Steps with a ``random_state`` parameter not set to a fixed seed are never shared
+    when fitting.
+    """
+
+    #: Native transformer types that spend most of their time in code releasing the
+    #: Python global interpreter lock, and are therefore run in threads.
+    GIL_RELEASING_TRANSFORMERS: Tuple[type, ...] = (
+        Binarizer,
+        GaussianRandomProjection,
+        GenericUnivariateSelect,
+        IncrementalPCA,
+        KBinsDiscretizer,
+        KernelPCA,
+        MaxAbsScaler,
+        MinMaxScaler,
+        MissingIndicator,
+        Normalizer,
+        Nystroem,
+        PCA,
+        PolynomialFeatures,
+        PowerTransformer,
+        QuantileTransformer,
+        RBFSampler,
+        RobustScaler,
+        SelectFdr,
+        SelectFpr,
+        SelectFwe,
+        SelectKBest,
+        SelectPercentile,
+        SimpleImputer,
+        SparseRandomProjection,
+        StandardScaler,
+        TruncatedSVD,
+        VarianceThreshold,
+    )
+
+    def __init__(
+        self,
+        n_jobs: Optional[int] = None,
+        max_nbytes: str = "1M",
+        share_steps: bool = True,
+    ) -> None:
+        """
+        :param n_jobs: the maximum number of branches to run in parallel, following
+            the :mod:`joblib` conventions; ``None`` means 1 unless in a
+            :func:`joblib.parallel_backend` context, and ``-1`` means using all CPUs
+        :param max_nbytes: the size threshold for input arrays to be memory-mapped
+            when passed to worker processes (default: ``"1M"``)
+        :param share_steps: if ``True``, run steps common to multiple branches only
+            once (default: ``True``)
+        """
+        self.n_jobs = n_jobs
+        self.max_nbytes = max_nbytes
+        self.share_steps = share_steps
+
+    @property
+    def is_parallel(self) -> bool:
+        """
+        ``True`` if this executor runs more than one branch at a time.
+        """
+        return effective_n_jobs(self.n_jobs) > 1
+
+    # noinspection PyPep8Naming
+    def fit_transform(
+        self,
+        branches: Sequence[Tuple[TransformerDF, pd.DataFrame]],
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        **fit_params: Any,
+    ) -> List[Tuple[TransformerDF, np.ndarray]]:
+        """
+        Fit the transformer of each branch using the input of that branch, then
+        transform the input.
+
+        Transformers fitted in threads are fitted in place; transformers fitted in
+        worker processes are returned as fitted copies.
+        Steps are not shared if additional fit parameters are passed.
+
+        :param branches: pairs of transformers and their input data frames
+        :param y: an optional series or data frame with one or more outputs
+        :param fit_params: additional keyword parameters passed to each transformer
+        :return: pairs of fitted transformers and transformed data, in the same order
+            as the branches
+        """
+        if fit_params or not self._is_sharing(branches):
+            return self._run(_fit_transform_branch, branches, (y, fit_params))
+
+        # fit the shared leading steps once, then fit the remaining steps of each
+        # branch; branches get copies of shared steps fitted for other branches
+        shared = self._run_shared_steps(
+            branches,
+            step_keys=[
+                [_unfitted_step_key(step) for _, step in _branch_steps(transformer)]
+                for transformer, _ in branches
+            ],
+            function=lambda step, X: step.fit_transform(X, y),
+            copy_steps=True,
+        )
+
+        pending = [
+            i
+            for i, (steps, shared_steps, _) in enumerate(shared)
+            if len(shared_steps) < len(steps)
+        ]
+        fitted_remaining: Dict[int, Tuple[TransformerDF, np.ndarray]] = dict(
+            zip(
+                pending,
+                self._run(
+                    _fit_transform_branch,
+                    [
+                        (
+                            _join_steps(branches[i][0], steps[len(shared_steps) :]),
+                            X_shared,
+                        )
+                        for i, (steps, shared_steps, X_shared) in (
+                            (i, shared[i]) for i in pending
+                        )
+                    ],
+                    (y, {}),
+                ),
+            )
+        )
+
+        n_outputs = 0 if y is None else 1 if isinstance(y, pd.Series) else y.shape[1]
+
+        results: List[Tuple[TransformerDF, np.ndarray]] = []
+
+        for i, ((transformer, X), (_, shared_steps, X_shared)) in enumerate(
+            zip(branches, shared)
+        ):
+            if not shared_steps:
+                results.append(fitted_remaining[i])
+                continue
+
+            if i in fitted_remaining:
+                remaining, transformed = fitted_remaining[i]
+                steps = shared_steps + _branch_steps(remaining)
+            else:
+                steps = shared_steps
+                transformed = X_shared.values
+
+            results.append(
+                (
+                    _join_steps(
+                        transformer, steps, features_in=X.columns, n_outputs=n_outputs
+                    ),
+                    transformed,
+                )
+            )
+
+        return results
+
+    # noinspection PyPep8Naming
+    def transform(
+        self,
+        branches: Sequence[Tuple[TransformerDF, pd.DataFrame]],
+        step_keys: Optional[List[List[Any]]] = None,
+    ) -> List[np.ndarray]:
+        """
+        Transform the input of each branch using the fitted transformer of that
+        branch.
+
+        :param branches: pairs of fitted transformers and their input data frames
+        :param step_keys: the keys of the fitted steps of each branch, as determined
+            by :meth:`.fitted_step_keys` after fitting the transformers; if omitted,
+            only steps that are the same objects are shared
+        :return: the transformed data, in the same order as the branches
+        """
+        if not self._is_sharing(branches):
+            return self._run(_transform_branch, branches, ())
+
+        if step_keys is None:
+            step_keys = [
+                [id(step) for _, step in _branch_steps(transformer)]
+                for transformer, _ in branches
+            ]
+
+        # apply the shared leading steps once, then apply the remaining steps of each
+        # branch
+        shared = self._run_shared_steps(
+            branches,
+            step_keys=step_keys,
+            function=lambda step, X: step.transform(X),
+        )
+
+        pending = [
+            i
+            for i, (steps, shared_steps, _) in enumerate(shared)
+            if len(shared_steps) < len(steps)
+        ]
+        transformed_remaining: Dict[int, np.ndarray] = dict(
+            zip(
+                pending,
+                self._run(
+                    _transform_branch,
+                    [
+                        (
+                            _join_steps(
+                                branches[i][0],
+                                steps[len(shared_steps) :],
+                                features_in=X_shared.columns,
+                                n_outputs=branches[i][0].n_outputs_,
+                            ),
+                            X_shared,
+                        )
+                        for i, (steps, shared_steps, X_shared) in (
+                            (i, shared[i]) for i in pending
+                        )
+                    ],
+                    (),
+                ),
+            )
+        )
+
+        return [
+            transformed_remaining[i] if i in transformed_remaining else X_shared.values
+            for i, (_, _, X_shared) in enumerate(shared)
+        ]
+
+    def fitted_step_keys(
+        self, transformers: Sequence[TransformerDF]
+    ) -> Optional[List[List[Any]]]:
+        """
+        Determine the keys of the fitted steps of the given branch transformers, for
+        use with :meth:`.transform`.
+
+        Steps with the same type, parameters and fitted state get the same key.
+        Determining the keys requires hashing the fitted state of all steps, and
+        should therefore be done once after fitting the transformers, not each time
+        they are used for transforming.
+
+        :param transformers: the fitted transformers of the branches
+        :return: the keys of the steps of each transformer, or ``None`` if this
+            executor does not share steps across the given branches
+        """
+        if not (self.share_steps and len(transformers) > 1):
+            return None
+
+        return [
+            [_fitted_state_key(step) for _, step in _branch_steps(transformer)]
+            for transformer in transformers
+        ]
+
+    def releases_gil(self, transformer: Union[TransformerDF, str, None]) -> bool:
+        """
+        Determine whether the given transformer is run in a thread.
+
+        :param transformer: the transformer to check, or the name of a special
+            transformer, e.g., ``"passthrough"``
+        :return: ``True`` if all native transformers in the given transformer are
+            listed in :attr:`.GIL_RELEASING_TRANSFORMERS`, or if the transformer is
+            a special transformer; ``False`` otherwise
+        """
+        from ..pipeline.wrapper import PipelineWrapperDF
+
+        if transformer is None or isinstance(transformer, str):
+            return True
+        elif isinstance(transformer, PipelineWrapperDF):
+            return all(self.releases_gil(step) for _, step in transformer.steps)
+        else:
+            return isinstance(
+                transformer.native_estimator, self.GIL_RELEASING_TRANSFORMERS
+            )
+
+    def _is_sharing(
+        self, branches: Sequence[Tuple[TransformerDF, pd.DataFrame]]
+    ) -> bool:
+        return self.share_steps and len(branches) > 1
+
+    @staticmethod
+    def _run_shared_steps(
+        branches: Sequence[Tuple[TransformerDF, pd.DataFrame]],
+        step_keys: List[List[Any]],
+        function: Callable[[TransformerDF, pd.DataFrame], Any],
+        copy_steps: bool = False,
+    ) -> List[
+        Tuple[List[Tuple[Any, TransformerDF]], List[Tuple[Any, TransformerDF]], Any]
+    ]:
+        # run the given function once for each leading step shared by multiple
+        # branches, passing each step the result of the preceding step;
+        # return the steps of each branch, the shared leading steps of each branch,
+        # and the result of the last shared step or the input if there is none;
+        # if requested, shared leading steps run for another branch are copied
+
+        branch_steps = [_branch_steps(transformer) for transformer, _ in branches]
+
+        # identify each step by its key and the keys of all preceding steps,
+        # starting with the identity of the branch input
+        branch_keys: List[List[Any]] = []
+        for keys_in, (_, X) in zip(step_keys, branches):
+            step_key: Any = id(X)
+            keys = []
+            for key in keys_in:
+                step_key = (step_key, key)
+                keys.append(step_key)
+            branch_keys.append(keys)
+
+        counts = Counter(step_key for keys in branch_keys for step_key in keys)
+
+        results: Dict[Any, Tuple[TransformerDF, Any]] = {}
+        shared: List[
+            Tuple[List[Tuple[Any, TransformerDF]], List[Tuple[Any, TransformerDF]], Any]
+        ] = []
+
+        for steps, keys, (_, X) in zip(branch_steps, branch_keys, branches):
+            shared_steps = []
+            for (name, step), step_key in zip(steps, keys):
+                if counts[step_key] < 2:
+                    break
+                if step_key not in results:
+                    results[step_key] = step, function(step, X)
+                shared_step, X = results[step_key]
+                if copy_steps and shared_step is not step:
+                    shared_step = deepcopy(shared_step)
+                shared_steps.append((name, shared_step))
+            shared.append((steps, shared_steps, X))
+
+        return shared
+
+    def _run(
+        self,
+        function: Any,
+        branches: Sequence[Tuple[TransformerDF, pd.DataFrame]],
+        args: Tuple[Any, ...],
+    ) -> List[Any]:
+        n_jobs = effective_n_jobs(self.n_jobs)
+
+        if n_jobs <= 1 or len(branches) <= 1:
+            return [function(transformer, X, *args) for transformer, X in branches]
+
+        in_thread = [self.releases_gil(transformer) for transformer, _ in branches]
+        results: List[Any] = [None] * len(branches)
+
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            # start the thread branches, then run the process branches alongside
+            futures = {
+                i: executor.submit(function, transformer, X, *args)
+                for i, ((transformer, X), thread) in enumerate(zip(branches, in_thread))
+                if thread
+            }
+
+            process_branches = [i for i, thread in enumerate(in_thread) if not thread]
+            if process_branches:
+                process_results = Parallel(
+                    n_jobs=n_jobs,
+                    backend="loky",
+                    max_nbytes=self.max_nbytes,
+                    mmap_mode="r",
+                )(delayed(function)(*branches[i], *args) for i in process_branches)
+                for i, result in zip(process_branches, process_results):
+                    results[i] = result
+
+            for i, future in futures.items():
+                results[i] = future.result()
+
+        return results
+
+
+def _branch_steps(transformer: TransformerDF) -> List[Tuple[Any, TransformerDF]]:
+    # the steps of a pipeline made up only of transformers, or otherwise the
+    # transformer itself as a single unnamed step
+    from ..pipeline.wrapper import PipelineWrapperDF
+
+    if isinstance(transformer, PipelineWrapperDF) and all(
+        isinstance(step, TransformerDF) for _, step in transformer.steps
+    ):
+        return list(transformer.steps)
+    else:
+        return [(None, transformer)]
+
+
+def _join_steps(
+    transformer: TransformerDF,
+    steps: List[Tuple[Any, TransformerDF]],
+    features_in: Optional[pd.Index] = None,
+    n_outputs: int = 0,
+) -> TransformerDF:
+    # make a transformer from the given steps of the given branch: a pipeline like
+    # the given pipeline, fitted if the input features are given, or the single
+    # unnamed step of a branch that is not a pipeline
+
+    if steps[0][0] is None:
+        return steps[0][1]
+
+    native_pipeline = transformer.native_estimator
+
+    if features_in is None:
+        return type(transformer)(
+            steps=steps, memory=native_pipeline.memory, verbose=native_pipeline.verbose
+        )
+    else:
+        return type(transformer).from_fitted(
+            estimator=type(native_pipeline)(
+                steps=steps,
+                memory=native_pipeline.memory,
+                verbose=native_pipeline.verbose,
+            ),
+            features_in=features_in,
+            n_outputs=n_outputs,
+        )
+
+
+def _unfitted_step_key(step: TransformerDF) -> Any:
+    # steps with the same type and parameters produce the same fit, unless the fit
+    # depends on a random state that is not a fixed seed
+    params = step.get_params(deep=True)
+    if any(
+        (name == "random_state" or name.endswith("__random_state"))
+        and not isinstance(value, int)
+        for name, value in params.items()
+    ):
+        return id(step)
+    else:
+        # sklearndf wrapper classes cannot be pickled by reference, so we hash an
+        # unfitted clone instead of the type and parameters
+        return _hash(clone(step), step)
+
+
+def _fitted_state_key(step: TransformerDF) -> Any:
+    # steps fitted separately, e.g., copies of a step shared when fitting, produce
+    # the same output if they have the same type, parameters and fitted state;
+    # the feature lineage is cached on demand and is not part of the fitted state
+    step_type = type(step)
+    return _hash(
+        (
+            step_type.__module__,
+            step_type.__qualname__,
+            {
+                name: value
+                for name, value in vars(step).items()
+                if name != "_features_original"
+            },
+        ),
+        step,
+    )
+
+
+def _hash(obj: Any, step: TransformerDF) -> Any:
+    # hash the given object, or fall back to the identity of the given step if the
+    # object cannot be pickled, e.g., if it refers to a lambda
+    try:
+        return joblib.hash(obj)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return id(step)
+
+
+# noinspection PyPep8Naming
+def _fit_transform_branch(
+    transformer: TransformerDF,
+    X: pd.DataFrame,
+    y: Optional[Union[pd.Series, pd.DataFrame]],
+    fit_params: Any,
+) -> Tuple[TransformerDF, np.ndarray]:
+    return transformer, transformer.fit_transform(X, y, **fit_params).values
+
+
+# noinspection PyPep8Naming
+def _transform_branch(transformer: TransformerDF, X: pd.DataFrame) -> np.ndarray:
+    return transformer.transform(X).values
+
+
+__tracker.validate()
@@ -0,0 +1,423 @@
+"""
+Core implementation of :mod:`sklearndf.parallel`
+"""
+
+import logging
+import multiprocessing
+import multiprocessing.pool
+import os
+import pickle
+import sys
+from typing import Any, List, Optional, Tuple, TypeVar, Union
+
+import numpy as np
+import pandas as pd
+
+from pytools.api import AllTracker
+
+from .. import EstimatorDF
+
+log = logging.getLogger(__name__)
+
+__all__ = ["ScoringPool"]
+
+
+#
+# type variables
+#
+
+T_Self = TypeVar("T_Self")
+
+
+#
+# Ensure all symbols introduced below are included in __all__
+#
+
+__tracker = AllTracker(globals())
+
+
+#
+# Class definitions
+#
+
+
+class ScoringPool:
+    """
+    A pool of worker processes for scoring large data frames with a fitted
+    estimator in parallel.
+
+    Each worker process deserializes the estimator once, when the pool is started.
+    The rows of the data frames to be scored are split into one chunk per worker.
+    Numeric columns are passed to the workers through a block of shared memory,
+    along with the column metadata, so that input data is never pickled; all other
+    columns, including columns with pandas extension dtypes such as categoricals,
+    are pickled with their dtypes, and only the rows of each worker's chunk are sent
+    to that worker.
+    Numeric results are written back by the workers into a shared result buffer,
+    typed after the result for the first row; results that cannot be stored in this
+    buffer without loss, e.g., floats where the first row yielded integers, are
+    returned by pickling them, as are all non-numeric results.
+
+    This offers near-linear scaling across cores for estimators where scoring is
+    bound by the Python global interpreter lock.
+
+    The pool must be started using :meth:`.start` before it can be used, or
+    alternatively be used as a context manager.
+    Requires Python 3.8 or later.
+    """
+
+    def __init__(self, model: EstimatorDF, n_workers: Optional[int] = None) -> None:
+        """
+        :param model: the fitted estimator to score with
+        :param n_workers: the number of worker processes; defaults to the number of
+            CPUs
+        :raises RuntimeError: if running on a Python version before 3.8
+        """
+        if sys.version_info < (3, 8):
+            raise RuntimeError("ScoringPool requires Python 3.8 or later")
+        if not isinstance(model, EstimatorDF):
+            raise TypeError("arg model must be an EstimatorDF")
+        if not model.is_fitted:
+            raise ValueError("arg model must be fitted")
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        elif n_workers < 1:
+            raise ValueError(f"arg n_workers must be positive but is {n_workers}")
+
+        self.model = model
+        self.n_workers = n_workers
+        self._pool: Optional[multiprocessing.pool.Pool] = None
+
+    @property
+    def is_running(self) -> bool:
+        """
+        ``True`` if this pool has been started and not yet been closed.
+        """
+        return self._pool is not None
+
+    def start(self) -> None:
+        """
+        Start the worker processes, and load the estimator in each worker.
+
+        :raises RuntimeError: if the pool is already running
+        """
+        if self.is_running:
+            raise RuntimeError("pool is already running")
+
+        # start the resource tracker before forking the workers, so that they share
+        # it with this process instead of starting trackers of their own, which
+        # would report the shared memory blocks attached by a worker as leaked
+        from multiprocessing import resource_tracker
+
+        resource_tracker.ensure_running()
+
+        self._pool = multiprocessing.Pool(
+            self.n_workers,
+            initializer=_init_worker,
+            initargs=(pickle.dumps(self.model, protocol=pickle.HIGHEST_PROTOCOL),),
+        )
+
+    def close(self) -> None:
+        """
+        Terminate the worker processes.
+        """
+        if self.is_running:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self: T_Self) -> T_Self:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    # noinspection PyPep8Naming
+    def predict(
+        self, X: pd.DataFrame, **predict_params: Any
+    ) -> Union[pd.Series, pd.DataFrame]:
+        """
+        Predict outputs for the given inputs, in parallel.
+
+        See :meth:`.LearnerDF.predict`.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param predict_params: optional keyword parameters as required by specific
+            learner implementations
+        :return: predictions per observation as a series, or as a data frame in case
+            of multiple outputs
+        """
+        return self._score("predict", X, predict_params)
+
+    # noinspection PyPep8Naming
+    def predict_proba(
+        self, X: pd.DataFrame, **predict_params: Any
+    ) -> Union[pd.DataFrame, List[pd.DataFrame]]:
+        """
+        Predict class probabilities for the given inputs, in parallel.
+
+        See :meth:`.ClassifierDF.predict_proba`.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param predict_params: optional keyword parameters as required by specific
+            learner implementations
+        :return: a data frame with observations as rows and classes as columns, and
+            values as probabilities per observation and class; for multi-output
+            classifiers, a list of one observation/class data frames per output
+        """
+        return self._score("predict_proba", X, predict_params)
+
+    # noinspection PyPep8Naming
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Transform the given inputs, in parallel.
+
+        See :meth:`.TransformerDF.transform`.
+
+        :param X: input data frame with observations as rows and features as columns
+        :return: the transformed inputs
+        """
+        return self._score("transform", X, {})
+
+    # noinspection PyPep8Naming
+    def _score(self, method: str, X: pd.DataFrame, params: Any) -> Any:
+        if not self.is_running:
+            raise RuntimeError("pool is not running")
+        if not isinstance(X, pd.DataFrame):
+            raise TypeError("arg X must be a DataFrame")
+
+        n = len(X)
+        if n < 2:
+            return getattr(self.model, method)(X, **params)
+
+        # score the first row locally, to determine the type and shape of the result
+        template = getattr(self.model, method)(X.iloc[:1], **params)
+
+        bounds = np.linspace(0, n, min(n, self.n_workers) + 1).astype(int)
+
+        with _SharedFrame(X) as frame, _SharedResult(template, n) as result:
+            parts = [
+                async_part.get()
+                for async_part in [
+                    self._pool.apply_async(
+                        _worker_score,
+                        (method, frame.chunk(start, stop), result.spec, params),
+                    )
+                    for start, stop in zip(bounds[:-1], bounds[1:])
+                ]
+            ]
+            return result.to_output(parts, bounds, X.index)
+
+
+class _SharedFrame:
+    # the columns of a data frame: numeric columns are copied into a block of shared
+    # memory, all other columns are kept as pandas arrays to be pickled for each
+    # chunk, preserving extension dtypes, e.g., categorical or tz-aware dtypes
+
+    def __init__(self, X: pd.DataFrame) -> None:
+        from multiprocessing.shared_memory import SharedMemory
+
+        shared = [
+            isinstance(dtype, np.dtype) and dtype.kind in "biuf" for dtype in X.dtypes
+        ]
+        arrays = [
+            X.iloc[:, i].to_numpy() if is_shared else X.iloc[:, i].array
+            for i, is_shared in enumerate(shared)
+        ]
+
+        self.n_rows = len(X)
+        # the column index, including its name, is restored by the workers
+        self.column_index = X.columns
+        self.block = SharedMemory(
+            create=True,
+            size=max(1, sum(array.nbytes for array, s in zip(arrays, shared) if s)),
+        )
+
+        # column metadata: (name, dtype, offset) for columns in the shared block,
+        # and (name, None, values) for all other columns
+        self.columns: List[Tuple[Any, Optional[str], Any]] = []
+
+        offset = 0
+        for name, array, is_shared in zip(X.columns, arrays, shared):
+            if is_shared:
+                view = np.ndarray(
+                    array.shape, dtype=array.dtype, buffer=self.block.buf, offset=offset
+                )
+                view[:] = array
+                del view
+                self.columns.append((name, array.dtype.str, offset))
+                offset += array.nbytes
+            else:
+                self.columns.append((name, None, array))
+
+    def chunk(self, start: int, stop: int) -> Tuple[Any, ...]:
+        # the specification of a chunk of rows, to be sent to a worker
+        return (
+            self.block.name,
+            self.n_rows,
+            start,
+            stop,
+            self.column_index,
+            [
+                (name, dtype, value if dtype else value[start:stop])
+                for name, dtype, value in self.columns
+            ],
+        )
+
+    def __enter__(self) -> "_SharedFrame":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.block.close()
+        self.block.unlink()
+
+
+class _SharedResult:
+    # a shared buffer for numeric results with the same type and columns as the given
+    # template; other results are returned by the workers as pickled data frames,
+    # including numeric results that cannot be cast safely to the buffer's dtype
+
+    def __init__(
+        self, template: Union[pd.Series, pd.DataFrame, List[pd.DataFrame]], n: int
+    ) -> None:
+        from multiprocessing.shared_memory import SharedMemory
+
+        self.template = template
+        self.block: Optional[SharedMemory] = None
+        self.spec: Optional[Tuple[str, Tuple[int, int], str]] = None
+
+        if isinstance(template, (pd.Series, pd.DataFrame)):
+            values = template.values
+            if values.dtype.kind in "biuf":
+                shape = (n, 1 if values.ndim == 1 else values.shape[1])
+                self.block = SharedMemory(
+                    create=True,
+                    size=max(1, int(np.prod(shape)) * values.dtype.itemsize),
+                )
+                self.spec = (self.block.name, shape, values.dtype.str)
+
+    def to_output(
+        self, parts: List[Any], bounds: np.ndarray, index: pd.Index
+    ) -> Union[pd.Series, pd.DataFrame, List[pd.DataFrame]]:
+        template = self.template
+
+        if self.spec is None:
+            # results were returned by the workers
+            if isinstance(template, list):
+                return [
+                    _reindex(pd.concat([part[i] for part in parts]), index)
+                    for i in range(len(template))
+                ]
+            else:
+                return _reindex(pd.concat(parts), index)
+
+        _, shape, dtype = self.spec
+        values = np.ndarray(shape, dtype=dtype, buffer=self.block.buf).copy()
+
+        if all(part is None for part in parts):
+            return self._values_to_output(values, index)
+
+        # some workers returned their results since these did not fit the buffer:
+        # combine them with the buffered results, letting pandas determine the
+        # common dtype
+        return pd.concat(
+            [
+                self._values_to_output(values[start:stop], index[start:stop])
+                if part is None
+                else _reindex(part, index[start:stop])
+                for part, start, stop in zip(parts, bounds[:-1], bounds[1:])
+            ]
+        )
+
+    def _values_to_output(
+        self, values: np.ndarray, index: pd.Index
+    ) -> Union[pd.Series, pd.DataFrame]:
+        template = self.template
+        if isinstance(template, pd.Series):
+            return pd.Series(values[:, 0], index=index, name=template.name)
+        else:
+            return pd.DataFrame(values, index=index, columns=template.columns)
+
+    def __enter__(self) -> "_SharedResult":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        if self.block is not None:
+            self.block.close()
+            self.block.unlink()
+
+
+def _reindex(
+    data: Union[pd.Series, pd.DataFrame], index: pd.Index
+) -> Union[pd.Series, pd.DataFrame]:
+    data.index = index
+    return data
+
+
+#
+# Worker processes
+#
+
+_worker_model: Optional[EstimatorDF] = None
+
+
+def _init_worker(model_pickle: bytes) -> None:
+    global _worker_model
+    _worker_model = pickle.loads(model_pickle)
+
+
+def _worker_score(
+    method: str,
+    chunk: Tuple[Any, ...],
+    result_spec: Optional[Tuple[str, Tuple[int, int], str]],
+    params: Any,
+) -> Any:
+    from multiprocessing.shared_memory import SharedMemory
+
+    block_name, n_rows, start, stop, column_index, columns = chunk
+
+    block = SharedMemory(name=block_name)
+    try:
+        # copy the chunk out of shared memory, so that no references to the shared
+        # block remain once it is closed
+        X = pd.DataFrame(
+            {
+                i: (
+                    np.ndarray((n_rows,), dtype=dtype, buffer=block.buf, offset=value)[
+                        start:stop
+                    ].copy()
+                    if dtype
+                    else value
+                )
+                for i, (_, dtype, value) in enumerate(columns)
+            },
+            index=pd.RangeIndex(start, stop),
+        )
+        X.columns = column_index
+    finally:
+        block.close()
+
+    result = getattr(_worker_model, method)(X, **params)
+
+    if result_spec is None:
+        return result
+
+    result_name, shape, dtype = result_spec
+    values = np.asarray(result)
+    if not np.can_cast(values.dtype, dtype, casting="safe"):
+        # the buffer cannot hold this result without loss: return it instead
+        return result
+
+    result_block = SharedMemory(name=result_name)
+    try:
+        buffer = np.ndarray(shape, dtype=dtype, buffer=result_block.buf)
+        buffer[start:stop] = values.reshape(stop - start, shape[1])
+        del buffer
+    finally:
+        result_block.close()
+
+    return None
+
+
+__tracker.validate()
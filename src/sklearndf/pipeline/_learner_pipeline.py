@@ -4,13 +4,43 @@ GAMMA custom two-step pipelines
 
 import logging
 from abc import ABCMeta, abstractmethod
-from typing import Any, Generic, List, Optional, Sequence, TypeVar, Union
-
+from copy import deepcopy
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_object_dtype, is_string_dtype
+from sklearn.linear_model import SGDRegressor
 
 from pytools.api import AllTracker, inheritdoc
 
-from .. import ClassifierDF, EstimatorDF, LearnerDF, RegressorDF, TransformerDF
+from .. import (
+    ClassifierDF,
+    EstimatorDF,
+    LearnerDF,
+    RegressorDF,
+    TransformerDF,
+    __sklearn_0_22__,
+    __sklearn_version__,
+)
+from ..wrapper import EstimatorWrapperDF
+from .wrapper import PipelineWrapperDF
+
+if __sklearn_version__ >= __sklearn_0_22__:
+    from sklearn.linear_model._base import LinearClassifierMixin, LinearModel
+else:
+    from sklearn.linear_model.base import LinearClassifierMixin, LinearModel
 
 log = logging.getLogger(__name__)
 
@@ -23,6 +53,32 @@ T_FinalRegressorDF = TypeVar("T_FinalRegressorDF", bound=RegressorDF)
 T_FinalClassifierDF = TypeVar("T_FinalClassifierDF", bound=ClassifierDF)
 
 
+#
+# constants
+#
+
+# native linear models computing predictions from coefficients coef_ and intercept_
+_LINEAR_MODELS = (LinearModel, LinearClassifierMixin, SGDRegressor)
+
+# fit parameters with validation data for early stopping, e.g., for LightGBM learners;
+# these are passed to the final estimator after applying the preprocessing step
+_EVAL_SET = "eval_set"
+_EVAL_SAMPLE_WEIGHT = "eval_sample_weight"
+
+# further fit parameters for early stopping, passed only to the final estimator
+_EVAL_PARAMS = (
+    _EVAL_SET,
+    _EVAL_SAMPLE_WEIGHT,
+    "eval_names",
+    "eval_init_score",
+    "eval_class_weight",
+    "eval_group",
+    "eval_metric",
+    "early_stopping_rounds",
+    "callbacks",
+)
+
+
 #
 # Ensure all symbols introduced below are included in __all__
 #
@@ -115,6 +171,61 @@ class _EstimatorPipelineDF(EstimatorDF, Generic[T_FinalEstimatorDF], metaclass=A
                 index=TransformerDF.COL_FEATURE_OUT
             )
 
+    @property
+    def required_features_in_(self) -> pd.Index:
+        """
+        Pandas column index of the input features that are actually required by the
+        preprocessing step.
+
+        Same as :attr:`.feature_names_in_` if the preprocessing step is ``None``.
+
+        See :attr:`.PipelineDF.required_features_in_` for details.
+        """
+        self._ensure_fitted()
+        if self.preprocessing is not None:
+            preprocessing = self.preprocessing
+            # noinspection PyProtectedMember
+            return preprocessing._get_features_in_required(
+                preprocessing.feature_names_out_
+            )
+        else:
+            return self.feature_names_in_
+
+    def prune_features_in(self: T_Self) -> T_Self:
+        """
+        Make a copy of this fitted pipeline where the preprocessing step operates only
+        on the input features it actually requires.
+
+        See :meth:`.PipelineDF.prune_features_in` for details.
+        The preprocessing step is removed if it only selects features.
+
+        :return: the pruned copy of this pipeline
+        """
+        self: _EstimatorPipelineDF  # support type hinting in PyCharm
+        self._ensure_fitted()
+
+        pruned = deepcopy(self)
+        preprocessing = self.preprocessing
+
+        if isinstance(preprocessing, PipelineWrapperDF):
+            pruned._preprocessing = preprocessing.prune_features_in()
+        elif preprocessing is not None:
+            # noinspection PyProtectedMember
+            pruned_steps, _ = PipelineWrapperDF._prune_steps(
+                steps=[(self.preprocessing_name, preprocessing)],
+                features_out=preprocessing.feature_names_out_,
+            )
+            if pruned_steps:
+                pruned_preprocessing = pruned_steps[0][1]
+                # noinspection PyProtectedMember
+                pruned._preprocessing = (
+                    None
+                    if PipelineWrapperDF._is_passthrough(pruned_preprocessing)
+                    else pruned_preprocessing
+                )
+
+        return pruned
+
     # noinspection PyPep8Naming
     def fit(
         self: T_Self,
@@ -132,12 +243,37 @@ class _EstimatorPipelineDF(EstimatorDF, Generic[T_FinalEstimatorDF], metaclass=A
         :param sample_weight: sample weights for observations, to be passed to the
             final estimator (optional)
         :param fit_params: additional keyword parameters as required by specific
-            estimator implementations
+            estimator implementations; validation sets passed as ``eval_set``, with
+            optional weights passed as ``eval_sample_weight``, are transformed by
+            the fitted preprocessing step before passing them to the final estimator,
+            and other early stopping parameters such as ``eval_metric`` or
+            ``callbacks`` are passed to the final estimator only
         :return: ``self``
         """
         self: _EstimatorPipelineDF  # support type hinting in PyCharm
 
-        X_preprocessed: pd.DataFrame = self._pre_fit_transform(X, y, **fit_params)
+        eval_params = self._pop_eval_params(fit_params)
+
+        # the preprocessing step may remove or merge observations, e.g., using
+        # DeduplicateDF, and determines the outputs and sample weights accordingly
+        (
+            X_preprocessed,
+            y_preprocessed,
+            sample_weight_preprocessed,
+        ) = self._pre_fit_transform_xy(X, y, sample_weight, **fit_params)
+        fit_params.update(
+            self._pre_transform_eval_params(
+                eval_params,
+                training_set=(X, y, sample_weight),
+                training_set_preprocessed=(
+                    X_preprocessed,
+                    y_preprocessed,
+                    sample_weight_preprocessed,
+                ),
+            )
+        )
+        y = y_preprocessed
+        sample_weight = sample_weight_preprocessed
 
         if sample_weight is None:
             self.final_estimator.fit(X_preprocessed, y, **fit_params)
@@ -175,13 +311,115 @@ class _EstimatorPipelineDF(EstimatorDF, Generic[T_FinalEstimatorDF], metaclass=A
             return X
 
     # noinspection PyPep8Naming
-    def _pre_fit_transform(
-        self, X: pd.DataFrame, y: pd.Series, **fit_params
-    ) -> pd.DataFrame:
+    def _pre_transform_xy(
+        self, X: pd.DataFrame, y: Any, sample_weight: Any
+    ) -> Tuple[pd.DataFrame, Any, Any]:
         if self.preprocessing is not None:
-            return self.preprocessing.fit_transform(X, y, **fit_params)
+            return self.preprocessing.transform_xy(X, y, sample_weight)
         else:
-            return X
+            return X, y, sample_weight
+
+    # noinspection PyPep8Naming
+    def _pre_fit_transform_xy(
+        self, X: pd.DataFrame, y: Any, sample_weight: Any, **fit_params
+    ) -> Tuple[pd.DataFrame, Any, Any]:
+        if self.preprocessing is not None:
+            return self.preprocessing.fit_transform_xy(
+                X, y, sample_weight, **fit_params
+            )
+        else:
+            return X, y, sample_weight
+
+    @staticmethod
+    def _pop_eval_params(fit_params: Dict[str, Any]) -> Dict[str, Any]:
+        # remove the validation sets and early stopping parameters from the fit
+        # parameters, since they are meant for the final estimator and not for the
+        # preprocessing step
+        return {
+            name: fit_params.pop(name) for name in _EVAL_PARAMS if name in fit_params
+        }
+
+    # noinspection PyPep8Naming
+    def _pre_transform_eval_params(
+        self,
+        eval_params: Dict[str, Any],
+        *,
+        training_set: Tuple[Any, Any, Any],
+        training_set_preprocessed: Tuple[pd.DataFrame, Any, Any],
+    ) -> Dict[str, Any]:
+        # transform the validation sets for early stopping using the fitted
+        # preprocessing step, aligned with the features the final estimator is
+        # fitted to; the preprocessing step may remove observations so we transform
+        # the outputs and the weights of each validation set along with its inputs
+
+        eval_set = eval_params.get(_EVAL_SET)
+        if eval_set is None or self.preprocessing is None:
+            return eval_params
+
+        if isinstance(eval_set, tuple):
+            eval_set = [eval_set]
+
+        eval_sample_weight = eval_params.get(_EVAL_SAMPLE_WEIGHT)
+        if eval_sample_weight is None:
+            eval_sample_weight = [None] * len(eval_set)
+        elif len(eval_sample_weight) != len(eval_set):
+            raise ValueError(
+                f"arg {_EVAL_SAMPLE_WEIGHT} has {len(eval_sample_weight)} elements "
+                f"but arg {_EVAL_SET} has {len(eval_set)} elements"
+            )
+
+        features_out = self.feature_names_out_
+        X, y, sample_weight = training_set
+
+        # transform each distinct validation set only once; validation sets
+        # identical to the training set are replaced with the preprocessed training
+        # set, which lets learners such as LightGBM reuse their training data
+        preprocessed: Dict[Tuple[int, int, int], Tuple[pd.DataFrame, Any, Any]] = {}
+
+        def _preprocess(
+            X_eval: pd.DataFrame, y_eval: Any, weight_eval: Any
+        ) -> Tuple[pd.DataFrame, Any, Any]:
+            key = (id(X_eval), id(y_eval), id(weight_eval))
+            try:
+                return preprocessed[key]
+            except KeyError:
+                pass
+
+            if (
+                X_eval is X
+                and y_eval is y
+                and (weight_eval is None or weight_eval is sample_weight)
+            ):
+                X_t, y_t, weight_t = training_set_preprocessed
+                # keep the sample weights if the preprocessing step created or
+                # changed them, e.g., counts of observations merged by DeduplicateDF
+                if weight_eval is None and weight_t is sample_weight:
+                    weight_t = None
+            else:
+                X_t, y_t, weight_t = self._pre_transform_xy(X_eval, y_eval, weight_eval)
+                if not X_t.columns.equals(features_out):
+                    X_t = X_t.reindex(columns=features_out)
+
+            preprocessed[key] = X_t, y_t, weight_t
+            return X_t, y_t, weight_t
+
+        eval_set_preprocessed = [
+            _preprocess(X_eval, y_eval, weight_eval)
+            for (X_eval, y_eval), weight_eval in zip(eval_set, eval_sample_weight)
+        ]
+
+        eval_params = {
+            **eval_params,
+            _EVAL_SET: [(X_t, y_t) for X_t, y_t, _ in eval_set_preprocessed],
+        }
+        if any(weight_t is not None for _, _, weight_t in eval_set_preprocessed):
+            eval_params[_EVAL_SAMPLE_WEIGHT] = [
+                weight_t for _, _, weight_t in eval_set_preprocessed
+            ]
+        else:
+            eval_params.pop(_EVAL_SAMPLE_WEIGHT, None)
+
+        return eval_params
 
 
 @inheritdoc(match="[see superclass]")
@@ -194,8 +432,165 @@ class LearnerPipelineDF(
     """
     A data frame enabled pipeline with an optional preprocessing step and a
     mandatory learner step.
+
+    With option ``native_categorical``, categorical input columns bypass the
+    preprocessing step and are passed to the learner as pandas categoricals, for
+    learners supporting categorical features natively, e.g., :class:`.LGBMRegressorDF`
+    and :class:`.LGBMClassifierDF`.
+    Categorical input columns are columns with a ``category`` dtype, and columns
+    with an ``object`` or string dtype from which the preprocessing step derives
+    at least one output column, as determined by feature lineage.
+    The preprocessing step is fitted and applied with each categorical column
+    replaced by a constant, so that encoders such as :class:`.OneHotEncoderDF`
+    produce a single column per categorical column instead of expanding it.
+    All output columns derived from categorical columns are then replaced by the
+    categorical columns themselves, preserving their names; columns with an
+    ``object`` or string dtype are converted to categoricals using the categories
+    observed during fitting.
     """
 
+    def __init__(
+        self,
+        *,
+        preprocessing: Optional[TransformerDF] = None,
+        native_categorical: bool = False,
+    ) -> None:
+        """
+        :param preprocessing: the preprocessing step in the pipeline (default: ``None``)
+        :param native_categorical: if ``True``, pass categorical input columns to the
+            learner as pandas categoricals, bypassing the preprocessing step
+            (default: ``False``)
+        """
+        super().__init__(preprocessing=preprocessing)
+
+        self.native_categorical = native_categorical
+        self._categorical_routing: Optional[_CategoricalRouting] = None
+
+    @property
+    def feature_names_out_(self) -> pd.Index:
+        """[see superclass]"""
+        routing = self._categorical_routing
+        if routing is None:
+            return super().feature_names_out_
+        else:
+            return routing.features_out.append(pd.Index(list(routing.dtypes))).rename(
+                TransformerDF.COL_FEATURE_OUT
+            )
+
+    @property
+    def feature_names_original_(self) -> pd.Series:
+        """[see superclass]"""
+        routing = self._categorical_routing
+        if routing is None:
+            return super().feature_names_original_
+        else:
+            features_original = self.preprocessing.feature_names_original_
+            features_categorical = pd.Index(list(routing.dtypes))
+            return (
+                pd.concat(
+                    [
+                        features_original.loc[routing.features_out],
+                        features_categorical.to_series(index=features_categorical),
+                    ]
+                )
+                .rename(features_original.name)
+                .rename_axis(index=TransformerDF.COL_FEATURE_OUT)
+            )
+
+    @property
+    def required_features_in_(self) -> pd.Index:
+        """[see superclass]"""
+        routing = self._categorical_routing
+        if routing is None:
+            return super().required_features_in_
+        else:
+            # noinspection PyProtectedMember
+            features_required = self.preprocessing._get_features_in_required(
+                routing.features_out
+            )
+            features_in = self.feature_names_in_
+            return features_in[
+                features_in.isin(features_required)
+                | features_in.isin(list(routing.dtypes))
+            ]
+
+    def fold_linear(self) -> T_FinalLearnerDF:
+        """
+        Fold the preprocessing step of this fitted pipeline into the coefficients of
+        its linear learner, creating a single linear learner that operates directly
+        on the inputs of this pipeline.
+
+        Requires the learner to be a fitted linear model whose predictions are
+        computed from coefficients ``coef_`` and intercept ``intercept_``, e.g.,
+        :class:`.LinearRegressionDF`, :class:`.RidgeDF`, :class:`.SGDRegressorDF`,
+        or :class:`.LogisticRegressionDF`.
+        Requires the preprocessing step to be a linear transformation of its
+        inputs, composed of fitted scalers such as :class:`.StandardScalerDF`,
+        feature selectors, or linear dimensionality reduction transformers, i.e.,
+        :class:`.PCADF`, :class:`.IncrementalPCADF`, or :class:`.TruncatedSVDDF`,
+        optionally combined in a :class:`.PipelineDF`.
+
+        The resulting learner is a copy of the learner of this pipeline, with
+        coefficients and intercept recomputed to make the same predictions as this
+        pipeline, within floating point precision.
+
+        :return: the folded learner
+        :raises ValueError: if the preprocessing step or the learner cannot be
+            folded
+        """
+        self._ensure_fitted()
+
+        final_estimator = self.final_estimator
+        native_learner = final_estimator.native_estimator
+
+        if not (
+            isinstance(final_estimator, EstimatorWrapperDF)
+            and isinstance(native_learner, _LINEAR_MODELS)
+        ):
+            raise ValueError(
+                "only pipelines with a linear learner can be folded, but got a "
+                f"{type(final_estimator).__name__}"
+            )
+
+        preprocessing = self.preprocessing
+        if preprocessing is None:
+            return deepcopy(final_estimator)
+
+        # noinspection PyProtectedMember
+        linear_map = preprocessing._get_linear_map()
+        if linear_map is None:
+            raise ValueError(
+                "only pipelines with linear preprocessing can be folded, but "
+                f"preprocessing step {type(preprocessing).__name__} is not linear"
+            )
+
+        # align the outputs of the preprocessing with the inputs of the learner
+        matrix, offset = linear_map
+        columns = preprocessing.feature_names_out_.get_indexer(
+            final_estimator.feature_names_in_
+        )
+        matrix = matrix[:, columns]
+        offset = offset[columns]
+
+        # the learner computes X' @ coef.T + intercept, with X' = X @ matrix + offset
+        coef: np.ndarray = native_learner.coef_
+        folded_learner = deepcopy(native_learner)
+        folded_learner.coef_ = coef @ matrix.T
+        folded_learner.intercept_ = native_learner.intercept_ + coef @ offset
+        # the folded learner operates on the inputs of the preprocessing step
+        if hasattr(native_learner, "n_features_in_"):
+            folded_learner.n_features_in_ = len(self.feature_names_in_)
+        if hasattr(native_learner, "feature_names_in_"):
+            folded_learner.feature_names_in_ = self.feature_names_in_.to_numpy(
+                dtype=object
+            )
+
+        return final_estimator.from_fitted(
+            estimator=folded_learner,
+            features_in=self.feature_names_in_,
+            n_outputs=final_estimator.n_outputs_,
+        )
+
     # noinspection PyPep8Naming
     def predict(
         self, X: pd.DataFrame, **predict_params: Any
@@ -208,8 +603,19 @@ class LearnerPipelineDF(
         self, X: pd.DataFrame, y: pd.Series, **fit_params: Any
     ) -> Union[pd.Series, pd.DataFrame]:
         """[see superclass]"""
+        eval_params = self._pop_eval_params(fit_params)
+        X_preprocessed, y_preprocessed, _ = self._pre_fit_transform_xy(
+            X, y, None, **fit_params
+        )
+        fit_params.update(
+            self._pre_transform_eval_params(
+                eval_params,
+                training_set=(X, y, None),
+                training_set_preprocessed=(X_preprocessed, y_preprocessed, None),
+            )
+        )
         return self.final_estimator.fit_predict(
-            self._pre_fit_transform(X, y, **fit_params), y, **fit_params
+            X_preprocessed, y_preprocessed, **fit_params
         )
 
     # noinspection PyPep8Naming
@@ -227,6 +633,107 @@ class LearnerPipelineDF(
                 self._pre_transform(X), y, sample_weight=sample_weight
             )
 
+    # noinspection PyPep8Naming
+    def _pre_transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        routing = self._categorical_routing
+        if routing is None:
+            return super()._pre_transform(X)
+        else:
+            return self._route_categorical(
+                X, self.preprocessing.transform(routing.fill(X))
+            )
+
+    # noinspection PyPep8Naming
+    def _pre_transform_xy(
+        self, X: pd.DataFrame, y: Any, sample_weight: Any
+    ) -> Tuple[pd.DataFrame, Any, Any]:
+        routing = self._categorical_routing
+        if routing is None:
+            return super()._pre_transform_xy(X, y, sample_weight)
+        else:
+            X_preprocessed, y, sample_weight = self.preprocessing.transform_xy(
+                routing.fill(X), y, sample_weight
+            )
+            return self._route_categorical(X, X_preprocessed), y, sample_weight
+
+    # noinspection PyPep8Naming
+    def _pre_fit_transform_xy(
+        self, X: pd.DataFrame, y: Any, sample_weight: Any, **fit_params
+    ) -> Tuple[pd.DataFrame, Any, Any]:
+        self._categorical_routing = None
+
+        preprocessing = self.preprocessing
+        if not self.native_categorical or preprocessing is None:
+            return super()._pre_fit_transform_xy(X, y, sample_weight, **fit_params)
+
+        dtypes: Dict[Any, pd.CategoricalDtype] = {}
+        fill_values: Dict[Any, Any] = {}
+        fill_dtypes: Dict[Any, Any] = {}
+        for column, values in X.items():
+            dtype = values.dtype
+            if not isinstance(dtype, pd.CategoricalDtype):
+                if is_object_dtype(dtype) or is_string_dtype(dtype):
+                    dtype = pd.CategoricalDtype(values.dropna().unique())
+                else:
+                    continue
+            values_valid = values.dropna()
+            if len(values_valid) > 0:
+                dtypes[column] = dtype
+                fill_values[column] = values_valid.iloc[0]
+                fill_dtypes[column] = values.dtype
+
+        if not dtypes:
+            return super()._pre_fit_transform_xy(X, y, sample_weight, **fit_params)
+
+        X_preprocessed, y, sample_weight = preprocessing.fit_transform_xy(
+            _CategoricalRouting.fill_columns(X, fill_values, fill_dtypes),
+            y,
+            sample_weight,
+            **fit_params,
+        )
+
+        # only route the categorical columns the preprocessing step actually uses,
+        # replacing all output columns derived from them
+        features_original = preprocessing.feature_names_original_
+        derived_from_categorical = features_original.isin(list(dtypes))
+        features_used = set(features_original[derived_from_categorical])
+
+        self._categorical_routing = _CategoricalRouting(
+            dtypes={
+                column: dtype
+                for column, dtype in dtypes.items()
+                if column in features_used
+            },
+            fill_values=fill_values,
+            fill_dtypes=fill_dtypes,
+            features_out=features_original.index[~derived_from_categorical],
+        )
+
+        return self._route_categorical(X, X_preprocessed), y, sample_weight
+
+    # noinspection PyPep8Naming
+    def _route_categorical(
+        self, X: pd.DataFrame, X_preprocessed: pd.DataFrame
+    ) -> pd.DataFrame:
+        # combine the preprocessed non-categorical columns with the categorical
+        # input columns, for the observations retained by the preprocessing step
+        routing = self._categorical_routing
+        X_categorical = pd.DataFrame(
+            {
+                column: X[column].astype(dtype)
+                for column, dtype in routing.dtypes.items()
+            },
+            index=X.index,
+        )
+        if not X_categorical.index.equals(X_preprocessed.index):
+            X_categorical = X_categorical.loc[X_preprocessed.index]
+
+        X_routed = pd.concat(
+            [X_preprocessed.loc[:, routing.features_out], X_categorical], axis=1
+        )
+        X_routed.columns = self.feature_names_out_
+        return X_routed
+
 
 @inheritdoc(match="[see superclass]")
 class RegressorPipelineDF(
@@ -242,13 +749,20 @@ class RegressorPipelineDF(
         *,
         preprocessing: Optional[TransformerDF] = None,
         regressor: T_FinalRegressorDF,
+        native_categorical: bool = False,
     ) -> None:
         """
         :param preprocessing: the preprocessing step in the pipeline (default:``None``)
         :param regressor: the regressor used in the pipeline
         :type regressor: :class:`.RegressorDF`
+
+        :param native_categorical: if ``True``, pass categorical input columns to the
+            learner as pandas categoricals, bypassing the preprocessing step; see
+            :class:`.LearnerPipelineDF` for details (default: ``False``)
         """
-        super().__init__(preprocessing=preprocessing)
+        super().__init__(
+            preprocessing=preprocessing, native_categorical=native_categorical
+        )
 
         if not isinstance(regressor, RegressorDF):
             raise TypeError(
@@ -283,13 +797,20 @@ class ClassifierPipelineDF(
         *,
         preprocessing: Optional[TransformerDF] = None,
         classifier: T_FinalClassifierDF,
+        native_categorical: bool = False,
     ) -> None:
         """
         :param preprocessing: the preprocessing step in the pipeline (default: ``None``)
         :param classifier: the classifier used in the pipeline
         :type classifier: :class:`.ClassifierDF`
+
+        :param native_categorical: if ``True``, pass categorical input columns to the
+            learner as pandas categoricals, bypassing the preprocessing step; see
+            :class:`.LearnerPipelineDF` for details (default: ``False``)
         """
-        super().__init__(preprocessing=preprocessing)
+        super().__init__(
+            preprocessing=preprocessing, native_categorical=native_categorical
+        )
 
         if not isinstance(classifier, ClassifierDF):
             raise TypeError(
@@ -339,4 +860,42 @@ class ClassifierPipelineDF(
         )
 
 
+class _CategoricalRouting(NamedTuple):
+    # fitted state of a learner pipeline passing categorical input columns to its
+    # learner as pandas categoricals, bypassing the preprocessing step
+
+    # the categorical input columns passed to the learner, and their dtypes
+    dtypes: Dict[Any, pd.CategoricalDtype]
+
+    # the constants replacing categorical input columns for the preprocessing step
+    fill_values: Dict[Any, Any]
+
+    # the dtypes of the categorical input columns when fitting the preprocessing
+    # step, which all constant columns get regardless of the dtypes of new inputs
+    fill_dtypes: Dict[Any, Any]
+
+    # the output columns of the preprocessing step not derived from categorical
+    # input columns
+    features_out: pd.Index
+
+    # noinspection PyPep8Naming
+    def fill(self, X: pd.DataFrame) -> pd.DataFrame:
+        return self.fill_columns(X, self.fill_values, self.fill_dtypes)
+
+    # noinspection PyPep8Naming
+    @staticmethod
+    def fill_columns(
+        X: pd.DataFrame, fill_values: Dict[Any, Any], fill_dtypes: Dict[Any, Any]
+    ) -> pd.DataFrame:
+        # replace the given columns with constants of the given dtypes, skipping
+        # columns not in X since pruned preprocessing steps may not require them
+        X_filled = X.copy(deep=False)
+        for column, value in fill_values.items():
+            if column in X_filled.columns:
+                X_filled[column] = pd.Series(
+                    value, index=X_filled.index, dtype=fill_dtypes[column]
+                )
+        return X_filled
+
+
 __tracker.validate()
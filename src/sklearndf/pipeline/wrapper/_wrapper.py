@@ -4,16 +4,32 @@ Core implementation of :mod:`sklearndf.pipeline.wrapper`
 
 import logging
 from abc import ABCMeta
-from typing import Iterator, List, Sequence, Tuple, Union, cast
+from copy import deepcopy
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
 import numpy as np
 import pandas as pd
 from pandas.core.arrays import ExtensionArray
+from sklearn.base import clone
 from sklearn.pipeline import FeatureUnion, Pipeline
+from sklearn.utils.validation import check_memory
 
 from pytools.api import AllTracker
 
 from sklearndf import EstimatorDF, TransformerDF
+from sklearndf.parallel import BranchExecutor
 from sklearndf.wrapper import (
     ClassifierWrapperDF,
     RegressorWrapperDF,
@@ -25,6 +41,13 @@ log = logging.getLogger(__name__)
 __all__ = ["PipelineWrapperDF", "FeatureUnionWrapperDF"]
 
 
+#
+# type variables
+#
+
+T_PipelineWrapperDF = TypeVar("T_PipelineWrapperDF", bound="PipelineWrapperDF")
+
+
 #
 # Ensure all symbols introduced below are included in __all__
 #
@@ -92,6 +115,251 @@ class PipelineWrapperDF(
         """
         return self.native_estimator.steps
 
+    @property
+    def required_features_in_(self) -> pd.Index:
+        """
+        A pandas column index with the names of the input features that are actually
+        required to compute the output of this pipeline's transformer steps.
+
+        The required features are determined by tracing the output features of the
+        transformer steps backwards through their feature lineage.
+        Feature selection steps, and column transformers dropping some of their
+        inputs, reduce the required features; transformers whose outputs may depend
+        on any of their inputs, e.g., dimensionality reduction transformers, require
+        all of their inputs.
+
+        See :meth:`.prune_features_in` to obtain an equivalent pipeline that only
+        requires these features as its inputs.
+        """
+        self._ensure_fitted()
+        return self._get_features_in_required(self._get_features_out())
+
+    def prune_features_in(self: T_PipelineWrapperDF) -> T_PipelineWrapperDF:
+        """
+        Make a copy of this fitted pipeline that operates only on the input features
+        it actually requires.
+
+        Starting with the first step, transformer steps are rewritten to only operate
+        on the features that are required by the steps that follow:
+
+        - feature selection steps are replaced by ``"passthrough"``
+        - fitted column-wise transformers, e.g., :class:`.SimpleImputerDF`,
+          :class:`.StandardScalerDF`, or :class:`.MinMaxScalerDF`, are restricted
+          to the required subset of their input columns
+        - nested pipelines are pruned in the same way, restricted to the columns
+          required by the steps that follow
+
+        Pruning stops at the first step that cannot be rewritten.
+        All remaining steps are copied unchanged, and the pruned pipeline then also
+        requires all inputs of that step.
+
+        The resulting pipeline produces the same outputs as this pipeline; its
+        :attr:`.feature_names_in_` lists the inputs it requires, and can be used to
+        only load the columns needed for scoring.
+
+        :return: the pruned copy of this pipeline
+        """
+        self._ensure_fitted()
+
+        steps = self.steps
+        pruned_steps, features_in = self._prune_steps(
+            steps=steps[: self._n_transformer_steps()],
+            features_out=self._get_features_out(),
+        )
+        if features_in is None:
+            features_in = self.feature_names_in_
+
+        native_pipeline = self.native_estimator
+        return self.from_fitted(
+            estimator=type(native_pipeline)(
+                steps=pruned_steps + deepcopy(steps[len(pruned_steps) :]),
+                memory=native_pipeline.memory,
+                verbose=native_pipeline.verbose,
+            ),
+            features_in=features_in,
+            n_outputs=self.n_outputs_,
+        )
+
+    # noinspection PyPep8Naming
+    def fuse_affine_steps(
+        self: T_PipelineWrapperDF, validation_data: Optional[pd.DataFrame] = None
+    ) -> T_PipelineWrapperDF:
+        """
+        Make a copy of this fitted pipeline, replacing each run of consecutive
+        column-wise affine transformer steps with a single :class:`.AffineScalerDF`
+        step.
+
+        Column-wise affine transformers are fitted instances of
+        :class:`.StandardScalerDF`, :class:`.MinMaxScalerDF`,
+        :class:`.MaxAbsScalerDF`, and :class:`.RobustScalerDF`, and
+        instances of :class:`.SimpleImputerDF` replacing ``nan`` values without
+        adding missing indicators.
+        The scales, offsets and missing value replacements of each run are
+        precomputed, so that the fused step transforms its input in a single copy
+        instead of allocating a new data frame for each step.
+
+        Fused steps are named after the steps they replace, joined by ``"+"``.
+
+        Fusing steps may introduce rounding differences within floating point
+        precision.
+        If validation data is given, the transformer steps of the fused pipeline are
+        checked to produce the same output as the transformer steps of this pipeline.
+
+        :param validation_data: input data to check the equivalence of the fused
+            pipeline with this pipeline (optional)
+        :return: the fused copy of this pipeline
+        :raises ValueError: if the fused pipeline does not produce the same output as
+            this pipeline for the validation data
+        """
+        from ...transformation.extra import AffineScalerDF
+
+        self._ensure_fitted()
+
+        steps = self.steps
+        n_transformer_steps = self._n_transformer_steps()
+
+        fused_steps: List[Tuple[str, Union[EstimatorDF, str, None]]] = []
+        run: List[Tuple[str, TransformerDF]] = []
+
+        def _end_run() -> None:
+            if len(run) == 1:
+                fused_steps.append(deepcopy(run[0]))
+            elif len(run) > 1:
+                fused_steps.append(
+                    ("+".join(name for name, _ in run), _fuse(run, AffineScalerDF))
+                )
+            run.clear()
+
+        for name, transformer in steps[:n_transformer_steps]:
+            # noinspection PyProtectedMember
+            if not self._is_passthrough(transformer) and (
+                transformer._get_affine_parameters() is not None
+            ):
+                run.append((name, transformer))
+            else:
+                _end_run()
+                fused_steps.append((name, deepcopy(transformer)))
+
+        _end_run()
+
+        native_pipeline = self.native_estimator
+        fused = self.from_fitted(
+            estimator=type(native_pipeline)(
+                steps=fused_steps + deepcopy(steps[n_transformer_steps:]),
+                memory=native_pipeline.memory,
+                verbose=native_pipeline.verbose,
+            ),
+            features_in=self.feature_names_in_,
+            n_outputs=self.n_outputs_,
+        )
+
+        if validation_data is not None:
+            expected = self._transform_steps(
+                steps[:n_transformer_steps], validation_data
+            )
+            actual = self._transform_steps(fused_steps, validation_data)
+            if not (
+                actual.columns.equals(expected.columns)
+                and np.allclose(actual.values, expected.values, equal_nan=True)
+            ):
+                raise ValueError(
+                    "fused pipeline does not produce the same output as the original "
+                    "pipeline for arg validation_data"
+                )
+
+        return fused
+
+    # noinspection PyPep8Naming
+    def fit_transform_xy(
+        self,
+        X: pd.DataFrame,
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        sample_weight: Optional[pd.Series] = None,
+        **fit_params: Any,
+    ) -> Tuple[
+        pd.DataFrame, Optional[Union[pd.Series, pd.DataFrame]], Optional[pd.Series]
+    ]:
+        """
+        Fit the transformer steps of this pipeline one after the other, passing the
+        outputs and sample weights returned by each step to the next step.
+
+        See :meth:`.TransformerDF.fit_transform_xy`.
+        All steps of this pipeline must be transformers.
+        If the ``memory`` parameter of this pipeline is set, fitted steps are cached
+        in the same way as by the native pipeline.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param y: an optional series or data frame with one or more outputs
+        :param sample_weight: optional weights for all observations
+        :param fit_params: additional keyword parameters for the steps of this
+            pipeline, named ``<step>__<parameter>``
+        :return: a tuple of the transformed inputs, and the outputs and sample weights
+            of the transformed observations
+        :raises TypeError: if a step of this pipeline is not a transformer
+        """
+
+        self._reset_fit()
+
+        try:
+            self._check_parameter_types(X, y)
+
+            steps = self._get_transformer_steps()
+
+            xy = self._fit_transform_steps_xy(
+                steps, (X, y, sample_weight), self._split_fit_params(steps, fit_params)
+            )
+
+            self._post_fit(X, y)
+
+        except Exception as cause:
+            self._reset_fit()
+            raise self._make_verbose_exception(
+                self.fit_transform_xy.__name__, cause
+            ) from cause
+
+        return xy
+
+    # noinspection PyPep8Naming
+    def transform_xy(
+        self,
+        X: pd.DataFrame,
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        sample_weight: Optional[pd.Series] = None,
+    ) -> Tuple[
+        pd.DataFrame, Optional[Union[pd.Series, pd.DataFrame]], Optional[pd.Series]
+    ]:
+        """
+        Transform the given inputs with the transformer steps of this pipeline one
+        after the other, passing the outputs and sample weights returned by each step
+        to the next step.
+
+        See :meth:`.TransformerDF.transform_xy`.
+        All steps of this pipeline must be transformers.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param y: an optional series or data frame with one or more outputs
+        :param sample_weight: optional weights for all observations
+        :return: a tuple of the transformed inputs, and the outputs and sample weights
+            of the transformed observations
+        :raises TypeError: if a step of this pipeline is not a transformer
+        """
+
+        self._ensure_fitted()
+
+        try:
+            self._check_parameter_types(X, y)
+
+            xy = X, y, sample_weight
+            for _, step in self._get_transformer_steps():
+                xy = step.transform_xy(*xy)
+
+        except Exception as cause:
+            raise self._make_verbose_exception(
+                self.transform_xy.__name__, cause
+            ) from cause
+
+        return xy
+
     def __len__(self) -> int:
         """The number of steps of the pipeline."""
         return len(self.native_estimator.steps)
@@ -129,6 +397,229 @@ class PipelineWrapperDF(
         # in the pipeline
         return estimator is None or estimator == PipelineWrapperDF.PASSTHROUGH
 
+    # noinspection PyPep8Naming
+    def _fit(
+        self, X: pd.DataFrame, y: Optional[Union[pd.Series, pd.DataFrame]], **fit_params
+    ) -> Pipeline:
+        # fit all steps but the final step through fit_transform_xy, so that steps
+        # removing observations, e.g., OutlierRemoverDF in "drop" mode, are honoured;
+        # then fit the final step to the remaining observations
+
+        steps = self.steps
+        final_name, final_step = steps[-1]
+        step_fit_params = self._split_fit_params(steps, fit_params)
+
+        # sample weights for the final step are passed through all preceding steps
+        final_fit_params = step_fit_params[final_name]
+        X, y, sample_weight = self._fit_transform_steps_xy(
+            [
+                (name, step)
+                for name, step in steps[:-1]
+                if not self._is_passthrough(step)
+            ],
+            (X, y, final_fit_params.pop("sample_weight", None)),
+            step_fit_params,
+        )
+
+        if not self._is_passthrough(final_step):
+            if sample_weight is not None:
+                final_fit_params["sample_weight"] = sample_weight
+            final_step.fit(X, y, **final_fit_params)
+
+        return self.native_estimator
+
+    # noinspection PyPep8Naming
+    def _fit_transform_steps_xy(
+        self,
+        steps: List[Tuple[str, TransformerDF]],
+        xy: Tuple[pd.DataFrame, Any, Any],
+        step_fit_params: Dict[str, Dict[str, Any]],
+    ) -> Tuple[pd.DataFrame, Any, Any]:
+        # fit the given steps one after the other, caching fitted clones of the
+        # steps if the native pipeline has a memory, as the native pipeline does
+
+        # steps fitted after identical observations have been merged would ignore
+        # how many observations were merged, and therefore are not supported
+        for name, step in steps[:-1]:
+            if _merges_observations(step):
+                raise ValueError(
+                    f"step {name} merges identical observations, and must be the "
+                    "last preprocessing step"
+                )
+
+        memory = check_memory(self.native_estimator.memory)
+        fit_transform_one_cached = memory.cache(_fit_transform_xy_one)
+
+        native_steps = self.native_estimator.steps
+        positions = {name: i for i, (name, _) in enumerate(native_steps)}
+
+        X_in = xy[0]
+
+        for name, step in steps:
+            fit_params = step_fit_params[name]
+            if "sample_weight" in fit_params:
+                # the step's own sample weights, for the observations remaining after
+                # the preceding steps
+                fit_params = {
+                    **fit_params,
+                    "sample_weight": _align_sample_weight(
+                        name, fit_params["sample_weight"], X_in, xy[0]
+                    ),
+                }
+
+            if memory.location is None:
+                # no caching: fit the step in place
+                xy, _ = _fit_transform_xy_one(step, xy, fit_params)
+            else:
+                xy, fitted_step = fit_transform_one_cached(clone(step), xy, fit_params)
+                # replace the step with the fitted clone, which may have been
+                # loaded from the cache
+                native_steps[positions[name]] = (name, fitted_step)
+
+        return xy
+
+    @staticmethod
+    def _split_fit_params(
+        steps: List[Tuple[str, Any]], fit_params: Dict[str, Any]
+    ) -> Dict[str, Dict[str, Any]]:
+        # split fit parameters named <step>__<parameter> by step
+        step_fit_params: Dict[str, Dict[str, Any]] = {name: {} for name, _ in steps}
+        for param, value in fit_params.items():
+            name, _, step_param = param.partition("__")
+            if name not in step_fit_params or not step_param:
+                raise ValueError(
+                    f"fit parameter {param} must be named <step>__<parameter>"
+                )
+            step_fit_params[name][step_param] = value
+        return step_fit_params
+
+    def _get_transformer_steps(self) -> List[Tuple[str, TransformerDF]]:
+        # all steps except "passthrough" steps, ensuring they are all transformers
+
+        steps = [
+            (name, step) for name, step in self.steps if not self._is_passthrough(step)
+        ]
+
+        for name, step in steps:
+            if not isinstance(step, TransformerDF):
+                raise TypeError(
+                    f"step {name} is not a transformer: {type(step).__name__}"
+                )
+
+        return steps
+
+    def _n_transformer_steps(self) -> int:
+        # the number of transformer steps, including "passthrough" steps but
+        # excluding the final step in case it is not a transformer
+        steps = self.steps
+
+        if len(steps) == 0:
+            return 0
+
+        final_estimator = steps[-1][1]
+
+        if self._is_passthrough(final_estimator) or isinstance(
+            final_estimator, TransformerDF
+        ):
+            return len(steps)
+        else:
+            return len(steps) - 1
+
+    @staticmethod
+    def _prune_steps(
+        steps: List[Tuple[str, Union[EstimatorDF, str, None]]],
+        features_out: pd.Index,
+    ) -> Tuple[List[Tuple[str, Union[EstimatorDF, str, None]]], Optional[pd.Index]]:
+        # rewrite a prefix of the given transformer steps such that they only operate
+        # on the input columns required to produce the given output columns;
+        # return the rewritten steps, and the input columns they require
+
+        n_steps = len(steps)
+
+        while n_steps > 0:
+            # determine the required input columns of each step, going backwards
+            features_required: List[pd.Index] = [features_out]
+            for _, transformer in reversed(steps[:n_steps]):
+                if not PipelineWrapperDF._is_passthrough(transformer):
+                    # noinspection PyProtectedMember
+                    features_required.insert(
+                        0, transformer._get_features_in_required(features_required[0])
+                    )
+                else:
+                    features_required.insert(0, features_required[0])
+
+            # rewrite the steps, going forward
+            pruned_steps = []
+            for (name, transformer), features_in, features_required_out in zip(
+                steps[:n_steps], features_required[:-1], features_required[1:]
+            ):
+                pruned = PipelineWrapperDF._prune_step(
+                    transformer, features_in, features_required_out
+                )
+                if pruned is None:
+                    break
+                pruned_steps.append((name, pruned))
+
+            if len(pruned_steps) == n_steps:
+                return pruned_steps, features_required[0]
+
+            # retry with the steps preceding the step that could not be pruned, so
+            # that they produce all inputs of that step
+            n_steps = len(pruned_steps)
+            features_out = steps[n_steps][1].feature_names_in_
+
+        return [], None
+
+    @staticmethod
+    def _prune_step(
+        transformer: Union[TransformerDF, str, None],
+        features_in: pd.Index,
+        features_out: pd.Index,
+    ) -> Union[TransformerDF, str, None]:
+        # rewrite a transformer step to operate on the given input columns and
+        # produce the given output columns, or return None if this is not possible
+
+        def _same_features(a: pd.Index, b: pd.Index) -> bool:
+            return len(a) == len(b) and a.isin(b).all()
+
+        if PipelineWrapperDF._is_passthrough(transformer):
+            return transformer
+
+        if _same_features(
+            features_in, transformer.feature_names_in_
+        ) and _same_features(features_out, transformer.feature_names_out_):
+            # nothing to prune
+            return deepcopy(transformer)
+
+        # noinspection PyProtectedMember
+        pruned = transformer._prune_features_in(features_in)
+
+        if pruned is None:
+            return None
+        elif PipelineWrapperDF._is_passthrough(pruned):
+            pruned_features_in = pruned_features_out = features_in
+        else:
+            pruned_features_in = pruned.feature_names_in_
+            pruned_features_out = pruned.feature_names_out_
+
+        if _same_features(pruned_features_in, features_in) and _same_features(
+            pruned_features_out, features_out
+        ):
+            return pruned
+        else:
+            return None
+
+    # noinspection PyPep8Naming
+    @staticmethod
+    def _transform_steps(
+        steps: List[Tuple[str, Union[EstimatorDF, str, None]]], X: pd.DataFrame
+    ) -> pd.DataFrame:
+        # transform the given input with each of the given transformer steps
+        for _, transformer in steps:
+            if not PipelineWrapperDF._is_passthrough(transformer):
+                X = transformer.transform(X)
+        return X
+
     def _transformer_steps(self) -> Iterator[Tuple[str, TransformerDF]]:
         # make an iterator of all transform steps, i.e. excluding the final step
         # in case it is not a transformer
@@ -198,6 +689,78 @@ class PipelineWrapperDF(
 
         return self.feature_names_in_
 
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        for _, transformer in reversed(list(self._transformer_steps())):
+            # noinspection PyProtectedMember
+            features_out = transformer._get_features_in_required(features_out)
+
+        features_in = self.feature_names_in_
+        return features_in[features_in.isin(features_out)]
+
+    def _prune_features_in(
+        self, features_in: pd.Index
+    ) -> Union[TransformerDF, str, None]:
+        # rewrite all transformer steps, going forward, to operate only on the
+        # columns derived from the given input columns
+        steps = self.steps
+        if self._n_transformer_steps() < len(steps):
+            return None
+
+        features_in = self.feature_names_in_[self.feature_names_in_.isin(features_in)]
+        features = features_in
+        pruned_steps = []
+        for name, transformer in steps:
+            if PipelineWrapperDF._is_passthrough(transformer):
+                pruned_steps.append((name, transformer))
+                continue
+
+            unchanged = len(features) == len(transformer.feature_names_in_)
+            if unchanged and features.isin(transformer.feature_names_in_).all():
+                # nothing to prune
+                pruned = deepcopy(transformer)
+            else:
+                # noinspection PyProtectedMember
+                pruned = transformer._prune_features_in(features)
+                if pruned is None:
+                    return None
+
+            if PipelineWrapperDF._is_passthrough(pruned):
+                # the step would pass through all columns it receives, so these must
+                # all be among its outputs
+                if not features.isin(transformer.feature_names_out_).all():
+                    return None
+            else:
+                features = pruned.feature_names_out_
+            pruned_steps.append((name, pruned))
+
+        native_pipeline = self.native_estimator
+        return self.from_fitted(
+            estimator=type(native_pipeline)(
+                steps=pruned_steps,
+                memory=native_pipeline.memory,
+                verbose=native_pipeline.verbose,
+            ),
+            features_in=features_in,
+            n_outputs=self.n_outputs_,
+        )
+
+    def _get_linear_map(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        # compose the linear maps of all transformer steps
+        features_in = self.feature_names_in_
+        matrix = np.eye(len(features_in))
+        offset = np.zeros(len(features_in))
+
+        for _, transformer in self._transformer_steps():
+            # noinspection PyProtectedMember
+            linear_map = transformer._get_linear_map()
+            if linear_map is None:
+                return None
+            step_matrix, step_offset = linear_map
+            matrix = matrix @ step_matrix
+            offset = offset @ step_matrix + step_offset
+
+        return matrix, offset
+
 
 class FeatureUnionWrapperDF(TransformerWrapperDF[FeatureUnion], metaclass=ABCMeta):
     """
@@ -205,6 +768,17 @@ class FeatureUnionWrapperDF(TransformerWrapperDF[FeatureUnion], metaclass=ABCMet
     :class:`~sklearn.pipeline.FeatureUnion`.
     """
 
+    # the keys of the fitted steps of each transformer, determined when fitting and
+    # used to share steps when transforming; None unless fitted by this wrapper
+    _step_keys: Optional[List[List[Any]]] = None
+
+    def _reset_fit(self) -> None:
+        try:
+            # noinspection PyProtectedMember
+            super()._reset_fit()
+        finally:
+            self._step_keys = None
+
     @staticmethod
     def _prepend_features_out(features_out: pd.Index, name_prefix: str) -> pd.Index:
         return pd.Index(data=f"{name_prefix}__" + features_out.astype(str))
@@ -257,6 +831,212 @@ class FeatureUnionWrapperDF(TransformerWrapperDF[FeatureUnion], metaclass=ABCMet
         else:
             return indices[0].append(other=indices[1:])
 
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        # collect the input columns required by each transformer that produces any
+        # of the given output columns
+        required = set()
+
+        # noinspection PyProtectedMember
+        for name, transformer, _ in self.native_estimator._iter():
+            transformer_out = transformer.feature_names_out_
+            is_required = self._prepend_features_out(
+                features_out=transformer_out, name_prefix=name
+            ).isin(features_out)
+            if is_required.any():
+                # noinspection PyProtectedMember
+                required.update(
+                    transformer._get_features_in_required(transformer_out[is_required])
+                )
+
+        features_in = self.feature_names_in_
+        return features_in[features_in.isin(required)]
+
+    # noinspection PyPep8Naming
+    def _fit(
+        self, X: pd.DataFrame, y: Optional[pd.Series], **fit_params
+    ) -> FeatureUnion:
+        self._fit_transform(X, y, **fit_params)
+        return self.native_estimator
+
+    # noinspection PyPep8Naming
+    def _fit_transform(
+        self, X: pd.DataFrame, y: Optional[pd.Series], **fit_params
+    ) -> np.ndarray:
+        native = self.native_estimator
+
+        # fit clones of the transformers, sharing common steps and in parallel if
+        # the native feature union has more than one job, then replace the
+        # transformers of the native feature union with the fitted clones
+
+        # noinspection PyProtectedMember
+        native._validate_transformers()
+        # noinspection PyProtectedMember
+        branches = list(native._iter())
+
+        executor = BranchExecutor(n_jobs=native.n_jobs)
+        fitted = executor.fit_transform(
+            [(clone(transformer), X) for _, transformer, _ in branches],
+            y,
+            **fit_params,
+        )
+
+        # noinspection PyProtectedMember
+        native._update_transformer_list([transformer for transformer, _ in fitted])
+
+        # compare the fitted steps once, instead of each time we transform
+        self._step_keys = executor.fitted_step_keys(
+            [transformer for transformer, _ in fitted]
+        )
+
+        return _stack_branches(
+            X,
+            [
+                (transformed, weight)
+                for (_, transformed), (_, _, weight) in zip(fitted, branches)
+            ],
+        )
+
+    # noinspection PyPep8Naming
+    def _transform(self, X: pd.DataFrame) -> np.ndarray:
+        native = self.native_estimator
+
+        # noinspection PyProtectedMember
+        branches = list(native._iter())
+
+        transformed = BranchExecutor(n_jobs=native.n_jobs).transform(
+            [(transformer, X) for _, transformer, _ in branches],
+            step_keys=self._step_keys,
+        )
+
+        return _stack_branches(
+            X,
+            [
+                (transformed_branch, weight)
+                for transformed_branch, (_, _, weight) in zip(transformed, branches)
+            ],
+        )
+
+
+#
+# private helper functions
+#
+
+
+# noinspection PyPep8Naming
+def _fit_transform_xy_one(
+    transformer: TransformerDF,
+    xy: Tuple[pd.DataFrame, Any, Any],
+    fit_params: Dict[str, Any],
+) -> Tuple[Tuple[pd.DataFrame, Any, Any], TransformerDF]:
+    # fit the given transformer, returning its outputs along with the fitted
+    # transformer so that both can be cached; the given sample weights are kept
+    # apart from the fit parameters, which may include the transformer's own
+    # sample weights
+
+    X, y, sample_weight = xy
+
+    if "sample_weight" in fit_params:
+        # the transformer has sample weights of its own: fit it with these, and pass
+        # on the given sample weights for the subsequent steps
+        return (
+            transformer.fit(X, y, **fit_params).transform_xy(X, y, sample_weight),
+            transformer,
+        )
+    else:
+        return (
+            transformer.fit_transform_xy(X, y, sample_weight, **fit_params),
+            transformer,
+        )
+
+
+# noinspection PyPep8Naming
+def _align_sample_weight(
+    name: str, sample_weight: Any, X_in: pd.DataFrame, X: pd.DataFrame
+) -> Any:
+    # select the sample weights of the observations in X, given sample weights for
+    # the observations in X_in, from which preceding steps may have removed
+    # observations
+
+    if len(sample_weight) != len(X_in):
+        raise ValueError(
+            f"sample weights of step {name} must have one weight per observation, "
+            f"but got {len(sample_weight)} weights for {len(X_in)} observations"
+        )
+
+    if X is X_in or X.index.equals(X_in.index):
+        return sample_weight
+
+    positions = (
+        X_in.index.get_indexer(X.index) if X_in.index.is_unique else np.array([-1])
+    )
+    if (positions < 0).any():
+        raise ValueError(
+            f"sample weights of step {name} cannot be matched with the observations "
+            "remaining after the preceding steps; the index of the observations "
+            "must be unique, and must be preserved by the preceding steps"
+        )
+
+    if isinstance(sample_weight, pd.Series):
+        return sample_weight.iloc[positions]
+    else:
+        return np.asarray(sample_weight)[positions]
+
+
+def _merges_observations(step: TransformerDF) -> bool:
+    # True if the given step merges identical observations when fitting
+    from ...transformation.extra import DeduplicateDF
+
+    if isinstance(step, PipelineWrapperDF):
+        return any(_merges_observations(substep) for _, substep in step.steps)
+    else:
+        return isinstance(step, DeduplicateDF)
+
+
+def _fuse(
+    steps: List[Tuple[str, TransformerDF]], fused_type: Type[TransformerDF]
+) -> TransformerDF:
+    # compose the affine parameters of the given steps into a single fitted transformer
+
+    features_in = steps[0][1].feature_names_in_
+    n_features = len(features_in)
+
+    scale = np.ones(n_features)
+    offset = np.zeros(n_features)
+    fill = np.full(n_features, np.nan)
+
+    for _, transformer in steps:
+        # noinspection PyProtectedMember
+        step_scale, step_offset, step_fill = transformer._get_affine_parameters()
+        # missing values remain missing unless replaced by this step, and replaced
+        # values are transformed like all other values
+        fill = np.where(np.isnan(fill), step_fill, fill * step_scale + step_offset)
+        scale = scale * step_scale
+        offset = offset * step_scale + step_offset
+
+    return fused_type(
+        scale=pd.Series(scale, index=features_in),
+        offset=pd.Series(offset, index=features_in),
+        fill=pd.Series(fill, index=features_in),
+    ).fit(pd.DataFrame(columns=features_in))
+
+
+# noinspection PyPep8Naming
+def _stack_branches(
+    X: pd.DataFrame, branches: List[Tuple[np.ndarray, Optional[float]]]
+) -> np.ndarray:
+    # apply the transformer weights of a feature union to the transformed branches,
+    # and stack the results horizontally
+
+    if not branches:
+        return np.zeros((len(X), 0))
+
+    return np.hstack(
+        [
+            transformed if weight is None else transformed * weight
+            for transformed, weight in branches
+        ]
+    )
+
 
 #
 # Validate __all__
@@ -52,13 +52,22 @@ from sklearn.tree import DecisionTreeRegressor, ExtraTreeRegressor
 
 from pytools.api import AllTracker
 
+from .. import __sklearn_1_0__, __sklearn_version__
 from ..wrapper import make_df_regressor
 from .wrapper import (
+    HistGradientBoostingRegressorWrapperDF,
     IsotonicRegressionWrapperDF,
     MetaRegressorWrapperDF,
     RegressorTransformerWrapperDF,
 )
 
+if __sklearn_version__ < __sklearn_1_0__:
+    # histogram-based gradient boosting is experimental before scikit-learn 1.0
+    # noinspection PyUnresolvedReferences
+    from sklearn.experimental import enable_hist_gradient_boosting  # noqa: F401
+
+from sklearn.ensemble import HistGradientBoostingRegressor
+
 # noinspection PyProtectedMember
 
 log = logging.getLogger(__name__)
@@ -77,6 +86,7 @@ __all__ = [
     "ExtraTreesRegressorDF",
     "GaussianProcessRegressorDF",
     "GradientBoostingRegressorDF",
+    "HistGradientBoostingRegressorDF",
     "HuberRegressorDF",
     "IsotonicRegressionDF",
     "KernelRidgeDF",
@@ -211,6 +221,9 @@ LassoLarsCVDF = make_df_regressor(LassoLarsCV)
 
 BaggingRegressorDF = make_df_regressor(BaggingRegressor)
 GradientBoostingRegressorDF = make_df_regressor(GradientBoostingRegressor)
+HistGradientBoostingRegressorDF = make_df_regressor(
+    HistGradientBoostingRegressor, base_wrapper=HistGradientBoostingRegressorWrapperDF
+)
 AdaBoostRegressorDF = make_df_regressor(AdaBoostRegressor)
 RandomForestRegressorDF = make_df_regressor(RandomForestRegressor)
 ExtraTreesRegressorDF = make_df_regressor(ExtraTreesRegressor)
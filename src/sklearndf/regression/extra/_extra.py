@@ -7,6 +7,7 @@ import warnings
 from pytools.api import AllTracker
 
 from ...wrapper import make_df_regressor
+from ..wrapper import LGBMRegressorWrapperDF
 
 # since we install LGBM via conda, the warning about the Clang compiler is irrelevant
 warnings.filterwarnings("ignore", message=r"Starting from version 2\.2\.1")
@@ -34,7 +35,7 @@ __tracker = AllTracker(globals(), allow_imported_definitions=True)
 # Class definitions
 #
 
-LGBMRegressorDF = make_df_regressor(LGBMRegressor)
+LGBMRegressorDF = make_df_regressor(LGBMRegressor, base_wrapper=LGBMRegressorWrapperDF)
 
 
 #
@@ -14,6 +14,8 @@ from pytools.api import AllTracker
 
 from sklearndf.transformation.wrapper import ColumnPreservingTransformerWrapperDF
 from sklearndf.wrapper import (
+    HistGradientBoostingWrapperDF,
+    LGBMWrapperDF,
     MetaEstimatorWrapperDF,
     RegressorWrapperDF,
     StackingEstimatorWrapperDF,
@@ -23,6 +25,8 @@ log = logging.getLogger(__name__)
 
 __all__ = [
     "IsotonicRegressionWrapperDF",
+    "HistGradientBoostingRegressorWrapperDF",
+    "LGBMRegressorWrapperDF",
     "MetaRegressorWrapperDF",
     "RegressorTransformerWrapperDF",
     "StackingRegressorWrapperDF",
@@ -77,6 +81,35 @@ class StackingRegressorWrapperDF(
     pass
 
 
+class HistGradientBoostingRegressorWrapperDF(
+    HistGradientBoostingWrapperDF[T_NativeRegressor],
+    RegressorWrapperDF,
+    Generic[T_NativeRegressor],
+    metaclass=ABCMeta,
+):
+    """
+    DF wrapper for :class:`sklearn.ensemble.HistGradientBoostingRegressor`, supporting
+    early stopping on validation data frames and a cap on OpenMP threads; see
+    :class:`.HistGradientBoostingWrapperDF`.
+    """
+
+    pass
+
+
+class LGBMRegressorWrapperDF(
+    LGBMWrapperDF[T_NativeRegressor],
+    RegressorWrapperDF,
+    Generic[T_NativeRegressor],
+    metaclass=ABCMeta,
+):
+    """
+    DF wrapper for :class:`lightgbm.LGBMRegressor`, supporting fit parameter
+    ``dataset_cache``; see :class:`.LGBMDatasetCache`.
+    """
+
+    pass
+
+
 class RegressorTransformerWrapperDF(
     RegressorWrapperDF[T_Regressor],
     ColumnPreservingTransformerWrapperDF[T_Regressor],
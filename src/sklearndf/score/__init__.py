@@ -0,0 +1,8 @@
+"""
+Batch scoring of parquet and CSV files with fitted `sklearndf` estimators.
+
+Run ``python -m sklearndf.score --model model.pkl --input in.parquet --output
+out.parquet`` to score a file from the command line; see :func:`.score_file` for
+details.
+"""
+from ._score import *
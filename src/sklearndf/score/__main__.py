@@ -0,0 +1,64 @@
+"""
+Score a parquet or CSV file with a pickled `sklearndf` estimator.
+
+Usage: ``python -m sklearndf.score --model model.pkl --input in.parquet --output
+out.parquet [options]``; run with ``--help`` for the available options.
+"""
+
+import argparse
+import logging
+from typing import List, Optional
+
+from sklearndf.score import score_file
+
+
+def _main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m sklearndf.score",
+        description="Score a parquet or CSV file with a pickled sklearndf estimator.",
+    )
+    parser.add_argument("--model", required=True, help="path to the pickled estimator")
+    parser.add_argument("--input", required=True, help="parquet or CSV input file")
+    parser.add_argument("--output", required=True, help="parquet or CSV output file")
+    parser.add_argument(
+        "--method",
+        help="estimator method to score with (default: predict for learners, "
+        "transform for transformers)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        help="rows per chunk (default: parquet row groups, or 100000 CSV rows)",
+    )
+    parser.add_argument(
+        "--keep-columns",
+        nargs="*",
+        default=(),
+        help="input columns to copy to the output, e.g., observation IDs",
+    )
+    arguments = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO)
+
+    statistics = score_file(
+        arguments.model,
+        arguments.input,
+        arguments.output,
+        method=arguments.method,
+        n_workers=arguments.workers,
+        chunk_size=arguments.chunk_size,
+        keep_columns=arguments.keep_columns,
+    )
+
+    for name, value in statistics.items():
+        print(f"{name}: {value if value is None else format(value, ',.6g')}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,315 @@
+"""
+Core implementation of :mod:`sklearndf.score`
+"""
+
+import logging
+import multiprocessing
+import multiprocessing.pool
+import sys
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence
+
+import joblib
+import pandas as pd
+
+from pytools.api import AllTracker
+
+from .. import EstimatorDF, LearnerDF, TransformerDF
+
+log = logging.getLogger(__name__)
+
+__all__ = ["score_file"]
+
+
+#
+# Constants
+#
+
+_FORMAT_PARQUET = "parquet"
+_FORMAT_CSV = "csv"
+_DEFAULT_CSV_CHUNK_SIZE = 100_000
+
+
+#
+# Ensure all symbols introduced below are included in __all__
+#
+
+__tracker = AllTracker(globals())
+
+
+#
+# Function definitions
+#
+
+
+def score_file(
+    model_path: str,
+    input_path: str,
+    output_path: str,
+    *,
+    method: Optional[str] = None,
+    n_workers: int = 1,
+    chunk_size: Optional[int] = None,
+    keep_columns: Sequence[str] = (),
+) -> Dict[str, Any]:
+    """
+    Score a parquet or CSV file with a pickled, fitted estimator, and write the
+    results to a parquet or CSV file.
+
+    The input file is processed in chunks: row groups for parquet files, and chunks
+    of ``chunk_size`` rows for CSV files.
+    Only the columns listed in the estimator's
+    :attr:`~.EstimatorDF.feature_names_in_` are read, plus any additional columns to
+    be copied to the output.
+
+    Chunks are scored in parallel by a pool of worker processes, each of which loads
+    the estimator once; results are written incrementally, in the same order as
+    the input, while keeping at most two chunks per worker in memory.
+
+    File formats are determined by file extension: ``.parquet`` or ``.pq`` for
+    parquet files, which require package `pyarrow`, and ``.csv`` (optionally
+    compressed, e.g., ``.csv.gz``) for CSV files.
+
+    :param model_path: path to the pickled estimator
+    :param input_path: path to the input file
+    :param output_path: path to the output file
+    :param method: the estimator method to score with; defaults to ``"predict"``
+        for learners and ``"transform"`` for transformers
+    :param n_workers: the number of worker processes; if ``1``, score in the
+        current process
+    :param chunk_size: the number of rows per chunk; defaults to the row groups of
+        parquet files, and to 100,000 rows for CSV files
+    :param keep_columns: names of input columns to copy to the output, ahead of the
+        scores, e.g., to identify the scored observations
+    :return: throughput and memory statistics
+    """
+    if n_workers < 1:
+        raise ValueError(f"arg n_workers must be positive but is {n_workers}")
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError(f"arg chunk_size must be positive but is {chunk_size}")
+
+    model = joblib.load(model_path)
+    if method is None:
+        if isinstance(model, LearnerDF):
+            method = "predict"
+        elif isinstance(model, TransformerDF):
+            method = "transform"
+        else:
+            raise TypeError(
+                f"expected the pickled model to be a LearnerDF or TransformerDF "
+                f"but got a {type(model).__name__}"
+            )
+    elif not (isinstance(model, EstimatorDF) and hasattr(model, method)):
+        raise ValueError(f"model does not support method {method!r}")
+
+    features: List[str] = list(model.feature_names_in_)
+    keep_columns = list(keep_columns)
+    columns = keep_columns + [
+        column for column in features if column not in keep_columns
+    ]
+
+    input_format = _file_format(input_path)
+    output_format = _file_format(output_path)
+
+    start = time.perf_counter()
+    n_rows = 0
+    n_chunks = 0
+
+    chunks = _read_chunks(input_path, input_format, columns, chunk_size)
+
+    if n_workers == 1:
+        results = (
+            _score_chunk(model, method, features, keep_columns, chunk)
+            for chunk in chunks
+        )
+    else:
+        # the workers load their own copy of the model
+        del model
+        results = _score_chunks_in_pool(
+            model_path, method, features, keep_columns, chunks, n_workers
+        )
+
+    writer = _ChunkWriter(output_path, output_format)
+    try:
+        for result in results:
+            writer.write(result)
+            n_rows += len(result)
+            n_chunks += 1
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - start
+
+    return {
+        "rows": n_rows,
+        "chunks": n_chunks,
+        "seconds": seconds,
+        "rows_per_second": n_rows / seconds if seconds > 0 else None,
+        "peak_memory_mb": _peak_memory_mb(children=False),
+        "peak_worker_memory_mb": (
+            _peak_memory_mb(children=True) if n_workers > 1 else None
+        ),
+    }
+
+
+def _file_format(path: str) -> str:
+    suffixes = path.lower().split(".")[1:]
+    if suffixes and suffixes[-1] in ("parquet", "pq"):
+        return _FORMAT_PARQUET
+    elif "csv" in suffixes:
+        return _FORMAT_CSV
+    else:
+        raise ValueError(f"unsupported file format: {path}")
+
+
+def _read_chunks(
+    path: str, file_format: str, columns: List[str], chunk_size: Optional[int]
+) -> Iterator[pd.DataFrame]:
+    if file_format == _FORMAT_PARQUET:
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        if chunk_size is None:
+            for i in range(parquet_file.num_row_groups):
+                yield parquet_file.read_row_group(i, columns=columns).to_pandas()
+        else:
+            for batch in parquet_file.iter_batches(
+                batch_size=chunk_size, columns=columns
+            ):
+                yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(
+            path, usecols=columns, chunksize=chunk_size or _DEFAULT_CSV_CHUNK_SIZE
+        )
+
+
+# noinspection PyPep8Naming
+def _score_chunk(
+    model: EstimatorDF,
+    method: str,
+    features: List[str],
+    keep_columns: List[str],
+    chunk: pd.DataFrame,
+) -> pd.DataFrame:
+    result = getattr(model, method)(chunk.loc[:, features])
+
+    if isinstance(result, pd.Series):
+        result = result.to_frame(name=result.name or method)
+    elif not isinstance(result, pd.DataFrame):
+        raise TypeError(
+            f"method {method} must return a series or a data frame, "
+            f"but returned a {type(result).__name__}"
+        )
+
+    result.columns = result.columns.astype(str)
+
+    if keep_columns:
+        result = pd.concat([chunk.loc[:, keep_columns], result], axis=1)
+
+    return result
+
+
+def _score_chunks_in_pool(
+    model_path: str,
+    method: str,
+    features: List[str],
+    keep_columns: List[str],
+    chunks: Iterator[pd.DataFrame],
+    n_workers: int,
+) -> Iterator[pd.DataFrame]:
+    # score chunks in parallel, keeping the order of results, and keeping at most two
+    # chunks per worker in flight so that memory use stays bounded
+
+    with multiprocessing.Pool(
+        n_workers, initializer=_init_worker, initargs=(model_path,)
+    ) as pool:
+        in_flight: Deque[multiprocessing.pool.AsyncResult] = deque()
+
+        for chunk in chunks:
+            if len(in_flight) >= 2 * n_workers:
+                yield in_flight.popleft().get()
+            in_flight.append(
+                pool.apply_async(
+                    _worker_score_chunk, (method, features, keep_columns, chunk)
+                )
+            )
+
+        while in_flight:
+            yield in_flight.popleft().get()
+
+
+class _ChunkWriter:
+    # writes chunks incrementally to a parquet or CSV file
+
+    def __init__(self, path: str, file_format: str) -> None:
+        self.path = path
+        self.file_format = file_format
+        self._parquet_writer = None
+        self._first = True
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if self.file_format == _FORMAT_PARQUET:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet_writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                # the dtypes of later chunks can differ from the first chunk, e.g.,
+                # integers are read as floats from CSV chunks with missing values;
+                # convert them to the schema of the file
+                table = pa.Table.from_pandas(
+                    chunk, schema=self._parquet_writer.schema, preserve_index=False
+                )
+            self._parquet_writer.write_table(table)
+        else:
+            chunk.to_csv(
+                self.path,
+                mode="w" if self._first else "a",
+                header=self._first,
+                index=False,
+            )
+        self._first = False
+
+    def close(self) -> None:
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def _peak_memory_mb(children: bool) -> Optional[float]:
+    # peak resident set size of this process, or of its largest child process
+    try:
+        import resource
+    except ImportError:
+        # not available on Windows
+        return None
+
+    peak = resource.getrusage(
+        resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    ).ru_maxrss
+
+    # reported in bytes on macOS, and in kilobytes elsewhere
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10)
+
+
+#
+# Worker processes
+#
+
+_worker_model: Optional[EstimatorDF] = None
+
+
+def _init_worker(model_path: str) -> None:
+    global _worker_model
+    _worker_model = joblib.load(model_path)
+
+
+def _worker_score_chunk(
+    method: str, features: List[str], keep_columns: List[str], chunk: pd.DataFrame
+) -> pd.DataFrame:
+    return _score_chunk(_worker_model, method, features, keep_columns, chunk)
+
+
+__tracker.validate()
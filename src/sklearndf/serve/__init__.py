@@ -0,0 +1,7 @@
+"""
+Serve predictions of fitted `sklearndf` learners and transformers over HTTP.
+
+Run ``python -m sklearndf.serve model.pkl`` to serve a pickled estimator; see
+:class:`.ModelServer` for details.
+"""
+from ._serve import *
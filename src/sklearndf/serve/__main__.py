@@ -0,0 +1,67 @@
+"""
+Serve a pickled `sklearndf` estimator over HTTP.
+
+Usage: ``python -m sklearndf.serve model.pkl [options]``; run with ``--help`` for
+the available options.
+"""
+
+import argparse
+import logging
+from typing import List, Optional
+
+from sklearndf.serve import ModelServer
+
+
+def _main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m sklearndf.serve",
+        description="Serve predictions of a pickled sklearndf estimator over HTTP.",
+    )
+    parser.add_argument("model", help="path to the pickled estimator")
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="host to bind to (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--port", type=int, default=8000, help="TCP port (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--unix-socket", help="serve on this Unix domain socket instead of TCP"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-batch",
+        type=int,
+        default=256,
+        help="maximum observations per batch (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=5.0,
+        help="maximum wait for a batch to fill, in ms (default: %(default)s)",
+    )
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    arguments = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.DEBUG if arguments.verbose else logging.INFO)
+
+    server = ModelServer(
+        arguments.model,
+        n_workers=arguments.workers,
+        max_batch=arguments.max_batch,
+        max_wait_ms=arguments.max_wait_ms,
+    )
+
+    if arguments.unix_socket:
+        server.serve_unix(arguments.unix_socket)
+    else:
+        server.serve_http(host=arguments.host, port=arguments.port)
+
+
+if __name__ == "__main__":
+    _main()
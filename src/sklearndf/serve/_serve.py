@@ -0,0 +1,514 @@
+"""
+Core implementation of :mod:`sklearndf.serve`
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import multiprocessing.pool
+import os
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import BaseServer, ThreadingMixIn, UnixStreamServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from pytools.api import AllTracker
+
+from .. import EstimatorDF
+from .._sklearndf import _MicroBatcher
+
+log = logging.getLogger(__name__)
+
+__all__ = ["ModelServer"]
+
+
+#
+# type variables
+#
+
+T_Self = TypeVar("T_Self")
+
+
+#
+# Constants
+#
+
+_CONTENT_TYPE_JSON = "application/json"
+_CONTENT_TYPE_ARROW = "application/vnd.apache.arrow.stream"
+_SERVED_METHODS = ("predict", "predict_proba", "predict_log_proba", "transform")
+
+
+#
+# Ensure all symbols introduced below are included in __all__
+#
+
+__tracker = AllTracker(globals())
+
+
+#
+# Class definitions
+#
+
+
+class ModelServer:
+    """
+    Serves predictions or transformations of a pickled, fitted `sklearndf` estimator.
+
+    Concurrent requests are coalesced into batches of up to ``max_batch``
+    observations, waiting at most ``max_wait_ms`` milliseconds for further requests
+    to join a batch.
+    Each batch is processed by one of a pool of worker processes, each of which
+    loads the estimator once at start-up.
+
+    Requests are handled by :meth:`.handle`, independently of the transport;
+    :meth:`.serve_http` and :meth:`.serve_unix` make the server available over HTTP
+    on a TCP port or on a Unix domain socket.
+    The server supports the following requests:
+
+    - ``POST /predict``, ``POST /predict_proba``, ``POST /predict_log_proba``, and
+      ``POST /transform``, depending on the methods supported by the estimator:
+      the request body is a data frame, either as JSON in pandas ``split``
+      orientation (or as a list of records), or as an Apache Arrow IPC stream; the
+      response uses the same format as the request
+    - ``GET /stats``: latency histogram and batch size statistics, as JSON
+    - ``GET /health``: returns status 200 if the server is running
+
+    The server must be started using :meth:`.start` before it can handle requests,
+    or alternatively be used as a context manager.
+    """
+
+    #: Upper bounds of the buckets of the latency histogram, in milliseconds.
+    LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    #: Upper bounds of the buckets of the batch size histogram.
+    BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+    def __init__(
+        self,
+        model_path: str,
+        *,
+        n_workers: int = 1,
+        max_batch: int = 256,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        """
+        :param model_path: path to the pickled estimator
+        :param n_workers: number of worker processes
+        :param max_batch: maximum number of observations in a batch
+        :param max_wait_ms: maximum time in milliseconds to wait for further requests
+            to join a batch
+        """
+        if n_workers < 1:
+            raise ValueError(f"arg n_workers must be positive but is {n_workers}")
+        if max_batch < 1:
+            raise ValueError(f"arg max_batch must be positive but is {max_batch}")
+        if max_wait_ms < 0:
+            raise ValueError(f"arg max_wait_ms must not be negative: {max_wait_ms}")
+
+        # load the model once to validate it, and to determine the served methods
+        model = joblib.load(model_path)
+        if not isinstance(model, EstimatorDF):
+            raise TypeError(
+                f"expected the pickled model to be an EstimatorDF but got a "
+                f"{type(model).__name__}"
+            )
+
+        self.model_path = model_path
+        self.n_workers = n_workers
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+
+        self._methods: List[str] = [
+            method for method in _SERVED_METHODS if hasattr(model, method)
+        ]
+        self._latency = _Histogram(ModelServer.LATENCY_BUCKETS_MS)
+        self._batch_size = _Histogram(ModelServer.BATCH_SIZE_BUCKETS)
+        self._n_errors = 0
+        self._n_errors_lock = threading.Lock()
+
+        self._pool: Optional[multiprocessing.pool.Pool] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._batchers: Dict[str, _MicroBatcher] = {}
+
+    @property
+    def methods(self) -> List[str]:
+        """
+        The names of the estimator methods served by this server.
+        """
+        return list(self._methods)
+
+    @property
+    def is_running(self) -> bool:
+        """
+        ``True`` if this server has been started and not yet been stopped.
+        """
+        return self._pool is not None
+
+    def start(self) -> None:
+        """
+        Start the worker processes and the batching of requests.
+
+        :raises RuntimeError: if the server is already running
+        """
+        if self.is_running:
+            raise RuntimeError("server is already running")
+
+        # create the worker processes before starting any threads
+        self._pool = multiprocessing.Pool(
+            self.n_workers, initializer=_init_worker, initargs=(self.model_path,)
+        )
+
+        # one thread per worker process, to have all workers busy in parallel
+        self._executor = ThreadPoolExecutor(max_workers=self.n_workers)
+
+        loop = self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+        self._loop_thread.start()
+
+        self._batchers = {
+            method: _MicroBatcher(
+                get_function=partial(self._get_batch_function, method),
+                loop=loop,
+                executor=self._executor,
+                max_wait=self.max_wait_ms / 1000.0,
+                max_batch_size=self.max_batch,
+            )
+            for method in self._methods
+        }
+
+    def stop(self) -> None:
+        """
+        Stop the batching of requests, and terminate the worker processes.
+        """
+        if not self.is_running:
+            return
+
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+        self._executor.shutdown()
+        self._pool.close()
+        self._pool.join()
+
+        self._pool = self._executor = self._loop = self._loop_thread = None
+        self._batchers = {}
+
+    def __enter__(self: T_Self) -> T_Self:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.stop()
+
+    # noinspection PyPep8Naming
+    def process(
+        self, method: str, X: pd.DataFrame
+    ) -> Union[pd.Series, pd.DataFrame, List[pd.DataFrame]]:
+        """
+        Process the given observations with the given estimator method, as part of
+        the next batch.
+
+        This method is thread-safe, and blocks until the result is available.
+
+        :param method: the name of the estimator method to call, e.g. ``"predict"``
+        :param X: input data frame with observations as rows and features as columns
+        :return: the result of the estimator method for the given observations,
+            indexed with the index of the given observations
+        :raises RuntimeError: if the server is not running
+        """
+        if not self.is_running:
+            raise RuntimeError("server is not running")
+        if method not in self._batchers:
+            raise ValueError(f"method {method!r} is not served by this server")
+        if not isinstance(X, pd.DataFrame):
+            raise TypeError("arg X must be a DataFrame")
+
+        start = time.perf_counter()
+        try:
+            return asyncio.run_coroutine_threadsafe(
+                self._batchers[method].submit(X), self._loop
+            ).result()
+        except Exception:
+            with self._n_errors_lock:
+                self._n_errors += 1
+            raise
+        finally:
+            self._latency.add((time.perf_counter() - start) * 1000.0)
+
+    def handle(
+        self,
+        verb: str,
+        path: str,
+        body: bytes = b"",
+        content_type: str = _CONTENT_TYPE_JSON,
+    ) -> Tuple[int, str, bytes]:
+        """
+        Handle a request, independently of the transport.
+
+        :param verb: the HTTP verb of the request, ``"GET"`` or ``"POST"``
+        :param path: the path of the request, e.g. ``"/predict"``
+        :param body: the body of the request
+        :param content_type: the content type of the request body
+        :return: a tuple of the HTTP status code, the content type, and the body of
+            the response
+        """
+        path = path.split("?", 1)[0].rstrip("/")
+
+        if verb == "GET":
+            if path == "/health":
+                return _json_response(200, {"status": "ok"})
+            elif path == "/stats":
+                return _json_response(200, self.statistics())
+        elif verb == "POST" and path.lstrip("/") in self._methods:
+            content_type = content_type.split(";", 1)[0].strip()
+            try:
+                X = _decode_frame(body, content_type)
+            except Exception as e:
+                return _json_response(400, {"error": str(e)})
+
+            try:
+                result = self.process(path.lstrip("/"), X)
+            except Exception as e:
+                log.exception(f"error processing request {path}")
+                return _json_response(500, {"error": str(e)})
+
+            try:
+                return 200, content_type, _encode_result(result, content_type)
+            except Exception as e:
+                return _json_response(500, {"error": str(e)})
+
+        return _json_response(404, {"error": f"unknown request: {verb} {path}"})
+
+    def statistics(self) -> Dict[str, Any]:
+        """
+        Get the latency and batch size statistics of this server.
+
+        :return: a JSON-serializable dictionary with the statistics
+        """
+        return {
+            "requests": self._latency.count,
+            "errors": self._n_errors,
+            "latency_ms": self._latency.to_dict(),
+            "batch_size": self._batch_size.to_dict(),
+        }
+
+    def serve_http(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        """
+        Serve requests over HTTP on the given TCP port, until interrupted.
+
+        Starts the server if it is not running yet, and stops it when done.
+
+        :param host: the host name or IP address to bind to
+        :param port: the TCP port to listen on
+        """
+        self._serve(_ThreadingHTTPServer((host, port), _RequestHandler))
+
+    def serve_unix(self, path: str) -> None:
+        """
+        Serve requests over HTTP on the given Unix domain socket, until interrupted.
+
+        Starts the server if it is not running yet, and stops it when done.
+
+        :param path: the path of the Unix domain socket; a stale socket at this path
+            is replaced
+        """
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+        try:
+            self._serve(_ThreadingUnixHTTPServer(path, _RequestHandler))
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def _serve(self, http_server: BaseServer) -> None:
+        http_server.model_server = self
+        started = not self.is_running
+        if started:
+            self.start()
+        try:
+            log.info(f"serving {self.model_path} at {http_server.server_address}")
+            http_server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            http_server.server_close()
+            if started:
+                self.stop()
+
+    def _get_batch_function(self, method: str) -> Callable[[pd.DataFrame], Any]:
+        return partial(self._process_batch, method)
+
+    # noinspection PyPep8Naming
+    def _process_batch(self, method: str, X: pd.DataFrame) -> Any:
+        # called from the executor: process a batch in one of the worker processes
+        self._batch_size.add(len(X))
+        return self._pool.apply(_worker_call, (method, X))
+
+
+class _Histogram:
+    # a thread-safe histogram with fixed bucket bounds
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = np.asarray(bounds)
+        self.counts = np.zeros(len(bounds) + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, value: float) -> None:
+        with self._lock:
+            self.counts[np.searchsorted(self.bounds, value)] += 1
+            self.count += 1
+            self.total += value
+            self.max = max(self.max, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "mean": self.total / self.count if self.count else None,
+                "max": self.max if self.count else None,
+                "histogram": {
+                    **{
+                        f"<={bound:g}": int(count)
+                        for bound, count in zip(self.bounds, self.counts)
+                    },
+                    f">{self.bounds[-1]:g}": int(self.counts[-1]),
+                },
+            }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    # forwards HTTP requests to the model server
+
+    # noinspection PyPep8Naming
+    def do_GET(self) -> None:
+        self._respond(*self.server.model_server.handle("GET", self.path))
+
+    # noinspection PyPep8Naming
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._respond(
+            *self.server.model_server.handle(
+                "POST",
+                self.path,
+                body,
+                self.headers.get("Content-Type", _CONTENT_TYPE_JSON),
+            )
+        )
+
+    def _respond(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # clients of Unix domain sockets have no address
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        log.debug(f"{self.address_string()} - {format % args}")
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+#
+# Worker processes
+#
+
+_worker_model: Optional[EstimatorDF] = None
+
+
+def _init_worker(model_path: str) -> None:
+    global _worker_model
+    _worker_model = joblib.load(model_path)
+
+
+# noinspection PyPep8Naming
+def _worker_call(method: str, X: pd.DataFrame) -> Any:
+    return getattr(_worker_model, method)(X)
+
+
+#
+# Serialization
+#
+
+
+def _decode_frame(body: bytes, content_type: str) -> pd.DataFrame:
+    if content_type == _CONTENT_TYPE_ARROW:
+        return _import_pyarrow().ipc.open_stream(body).read_pandas()
+    elif content_type == _CONTENT_TYPE_JSON:
+        payload = json.loads(body)
+        if isinstance(payload, dict) and "columns" in payload and "data" in payload:
+            return pd.DataFrame(
+                data=payload["data"],
+                columns=payload["columns"],
+                index=payload.get("index"),
+            )
+        elif isinstance(payload, list):
+            return pd.DataFrame.from_records(payload)
+        else:
+            raise ValueError(
+                "expected a data frame in split orientation, or a list of records"
+            )
+    else:
+        raise ValueError(f"unsupported content type: {content_type}")
+
+
+def _encode_result(
+    result: Union[pd.Series, pd.DataFrame, List[pd.DataFrame]], content_type: str
+) -> bytes:
+    if content_type == _CONTENT_TYPE_ARROW:
+        if isinstance(result, list):
+            raise ValueError("multi-output results can only be returned as JSON")
+        if isinstance(result, pd.Series):
+            result = result.to_frame()
+
+        pa = _import_pyarrow()
+        table = pa.Table.from_pandas(result.rename(columns=str))
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    elif isinstance(result, list):
+        return (
+            "[" + ",".join(output.to_json(orient="split") for output in result) + "]"
+        ).encode()
+    else:
+        return result.to_json(orient="split").encode()
+
+
+def _json_response(status: int, payload: Any) -> Tuple[int, str, bytes]:
+    return status, _CONTENT_TYPE_JSON, json.dumps(payload).encode()
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as e:
+        raise ValueError("Arrow requests require package pyarrow") from e
+    return pyarrow
+
+
+__tracker.validate()
@@ -83,6 +83,7 @@ from .wrapper import (
     MissingIndicatorWrapperDF,
     NComponentsDimensionalityReductionWrapperDF,
     OneHotEncoderWrapperDF,
+    OrdinalEncoderWrapperDF,
     PolynomialFeaturesWrapperDF,
 )
 
@@ -311,7 +312,7 @@ OneHotEncoderDF = make_df_transformer(
 )
 
 OrdinalEncoderDF = make_df_transformer(
-    OrdinalEncoder, base_wrapper=ColumnPreservingTransformerWrapperDF
+    OrdinalEncoder, base_wrapper=OrdinalEncoderWrapperDF
 )
 
 KBinsDiscretizerDF = make_df_transformer(
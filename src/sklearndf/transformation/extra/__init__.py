@@ -1,4 +1,7 @@
 """
 Additional 3rd party transformers that implement the Scikit-Learn interface.
 """
+from ._boruta import *
 from ._extra import *
+from ._rfe import *
+from ._sketch import *
@@ -0,0 +1,587 @@
+"""
+Additional implementation of :mod:`sklearndf.transformation.extra`, providing a
+data frame native implementation of the Boruta feature selection algorithm
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple, TypeVar, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.stats
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import BaseEstimator, clone
+from sklearn.utils import check_random_state
+
+from pytools.api import AllTracker, inheritdoc
+
+from ... import EstimatorDF, TransformerDF
+
+log = logging.getLogger(__name__)
+
+__all__ = ["ParallelBorutaDF"]
+
+
+#
+# type variables
+#
+
+T_Self = TypeVar("T_Self")
+
+
+#
+# constants
+#
+
+# minimum number of shadow features per round, as in BorutaPy
+_MIN_SHADOW_FEATURES = 5
+
+# feature decisions
+_TENTATIVE = 0
+_CONFIRMED = 1
+_REJECTED = -1
+
+# parameters that do not affect the rounds of a run, and may change when resuming
+# a run from a checkpoint
+_RESUMABLE_PARAMS = {"max_iter", "n_iter_no_change", "n_jobs", "checkpoint"}
+
+
+#
+# Ensure all symbols introduced below are included in __all__
+#
+
+__tracker = AllTracker(globals())
+
+
+#
+# Class definitions
+#
+
+
+@inheritdoc(match="[see superclass]")
+class ParallelBorutaDF(TransformerDF, BaseEstimator):
+    """
+    Select features using the Boruta all-relevant feature selection algorithm,
+    implementing the same algorithm as :class:`.BorutaDF` with support for parallel
+    rounds, resumable runs, and early stopping.
+
+    In each round, the estimator is fitted to the features that have not been
+    rejected yet, along with shadow features obtained by shuffling the values of
+    each feature.
+    A feature scores a hit if its importance exceeds the given percentile of the
+    importances of the shadow features.
+    Features are confirmed or rejected once a binomial test on their hits is
+    significant.
+    Fitting stops once all features are decided, after ``max_iter`` rounds, or
+    after ``n_iter_no_change`` rounds without any new decisions, counting only rounds
+    in which the tests could confirm or reject a feature at all.
+
+    The shadow features are generated in place, in a buffer that is allocated once
+    and reused for all rounds fitted in the same process.
+    With ``n_jobs`` other than 1, batches of rounds are fitted in parallel worker
+    processes; all rounds of a batch use the features not rejected before the
+    batch started, so results may differ from serial runs.
+
+    If a checkpoint file is given, the state of the run is saved to the file after
+    each batch of rounds; fitting with the same checkpoint file, inputs, outputs and
+    parameters resumes the run from the saved state.
+    Only ``max_iter``, ``n_iter_no_change``, and ``n_jobs`` may change when resuming
+    a run.
+
+    Fitted attributes follow :class:`~boruta.BorutaPy`: ``support_``,
+    ``support_weak_``, ``ranking_``, ``n_features_``, and ``importance_history_``.
+    """
+
+    def __init__(
+        self,
+        estimator: BaseEstimator,
+        *,
+        n_estimators: Union[int, str] = 1000,
+        perc: int = 100,
+        alpha: float = 0.05,
+        two_step: bool = True,
+        max_iter: int = 100,
+        n_iter_no_change: Optional[int] = None,
+        n_jobs: Optional[int] = None,
+        checkpoint: Optional[str] = None,
+        random_state: Optional[Union[int, np.random.RandomState]] = None,
+    ) -> None:
+        """
+        :param estimator: a tree-based estimator with attribute
+            ``feature_importances_``; either a native scikit-learn estimator or an
+            :class:`.EstimatorDF`
+        :param n_estimators: the number of estimators to use in the estimator, or
+            ``"auto"`` to determine it from the number of features in each round
+            (default: 1000)
+        :param perc: the percentile of the shadow feature importances a feature
+            must exceed to score a hit (default: 100, i.e., the maximum)
+        :param alpha: the significance level of the tests confirming or rejecting
+            features (default: 0.05)
+        :param two_step: if ``True``, correct for multiple testing using the
+            Benjamini-Hochberg procedure followed by a Bonferroni correction for
+            repeated rounds; if ``False``, use a Bonferroni correction only
+            (default: ``True``)
+        :param max_iter: the maximum number of rounds (default: 100)
+        :param n_iter_no_change: if not ``None``, stop after this number of
+            consecutive rounds without any features being confirmed or rejected;
+            rounds are counted only once the number of rounds is large enough for
+            the tests to be significant, e.g., from round 8 with the default
+            ``alpha`` and ``two_step`` (default: ``None``)
+        :param n_jobs: the number of rounds to fit in parallel worker processes;
+            ``None`` or 1 to fit rounds one after the other (default: ``None``)
+        :param checkpoint: the path of a file to save the state of the run to after
+            each batch of rounds, and to resume the run from (default: ``None``)
+        :param random_state: the random state used to shuffle the shadow features and
+            to seed the estimator in each round
+        """
+        super().__init__()
+        if not (n_estimators == "auto" or isinstance(n_estimators, int)):
+            raise ValueError(
+                f'arg n_estimators must be an int or "auto": {n_estimators}'
+            )
+        if not 0 < perc <= 100:
+            raise ValueError(f"arg perc must be in the range (0, 100]: {perc}")
+        if not 0.0 < alpha < 1.0:
+            raise ValueError(f"arg alpha must be in the range (0, 1): {alpha}")
+        if max_iter < 1:
+            raise ValueError(f"arg max_iter must be positive: {max_iter}")
+        if n_iter_no_change is not None and n_iter_no_change < 1:
+            raise ValueError(
+                f"arg n_iter_no_change must be positive: {n_iter_no_change}"
+            )
+        self.estimator = estimator
+        self.n_estimators = n_estimators
+        self.perc = perc
+        self.alpha = alpha
+        self.two_step = two_step
+        self.max_iter = max_iter
+        self.n_iter_no_change = n_iter_no_change
+        self.n_jobs = n_jobs
+        self.checkpoint = checkpoint
+        self.random_state = random_state
+        self.support_ = None
+        self.support_weak_ = None
+        self.ranking_ = None
+        self.n_features_ = None
+        self.importance_history_ = None
+        self._features_in = None
+
+    # noinspection PyPep8Naming
+    def fit(
+        self: T_Self,
+        X: pd.DataFrame,
+        y: Union[pd.Series, pd.DataFrame] = None,
+        **fit_params: Any,
+    ) -> T_Self:
+        """
+        Fit the Boruta feature selection to the given inputs and outputs.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param y: a series or data frame with one or more outputs
+        :param fit_params: additional keyword parameters to be passed to the fit
+            method of the estimator in each round
+        :return: ``self``
+        """
+
+        self: ParallelBorutaDF  # support type hinting in PyCharm
+
+        if not isinstance(X, pd.DataFrame):
+            raise TypeError("arg X must be a DataFrame")
+        if y is None:
+            raise ValueError("arg y is required to select features")
+
+        self._reset_fit()
+
+        estimator = self.estimator
+        if isinstance(estimator, EstimatorDF):
+            estimator = estimator.native_estimator
+        estimator = clone(estimator)
+        if self.n_estimators != "auto":
+            estimator.set_params(n_estimators=self.n_estimators)
+
+        x: np.ndarray = X.to_numpy(dtype=np.float64)
+        y_values = y.values
+
+        # computed once per fit, since hashing the inputs is costly for large data
+        fingerprint = None if self.checkpoint is None else self._fingerprint(X, y)
+
+        state = self._load_checkpoint(fingerprint) or _BorutaState(
+            n_features=x.shape[1], random_state=check_random_state(self.random_state)
+        )
+
+        batch_size = 1 if self.n_jobs is None else max(1, effective_n_jobs(self.n_jobs))
+
+        # buffer for the active features and their shadows, reused across rounds
+        buffer: Optional[np.ndarray] = None
+
+        while not state.is_done(self.max_iter, self.n_iter_no_change):
+            active = np.flatnonzero(state.decisions != _REJECTED)
+            x_active = x[:, active]
+
+            if self.n_estimators == "auto":
+                estimator.set_params(
+                    n_estimators=_get_n_estimators(estimator, len(active))
+                )
+
+            n_rounds = min(batch_size, self.max_iter - state.iteration + 1)
+            seeds = state.random_state.randint(np.iinfo(np.int32).max, size=n_rounds)
+
+            if n_rounds == 1:
+                if buffer is None or buffer.shape[1] != _n_buffer_columns(len(active)):
+                    buffer = _make_buffer(x_active)
+                results = [
+                    _fit_round(
+                        estimator, x_active, y_values, fit_params, seeds[0], buffer
+                    )
+                ]
+            else:
+                results = Parallel(n_jobs=self.n_jobs)(
+                    delayed(_fit_round)(
+                        estimator, x_active, y_values, fit_params, seed, None
+                    )
+                    for seed in seeds
+                )
+
+            for importance, importance_shadow in results:
+                importance_all = np.full(x.shape[1], np.nan)
+                importance_all[active] = importance
+                state.add_round(
+                    importance_all,
+                    np.percentile(importance_shadow, self.perc),
+                    alpha=self.alpha,
+                    two_step=self.two_step,
+                )
+
+            log.debug(
+                f"Boruta round {state.iteration - 1}: "
+                f"{np.sum(state.decisions == _CONFIRMED)} confirmed, "
+                f"{np.sum(state.decisions == _TENTATIVE)} tentative, "
+                f"{np.sum(state.decisions == _REJECTED)} rejected"
+            )
+
+            self._save_checkpoint(fingerprint, state)
+
+        self._set_results(state)
+        self._features_in = X.columns.rename(self.COL_FEATURE_IN)
+        return self
+
+    # noinspection PyPep8Naming
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Select the confirmed features from the given inputs.
+
+        :param X: input data frame with observations as rows and features as columns
+        :return: the selected features
+        """
+        self._ensure_fitted()
+        return X.loc[:, self.feature_names_out_]
+
+    # noinspection PyPep8Naming
+    def inverse_transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        The inverse transform of feature selection is not implemented.
+
+        :param X: input data frame with observations as rows and features as columns
+        :return: `n/a` (never returns)
+        :raises NotImplementedError:
+        """
+        raise NotImplementedError("inverse transform is not implemented")
+
+    @property
+    def is_fitted(self) -> bool:
+        """[see superclass]"""
+        return self.support_ is not None
+
+    def _reset_fit(self) -> None:
+        self.support_ = None
+        self.support_weak_ = None
+        self.ranking_ = None
+        self.n_features_ = None
+        self.importance_history_ = None
+        self._features_in = None
+        self._features_original = None
+
+    def _set_results(self, state: "_BorutaState") -> None:
+        # determine the selected features and their ranking, as in BorutaPy
+        decisions = state.decisions
+        importance_history = np.array(state.importance_history).reshape(
+            -1, len(decisions)
+        )
+        confirmed = np.flatnonzero(decisions == _CONFIRMED)
+        tentative = np.flatnonzero(decisions == _TENTATIVE)
+
+        # keep tentative features whose median importance exceeds the median
+        # importance threshold of the shadow features
+        if len(tentative) > 0 and len(importance_history) > 0:
+            tentative = tentative[
+                np.median(importance_history[:, tentative], axis=0)
+                > np.median(state.shadow_max_history)
+            ]
+
+        n_features = len(decisions)
+        support = np.zeros(n_features, dtype=bool)
+        support[confirmed] = True
+        support_weak = np.zeros(n_features, dtype=bool)
+        support_weak[tentative] = True
+
+        # rank rejected features by their median rank of importance across rounds
+        ranking = np.ones(n_features, dtype=int)
+        ranking[tentative] = 2
+        not_selected = np.setdiff1d(
+            np.arange(n_features), np.concatenate([confirmed, tentative])
+        )
+        if len(not_selected) > 0 and len(importance_history) > 0:
+            iteration_ranks = _nan_rankdata(
+                -importance_history[:, not_selected], axis=1
+            )
+            ranks = _nan_rankdata(np.nanmedian(iteration_ranks, axis=0), axis=0)
+            ranking[not_selected] = (
+                ranks - np.nanmin(ranks) + (3 if len(tentative) > 0 else 2)
+            )
+
+        self.support_ = support
+        self.support_weak_ = support_weak
+        self.ranking_ = ranking
+        self.n_features_ = len(confirmed)
+        self.importance_history_ = importance_history
+
+    def _load_checkpoint(self, fingerprint: Optional[str]) -> Optional["_BorutaState"]:
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return None
+
+        checkpoint: Dict[str, Any] = joblib.load(self.checkpoint)
+        if checkpoint["fingerprint"] != fingerprint:
+            raise ValueError(
+                f"checkpoint {self.checkpoint} was saved for different inputs, "
+                "outputs, or parameters"
+            )
+
+        state: _BorutaState = checkpoint["state"]
+        log.info(f"resuming Boruta run at round {state.iteration}")
+        return state
+
+    def _save_checkpoint(
+        self, fingerprint: Optional[str], state: "_BorutaState"
+    ) -> None:
+        if self.checkpoint is None:
+            return
+
+        # write to a temporary file first, so that an interrupted write never
+        # corrupts an existing checkpoint
+        path_tmp = f"{self.checkpoint}.tmp"
+        joblib.dump(dict(fingerprint=fingerprint, state=state), path_tmp)
+        os.replace(path_tmp, self.checkpoint)
+
+    # noinspection PyPep8Naming
+    def _fingerprint(self, X: pd.DataFrame, y: Union[pd.Series, pd.DataFrame]) -> str:
+        # a hash of the inputs, outputs and parameters determining the rounds of a
+        # run, identifying the runs a checkpoint can be resumed by
+        params = {
+            name: value
+            for name, value in self.get_params(deep=False).items()
+            if name not in _RESUMABLE_PARAMS
+        }
+        return joblib.hash((X, y, params))
+
+    def _get_features_original(self) -> pd.Series:
+        features_out = self._features_in[self.support_]
+        return pd.Series(features_out, index=features_out)
+
+    def _get_features_in(self) -> pd.Index:
+        return self._features_in
+
+    def _get_n_outputs(self) -> int:
+        return 0
+
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        return self._get_features_in_required_by_lineage(features_out)
+
+    def _prune_features_in(
+        self, features_in: pd.Index
+    ) -> Union[TransformerDF, str, None]:
+        # once restricted to selected columns, feature selection has no effect
+        return "passthrough"
+
+    def _get_linear_map(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        matrix = np.eye(len(self._features_in))[:, self.support_]
+        return matrix, np.zeros(matrix.shape[1])
+
+
+class _BorutaState:
+    # the state of a Boruta run: the decision and number of hits per feature, and
+    # the importances of all rounds so far
+
+    def __init__(self, n_features: int, random_state: np.random.RandomState) -> None:
+        self.iteration = 1
+        self.n_iter_no_change = 0
+        self.decisions = np.full(n_features, _TENTATIVE)
+        self.hits = np.zeros(n_features, dtype=int)
+        self.importance_history: List[np.ndarray] = []
+        self.shadow_max_history: List[float] = []
+        self.random_state = random_state
+
+    def is_done(self, max_iter: int, n_iter_no_change: Optional[int]) -> bool:
+        return (
+            not np.any(self.decisions == _TENTATIVE)
+            or self.iteration > max_iter
+            or (
+                n_iter_no_change is not None
+                and self.n_iter_no_change >= n_iter_no_change
+            )
+        )
+
+    def add_round(
+        self, importance: np.ndarray, shadow_max: float, alpha: float, two_step: bool
+    ) -> None:
+        # features rejected in an earlier round of the same batch score no hits
+        importance = np.where(self.decisions == _REJECTED, np.nan, importance)
+
+        self.importance_history.append(importance)
+        self.shadow_max_history.append(shadow_max)
+        with np.errstate(invalid="ignore"):
+            self.hits[importance > shadow_max] += 1
+
+        decisions = _test_hits(
+            self.decisions, self.hits, self.iteration, alpha=alpha, two_step=two_step
+        )
+        if not np.array_equal(decisions, self.decisions):
+            self.n_iter_no_change = 0
+        elif _is_decidable(
+            self.iteration, len(decisions), alpha=alpha, two_step=two_step
+        ):
+            # only count rounds in which features could have been decided
+            self.n_iter_no_change += 1
+
+        self.decisions = decisions
+        self.iteration += 1
+
+
+#
+# private helper functions
+#
+
+
+def _n_buffer_columns(n_active: int) -> int:
+    # the number of columns for the active features and their shadows
+    return n_active + max(n_active, _MIN_SHADOW_FEATURES)
+
+
+def _make_buffer(x_active: np.ndarray) -> np.ndarray:
+    # a column-major buffer holding the active features, followed by uninitialised
+    # columns for their shadows
+    n_active = x_active.shape[1]
+    buffer = np.empty(
+        (x_active.shape[0], _n_buffer_columns(n_active)), dtype=np.float64, order="F"
+    )
+    buffer[:, :n_active] = x_active
+    return buffer
+
+
+def _fit_round(
+    estimator: BaseEstimator,
+    x_active: np.ndarray,
+    y: np.ndarray,
+    fit_params: Dict[str, Any],
+    seed: int,
+    buffer: Optional[np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray]:
+    # fit the estimator to the active features and a new set of shadow features,
+    # and return the importances of the active and of the shadow features
+
+    if buffer is None:
+        buffer = _make_buffer(x_active)
+
+    n_active = x_active.shape[1]
+    random_state = np.random.RandomState(seed)
+
+    # shuffle each active feature into its shadow columns, in place
+    for i in range(n_active, buffer.shape[1]):
+        np.take(
+            x_active[:, (i - n_active) % n_active],
+            random_state.permutation(len(buffer)),
+            out=buffer[:, i],
+        )
+
+    estimator = clone(estimator)
+    if "random_state" in estimator.get_params():
+        estimator.set_params(random_state=seed)
+    estimator.fit(buffer, y, **fit_params)
+
+    importance = estimator.feature_importances_
+    return importance[:n_active], importance[n_active:]
+
+
+def _get_n_estimators(estimator: BaseEstimator, n_features: int) -> int:
+    # the number of trees for the given number of active features, as in BorutaPy
+    depth = estimator.get_params().get("max_depth") or 10
+    n_features_total = n_features * 2
+    return int(n_features_total / (np.sqrt(n_features_total) * depth) * 100)
+
+
+def _test_hits(
+    decisions: np.ndarray,
+    hits: np.ndarray,
+    iteration: int,
+    alpha: float,
+    two_step: bool,
+) -> np.ndarray:
+    # confirm or reject tentative features based on binomial tests of their hits,
+    # as in BorutaPy
+    decisions = decisions.copy()
+    active = np.flatnonzero(decisions != _REJECTED)
+    hits_active = hits[active]
+
+    p_accept = scipy.stats.binom.sf(hits_active - 1, iteration, 0.5)
+    p_reject = scipy.stats.binom.cdf(hits_active, iteration, 0.5)
+
+    if two_step:
+        to_accept = _fdr_correction(p_accept, alpha) & (p_accept <= alpha / iteration)
+        to_reject = _fdr_correction(p_reject, alpha) & (p_reject <= alpha / iteration)
+    else:
+        to_accept = p_accept <= alpha / len(decisions)
+        to_reject = p_reject <= alpha / len(decisions)
+
+    is_tentative = decisions[active] == _TENTATIVE
+    decisions[active[is_tentative & to_accept]] = _CONFIRMED
+    decisions[active[is_tentative & to_reject]] = _REJECTED
+    return decisions
+
+
+def _is_decidable(
+    iteration: int, n_features: int, alpha: float, two_step: bool
+) -> bool:
+    # True if the tests in _test_hits can confirm or reject a feature after the
+    # given number of rounds, i.e., if the smallest possible p-value of a feature
+    # scoring a hit in all rounds or in none meets the corrected significance level
+    p_min = np.power(0.5, iteration)
+    return p_min <= (alpha / iteration if two_step else alpha / n_features)
+
+
+def _fdr_correction(p_values: np.ndarray, alpha: float) -> np.ndarray:
+    # the Benjamini-Hochberg procedure: True for each rejected null hypothesis
+    n = len(p_values)
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+    order = np.argsort(p_values)
+    below = p_values[order] <= alpha * np.arange(1, n + 1) / n
+    n_rejected = np.flatnonzero(below)[-1] + 1 if below.any() else 0
+    rejected = np.zeros(n, dtype=bool)
+    rejected[order[:n_rejected]] = True
+    return rejected
+
+
+def _nan_rankdata(x: np.ndarray, axis: int) -> np.ndarray:
+    # rank the given data along the given axis, keeping missing values
+
+    def _rank_1d(values: np.ndarray) -> np.ndarray:
+        ranks = np.full(len(values), np.nan)
+        valid = ~np.isnan(values)
+        ranks[valid] = scipy.stats.rankdata(values[valid])
+        return ranks
+
+    return np.apply_along_axis(_rank_1d, axis, np.asarray(x, dtype=np.float64))
+
+
+__tracker.validate()
@@ -3,21 +3,37 @@ Core implementation of :mod:`sklearndf.transformation.extra`
 """
 
 import logging
-from typing import Any, Optional, TypeVar, Union
+from abc import ABCMeta, abstractmethod
+from copy import deepcopy
+from typing import Any, Dict, Optional, Tuple, TypeVar, Union
 
+import numpy as np
 import pandas as pd
+import scipy.stats
 from boruta import BorutaPy
 from sklearn.base import BaseEstimator
+from sklearn.utils import resample
 
 from pytools.api import AllTracker, inheritdoc
 
 from ... import TransformerDF
-from ...wrapper import MetaEstimatorWrapperDF, make_df_transformer
+from ...wrapper import EstimatorWrapperDF, MetaEstimatorWrapperDF, make_df_transformer
 from ..wrapper import ColumnSubsetTransformerWrapperDF, NumpyTransformerWrapperDF
+from ._sketch import QuantileSketch
 
 log = logging.getLogger(__name__)
 
-__all__ = ["OutlierRemoverDF", "BorutaPyWrapperDF", "BorutaDF"]
+__all__ = [
+    "OutlierRemoverDF",
+    "StreamingRobustScalerDF",
+    "StreamingQuantileTransformerDF",
+    "AffineScalerDF",
+    "DtypeOptimizerDF",
+    "DeduplicateDF",
+    "SampledFitDF",
+    "BorutaPyWrapperDF",
+    "BorutaDF",
+]
 
 
 #
@@ -27,6 +43,25 @@ __all__ = ["OutlierRemoverDF", "BorutaPyWrapperDF", "BorutaDF"]
 T_Self = TypeVar("T_Self")
 
 
+#
+# constants
+#
+
+# second key for hashing rows, to obtain 128 bit row hashes together with the
+# default key of pandas
+_HASH_KEY_2 = "sklearndf_dedupe"
+
+# margin for values to be mapped to the bounds of the output distribution of
+# quantile transformers, as in sklearn's QuantileTransformer
+_BOUNDS_THRESHOLD = 1e-7
+
+# integer dtypes to downcast to, narrowest first
+_INTEGER_DTYPES = [
+    np.dtype(dtype)
+    for dtype in (np.uint8, np.int8, np.uint16, np.int16, np.uint32, np.int32)
+]
+
+
 #
 # Ensure all symbols introduced below are included in __all__
 #
@@ -40,27 +75,668 @@ __tracker = AllTracker(globals(), allow_imported_definitions=True)
 
 
 @inheritdoc(match="[see superclass]")
-class OutlierRemoverDF(TransformerDF, BaseEstimator):
+class _SketchTransformerDF(TransformerDF, BaseEstimator, metaclass=ABCMeta):
+    """
+    Base class for transformers fitted using a :class:`.QuantileSketch` per column.
+
+    Fitting requires memory independent of the number of observations.
+    Supports incremental fitting over chunks of a data set using :meth:`.partial_fit`,
+    and combining transformers fitted to separate chunks, e.g., in parallel workers,
+    using :meth:`.merge`.
+    """
+
+    def __init__(self, sketch_size: int) -> None:
+        """
+        :param sketch_size: the size of the quantile sketch for each column
+        """
+        super().__init__()
+        if sketch_size < 2:
+            raise ValueError(f"arg sketch_size must be at least 2: {sketch_size}")
+        self.sketch_size = sketch_size
+        self.sketches_ = None
+        self.n_samples_seen_ = None
+        self._features_original = None
+
+    # noinspection PyPep8Naming
+    def fit(
+        self: T_Self,
+        X: pd.DataFrame,
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        **fit_params: Any,
+    ) -> T_Self:
+        """
+        Fit this transformer to the given observations.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param y: an optional series or data frame with one or more outputs (ignored)
+        :param fit_params: additional fit parameters (ignored)
+        :return: ``self``
+        """
+
+        self: _SketchTransformerDF  # support type hinting in PyCharm
+
+        self.sketches_ = None
+        return self.partial_fit(X, y, **fit_params)
+
+    # noinspection PyPep8Naming
+    def partial_fit(
+        self: T_Self,
+        X: pd.DataFrame,
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        **fit_params: Any,
+    ) -> T_Self:
+        """
+        Update this transformer with an additional chunk of observations.
+
+        If this transformer is not fitted yet, it is fitted to the given chunk.
+
+        :param X: input data frame with observations as rows and features as columns;
+            after the first chunk, must have the same columns as the first chunk
+        :param y: an optional series or data frame with one or more outputs (ignored)
+        :param fit_params: additional fit parameters (ignored)
+        :return: ``self``
+        """
+
+        self: _SketchTransformerDF  # support type hinting in PyCharm
+
+        if self.sketches_ is None:
+            self.sketches_ = pd.Series(
+                [
+                    QuantileSketch(k=self.sketch_size, seed=seed)
+                    for seed in range(len(X.columns))
+                ],
+                index=X.columns,
+                dtype=object,
+            )
+            self.n_samples_seen_ = 0
+            self._features_original = X.columns.to_series()
+        else:
+            # noinspection PyProtectedMember
+            EstimatorWrapperDF._verify_df(
+                df_name="X argument", df=X, expected_columns=self.feature_names_in_
+            )
+            X = X.loc[:, self.feature_names_in_]
+
+        for sketch, (_, values) in zip(self.sketches_, X.items()):
+            sketch.update(values.values)
+
+        self.n_samples_seen_ += len(X)
+        self._update_fitted()
+        return self
+
+    def merge(self: T_Self, other: "_SketchTransformerDF") -> T_Self:
+        """
+        Merge the observations seen by another fitted transformer of the same type
+        into this transformer.
+
+        :param other: a fitted transformer with the same input features and sketch
+            size as this transformer
+        :return: ``self``
+        :raises TypeError: if the other transformer is of a different type
+        :raises ValueError: if the other transformer has different input features
+            or a different sketch size
+        """
+
+        self: _SketchTransformerDF  # support type hinting in PyCharm
+
+        if type(other) is not type(self):
+            raise TypeError(
+                f"arg other must be a {type(self).__name__} but is a "
+                f"{type(other).__name__}"
+            )
+
+        self._ensure_fitted()
+        other._ensure_fitted()
+
+        if not other.sketches_.index.equals(self.sketches_.index):
+            raise ValueError(
+                "arg other must have the same input features as this transformer"
+            )
+
+        for sketch, other_sketch in zip(self.sketches_, other.sketches_):
+            sketch.merge(other_sketch)
+
+        self.n_samples_seen_ += other.n_samples_seen_
+        self._update_fitted()
+        return self
+
+    @property
+    def is_fitted(self) -> bool:
+        """[see superclass]"""
+        return self.sketches_ is not None
+
+    @abstractmethod
+    def _update_fitted(self) -> None:
+        # update the fitted attributes of this transformer from the sketches
+        pass
+
+    def _prune_sketches(
+        self, pruned: "_SketchTransformerDF", features_in: pd.Index
+    ) -> None:
+        # copy the sketches for the given input features to a pruned copy of this
+        # transformer; sketches are mutable, so the pruned copy gets its own
+        pruned.sketches_ = pd.Series(
+            [deepcopy(sketch) for sketch in self.sketches_.loc[features_in]],
+            index=features_in,
+            dtype=object,
+        )
+        pruned.n_samples_seen_ = self.n_samples_seen_
+        pruned._features_original = self._features_original.loc[features_in]
+
+    def _get_features_original(self) -> pd.Series:
+        return self._features_original
+
+    def _get_features_in(self) -> pd.Index:
+        return self.feature_names_original_.index
+
+    def _get_n_outputs(self) -> int:
+        return 0
+
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        return self._get_features_in_required_by_lineage(features_out)
+
+
+@inheritdoc(match="[see superclass]")
+class OutlierRemoverDF(_SketchTransformerDF):
     """
     Remove outliers according to Tukey's method.
 
     A sample is considered an outlier if it is outside the range
     :math:`[Q_1 - iqr\\_ multiple(Q_3-Q_1), Q_3 + iqr\\_ multiple(Q_3-Q_1)]`
     where :math:`Q_1` and :math:`Q_3` are the lower and upper quartiles.
+
+    The quartiles are estimated using a :class:`.QuantileSketch` per column, in
+    memory independent of the number of observations; they are exact for up to
+    ``sketch_size`` observations.
+    The transformer can be fitted incrementally over chunks of a data set using
+    :meth:`.partial_fit`, and transformers fitted to separate chunks, e.g., in
+    parallel workers, can be combined using :meth:`.merge`.
+
+    In ``"nan"`` mode, outliers are replaced by ``NaN``.
+    In ``"drop"`` mode, observations with one or more outliers are removed
+    altogether by :meth:`.transform_xy` and :meth:`.fit_transform_xy`, along with
+    their outputs and sample weights, so that when used in a pipeline, all
+    subsequent steps are fitted only to the remaining observations;
+    :meth:`.transform` preserves all observations, and replaces outliers by ``NaN``
+    in either mode.
     """
 
-    def __init__(self, iqr_multiple: float = 3.0) -> None:
+    #: Mode replacing outliers by ``NaN``.
+    MODE_NAN = "nan"
+
+    #: Mode removing observations with outliers.
+    MODE_DROP = "drop"
+
+    def __init__(
+        self, iqr_multiple: float = 3.0, mode: str = MODE_NAN, sketch_size: int = 2000
+    ) -> None:
         """
         :param iqr_multiple: the multiple used to define the range of non-outlier
           samples in the above explanation (defaults to 3.0 as per Tukey's definition of
           far outliers)
+        :param mode: ``"nan"`` to replace outliers by ``NaN``, or ``"drop"`` to remove
+          observations with outliers (default: ``"nan"``)
+        :param sketch_size: the size of the quantile sketch for each column; larger
+          sketches estimate the quartiles more accurately (default: 2000)
         """
-        super().__init__()
+        super().__init__(sketch_size=sketch_size)
         if iqr_multiple < 0.0:
             raise ValueError(f"arg iqr_multiple is negative: {iqr_multiple}")
+        if mode not in (OutlierRemoverDF.MODE_NAN, OutlierRemoverDF.MODE_DROP):
+            raise ValueError(
+                f'arg mode must be "{OutlierRemoverDF.MODE_NAN}" or '
+                f'"{OutlierRemoverDF.MODE_DROP}" but is: {mode}'
+            )
         self.iqr_multiple = iqr_multiple
+        self.mode = mode
         self.threshold_low_ = None
         self.threshold_high_ = None
+
+    # noinspection PyPep8Naming
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return ``X`` with outliers are replaced by ``NaN``.
+
+        :param X: input data frame with observations as rows and features as columns
+        :return: the input data, with outliers replaced by ``NaN``
+        """
+        is_outlier = self._is_outlier(X)
+
+        dtypes = X.dtypes.unique()
+        if len(dtypes) == 1 and dtypes[0].kind == "f":
+            # all columns are floats: replace outliers in a single pass over a copy
+            # of the values
+            values = X.to_numpy(copy=True)
+            np.putmask(values, is_outlier, np.nan)
+            return pd.DataFrame(values, index=X.index, columns=X.columns)
+        else:
+            # columns of other dtypes need to be converted to floats if they contain
+            # outliers
+            return X.mask(is_outlier)
+
+    # noinspection PyPep8Naming
+    def transform_xy(
+        self,
+        X: pd.DataFrame,
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        sample_weight: Optional[pd.Series] = None,
+    ) -> Tuple[
+        pd.DataFrame, Optional[Union[pd.Series, pd.DataFrame]], Optional[pd.Series]
+    ]:
+        """
+        In ``"drop"`` mode, remove all observations with one or more outliers from
+        the given inputs, outputs, and sample weights; in ``"nan"`` mode, replace
+        outliers by ``NaN``.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param y: an optional series or data frame with one or more outputs
+        :param sample_weight: optional weights for all observations
+        :return: a tuple of the inputs, outputs, and sample weights of the
+            remaining observations
+        """
+        if self.mode != OutlierRemoverDF.MODE_DROP:
+            return super().transform_xy(X, y, sample_weight)
+
+        self._ensure_fitted()
+
+        sample_weight = _sample_weight_series(sample_weight, X)
+        is_inlier: np.ndarray = ~self._is_outlier(X).any(axis=1)
+
+        if is_inlier.all():
+            return X, y, sample_weight
+        else:
+            return (
+                X.loc[is_inlier],
+                None if y is None else y.loc[is_inlier],
+                None if sample_weight is None else sample_weight.loc[is_inlier],
+            )
+
+    # noinspection PyPep8Naming
+    def fit_transform_xy(
+        self,
+        X: pd.DataFrame,
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        sample_weight: Optional[pd.Series] = None,
+        **fit_params: Any,
+    ) -> Tuple[
+        pd.DataFrame, Optional[Union[pd.Series, pd.DataFrame]], Optional[pd.Series]
+    ]:
+        """[see superclass]"""
+        return self.fit(X, y, **fit_params).transform_xy(X, y, sample_weight)
+
+    # noinspection PyPep8Naming
+    def inverse_transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        The inverse transform of outlier removal is not implemented.
+
+        :param X: input data frame with observations as rows and features as columns
+        :return: `n/a` (never returns)
+        :raises NotImplementedError:
+        """
+        raise NotImplementedError("inverse transform is not implemented")
+
+    def _update_fitted(self) -> None:
+        quartiles = np.array(
+            [sketch.quantile([0.25, 0.75]) for sketch in self.sketches_]
+        ).reshape(-1, 2)
+        q1 = pd.Series(quartiles[:, 0], index=self.sketches_.index)
+        q3 = pd.Series(quartiles[:, 1], index=self.sketches_.index)
+        threshold_iqr: pd.Series = (q3 - q1) * self.iqr_multiple
+        self.threshold_low_ = q1 - threshold_iqr
+        self.threshold_high_ = q3 + threshold_iqr
+
+    # noinspection PyPep8Naming
+    def _is_outlier(self, X: pd.DataFrame) -> np.ndarray:
+        # a boolean matrix flagging the outliers in the given inputs, in a single
+        # vectorized pass; missing values are not outliers
+        values = X.to_numpy()
+        threshold_low = self.threshold_low_.reindex(X.columns).values
+        threshold_high = self.threshold_high_.reindex(X.columns).values
+        with np.errstate(invalid="ignore"):
+            return (values < threshold_low) | (values > threshold_high)
+
+    def _prune_features_in(self, features_in: pd.Index) -> "OutlierRemoverDF":
+        pruned = OutlierRemoverDF(
+            iqr_multiple=self.iqr_multiple, mode=self.mode, sketch_size=self.sketch_size
+        )
+        self._prune_sketches(pruned, features_in)
+        pruned.threshold_low_ = self.threshold_low_.loc[features_in]
+        pruned.threshold_high_ = self.threshold_high_.loc[features_in]
+        return pruned
+
+
+class StreamingRobustScalerDF(_SketchTransformerDF):
+    """
+    Scale features using statistics that are robust to outliers, like
+    :class:`.RobustScalerDF`, estimating the median and quantile range of each
+    column in bounded memory.
+
+    Removes the median and scales each column by its quantile range (the
+    interquartile range by default).
+    Medians and quantile ranges are estimated using a :class:`.QuantileSketch` per
+    column, and are exact for up to ``sketch_size`` observations.
+    Missing values are ignored when fitting, and preserved when transforming.
+
+    The transformer can be fitted incrementally over chunks of a data set using
+    :meth:`.partial_fit`, and transformers fitted to separate chunks, e.g., in
+    parallel workers, can be combined using :meth:`.merge`.
+    """
+
+    def __init__(
+        self,
+        *,
+        with_centering: bool = True,
+        with_scaling: bool = True,
+        quantile_range: Tuple[float, float] = (25.0, 75.0),
+        sketch_size: int = 2000,
+    ) -> None:
+        """
+        :param with_centering: if ``True``, center the data before scaling
+            (default: ``True``)
+        :param with_scaling: if ``True``, scale the data to the quantile range
+            (default: ``True``)
+        :param quantile_range: the lower and upper percentiles of the quantile range
+            (default: ``(25.0, 75.0)``)
+        :param sketch_size: the size of the quantile sketch for each column; larger
+            sketches estimate the quantiles more accurately (default: 2000)
+        """
+        super().__init__(sketch_size=sketch_size)
+        q_min, q_max = quantile_range
+        if not 0.0 <= q_min <= q_max <= 100.0:
+            raise ValueError(f"arg quantile_range is invalid: {quantile_range}")
+        self.with_centering = with_centering
+        self.with_scaling = with_scaling
+        self.quantile_range = quantile_range
+        self.center_ = None
+        self.scale_ = None
+
+    # noinspection PyPep8Naming
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Center and scale the given inputs.
+
+        :param X: input data frame with observations as rows and features as columns
+        :return: the scaled inputs
+        """
+        self._ensure_fitted()
+
+        X = X.reindex(columns=self.feature_names_in_, copy=False)
+        values = _float_values(X)
+        if self.center_ is not None:
+            values -= self.center_.values
+        if self.scale_ is not None:
+            values /= self.scale_.values
+
+        return pd.DataFrame(values, index=X.index, columns=self.feature_names_out_)
+
+    # noinspection PyPep8Naming
+    def inverse_transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Scale the given scaled inputs back to their original representation.
+
+        :param X: data frame with scaled observations as rows
+        :return: the inputs in their original representation
+        """
+        self._ensure_fitted()
+
+        X = X.reindex(columns=self.feature_names_out_, copy=False)
+        values = _float_values(X)
+        if self.scale_ is not None:
+            values *= self.scale_.values
+        if self.center_ is not None:
+            values += self.center_.values
+
+        return pd.DataFrame(values, index=X.index, columns=self.feature_names_in_)
+
+    def _update_fitted(self) -> None:
+        q_min, q_max = self.quantile_range
+        quantiles = np.array(
+            [
+                sketch.quantile([0.5, q_min / 100.0, q_max / 100.0])
+                for sketch in self.sketches_
+            ]
+        ).reshape(-1, 3)
+        features = self.sketches_.index
+
+        self.center_ = (
+            pd.Series(quantiles[:, 0], index=features) if self.with_centering else None
+        )
+
+        if self.with_scaling:
+            scale = quantiles[:, 2] - quantiles[:, 1]
+            # do not scale constant columns
+            scale[scale == 0.0] = 1.0
+            self.scale_ = pd.Series(scale, index=features)
+        else:
+            self.scale_ = None
+
+    def _prune_features_in(self, features_in: pd.Index) -> "StreamingRobustScalerDF":
+        pruned = StreamingRobustScalerDF(
+            with_centering=self.with_centering,
+            with_scaling=self.with_scaling,
+            quantile_range=self.quantile_range,
+            sketch_size=self.sketch_size,
+        )
+        self._prune_sketches(pruned, features_in)
+        pruned.center_ = None if self.center_ is None else self.center_.loc[features_in]
+        pruned.scale_ = None if self.scale_ is None else self.scale_.loc[features_in]
+        return pruned
+
+    def _get_affine_parameters(
+        self,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        n = len(self.sketches_)
+        center = np.zeros(n) if self.center_ is None else self.center_.values
+        scale = np.ones(n) if self.scale_ is None else self.scale_.values
+        return 1.0 / scale, -center / scale, np.full(n, np.nan)
+
+
+class StreamingQuantileTransformerDF(_SketchTransformerDF):
+    """
+    Transform features to follow a uniform or a normal distribution, like
+    :class:`.QuantileTransformerDF`, estimating the quantiles of each column in
+    bounded memory.
+
+    The quantiles of each column are estimated using a :class:`.QuantileSketch`,
+    and are exact for up to ``sketch_size`` observations.
+    Values are mapped to the output distribution by linear interpolation between
+    the quantiles, with the same semantics as
+    :class:`~sklearn.preprocessing.QuantileTransformer`.
+    Missing values are ignored when fitting, and preserved when transforming.
+
+    The transformer can be fitted incrementally over chunks of a data set using
+    :meth:`.partial_fit`, and transformers fitted to separate chunks, e.g., in
+    parallel workers, can be combined using :meth:`.merge`.
+    """
+
+    #: Uniform output distribution.
+    OUTPUT_UNIFORM = "uniform"
+
+    #: Normal output distribution.
+    OUTPUT_NORMAL = "normal"
+
+    def __init__(
+        self,
+        *,
+        n_quantiles: int = 1000,
+        output_distribution: str = OUTPUT_UNIFORM,
+        sketch_size: int = 2000,
+    ) -> None:
+        """
+        :param n_quantiles: the number of quantiles to compute, i.e., the number of
+            landmarks used to discretize the cumulative distribution function; capped
+            at the number of observations (default: 1000)
+        :param output_distribution: ``"uniform"`` or ``"normal"``
+            (default: ``"uniform"``)
+        :param sketch_size: the size of the quantile sketch for each column; larger
+            sketches estimate the quantiles more accurately (default: 2000)
+        """
+        super().__init__(sketch_size=sketch_size)
+        if n_quantiles < 1:
+            raise ValueError(f"arg n_quantiles must be positive: {n_quantiles}")
+        if output_distribution not in (
+            StreamingQuantileTransformerDF.OUTPUT_UNIFORM,
+            StreamingQuantileTransformerDF.OUTPUT_NORMAL,
+        ):
+            raise ValueError(
+                f'arg output_distribution must be "uniform" or "normal" but is: '
+                f"{output_distribution}"
+            )
+        self.n_quantiles = n_quantiles
+        self.output_distribution = output_distribution
+        self.n_quantiles_ = None
+        self.quantiles_ = None
+        self.references_ = None
+
+    # noinspection PyPep8Naming
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Transform the given inputs to follow the output distribution.
+
+        :param X: input data frame with observations as rows and features as columns
+        :return: the transformed inputs
+        """
+        self._ensure_fitted()
+
+        X = X.reindex(columns=self.feature_names_in_, copy=False)
+        values = _float_values(X)
+        for i in range(values.shape[1]):
+            values[:, i] = self._transform_column(
+                values[:, i], self.quantiles_[:, i], inverse=False
+            )
+
+        return pd.DataFrame(values, index=X.index, columns=self.feature_names_out_)
+
+    # noinspection PyPep8Naming
+    def inverse_transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Map the given transformed inputs back to their original representation.
+
+        :param X: data frame with transformed observations as rows
+        :return: the inputs in their original representation
+        """
+        self._ensure_fitted()
+
+        X = X.reindex(columns=self.feature_names_out_, copy=False)
+        values = _float_values(X)
+        for i in range(values.shape[1]):
+            values[:, i] = self._transform_column(
+                values[:, i], self.quantiles_[:, i], inverse=True
+            )
+
+        return pd.DataFrame(values, index=X.index, columns=self.feature_names_in_)
+
+    def _update_fitted(self) -> None:
+        self.n_quantiles_ = max(1, min(self.n_quantiles, self.n_samples_seen_))
+        self.references_ = np.linspace(0.0, 1.0, self.n_quantiles_, endpoint=True)
+        quantiles = np.array(
+            [sketch.quantile(self.references_) for sketch in self.sketches_]
+        ).reshape(-1, self.n_quantiles_)
+        # ensure the quantiles are monotonically increasing
+        self.quantiles_ = np.maximum.accumulate(quantiles.T, axis=0)
+
+    def _transform_column(
+        self, values: np.ndarray, quantiles: np.ndarray, inverse: bool
+    ) -> np.ndarray:
+        # map the values of one column to or from the output distribution, following
+        # the implementation of sklearn's QuantileTransformer
+        is_normal = self.output_distribution == self.OUTPUT_NORMAL
+        references = self.references_
+
+        if not inverse:
+            lower_bound_x, upper_bound_x = quantiles[0], quantiles[-1]
+            lower_bound_y, upper_bound_y = 0.0, 1.0
+        else:
+            lower_bound_x, upper_bound_x = 0.0, 1.0
+            lower_bound_y, upper_bound_y = quantiles[0], quantiles[-1]
+            if is_normal:
+                values = scipy.stats.norm.cdf(values)
+
+        with np.errstate(invalid="ignore"):
+            if is_normal:
+                is_lower_bound = values - _BOUNDS_THRESHOLD < lower_bound_x
+                is_upper_bound = values + _BOUNDS_THRESHOLD > upper_bound_x
+            else:
+                is_lower_bound = values == lower_bound_x
+                is_upper_bound = values == upper_bound_x
+
+        is_finite = ~np.isnan(values)
+        values_finite = values[is_finite]
+        if not inverse:
+            # interpolate in both directions and average, to map repeated quantiles
+            # to the center of their range of references
+            values[is_finite] = 0.5 * (
+                np.interp(values_finite, quantiles, references)
+                - np.interp(-values_finite, -quantiles[::-1], -references[::-1])
+            )
+        else:
+            values[is_finite] = np.interp(values_finite, references, quantiles)
+
+        values[is_upper_bound] = upper_bound_y
+        values[is_lower_bound] = lower_bound_y
+
+        if is_normal and not inverse:
+            with np.errstate(invalid="ignore"):
+                values = np.clip(
+                    scipy.stats.norm.ppf(values),
+                    scipy.stats.norm.ppf(_BOUNDS_THRESHOLD - np.spacing(1)),
+                    scipy.stats.norm.ppf(1.0 - (_BOUNDS_THRESHOLD - np.spacing(1))),
+                )
+
+        return values
+
+    def _prune_features_in(
+        self, features_in: pd.Index
+    ) -> "StreamingQuantileTransformerDF":
+        pruned = StreamingQuantileTransformerDF(
+            n_quantiles=self.n_quantiles,
+            output_distribution=self.output_distribution,
+            sketch_size=self.sketch_size,
+        )
+        self._prune_sketches(pruned, features_in)
+        pruned.n_quantiles_ = self.n_quantiles_
+        pruned.references_ = self.references_
+        pruned.quantiles_ = self.quantiles_[
+            :, self.sketches_.index.get_indexer(features_in)
+        ]
+        return pruned
+
+
+@inheritdoc(match="[see superclass]")
+class AffineScalerDF(TransformerDF, BaseEstimator):
+    """
+    Scale and shift each column by a fixed factor and offset, and optionally replace
+    missing values with a fixed value.
+
+    Transforms each column :math:`x` to :math:`x \\cdot scale + offset`, or to
+    :math:`fill` where :math:`x` is missing.
+    The transformation is computed on a single copy of the input data, in place.
+
+    Scale, offset, and fill values are passed as series indexed by column name, and do
+    not depend on the data used for fitting: fitting this transformer only determines
+    the names and order of the columns to be transformed.
+
+    Instances of this transformer are created by
+    :meth:`.PipelineDF.fuse_affine_steps`, replacing consecutive column-wise scaling
+    and imputation steps.
+    """
+
+    def __init__(
+        self, scale: pd.Series, offset: pd.Series, fill: Optional[pd.Series] = None
+    ) -> None:
+        """
+        :param scale: the scaling factor per column
+        :param offset: the offset per column, added after scaling
+        :param fill: the value per column to replace missing values with, after
+            scaling; ``nan`` to keep missing values (optional)
+        """
+        super().__init__()
+        self.scale = scale
+        self.offset = offset
+        self.fill = fill
+        self.scale_ = None
+        self.offset_ = None
+        self.fill_ = None
         self._features_original = None
 
     # noinspection PyPep8Naming
@@ -71,49 +747,456 @@ class OutlierRemoverDF(TransformerDF, BaseEstimator):
         **fit_params: Any,
     ) -> T_Self:
         """
-        Fit this transformer, establishing the thresholds for outlier removal.
+        Fit this transformer, aligning scales, offsets and fill values with the columns
+        of the given input.
 
         :param X: input data frame with observations as rows and features as columns
-        :param y: an optional series or data frame with one or more outputs
+        :param y: an optional series or data frame with one or more outputs (ignored)
         :param fit_params: additional fit parameters (ignored)
         :return: ``self``
+        :raises ValueError: if scales, offsets, or fill values are missing for any
+            column of the input
         """
 
-        self: OutlierRemoverDF  # support type hinting in PyCharm
+        self: AffineScalerDF  # support type hinting in PyCharm
 
-        q1: pd.Series = X.quantile(q=0.25)
-        q3: pd.Series = X.quantile(q=0.75)
-        threshold_iqr: pd.Series = (q3 - q1) * self.iqr_multiple
-        self.threshold_low_ = q1 - threshold_iqr
-        self.threshold_high_ = q3 + threshold_iqr
+        columns = X.columns
+
+        def _align(arg_name: str, values: pd.Series) -> np.ndarray:
+            missing = columns.difference(values.index)
+            if len(missing) > 0:
+                raise ValueError(
+                    f"arg {arg_name} has no values for columns: "
+                    f"{', '.join(str(column) for column in missing)}"
+                )
+            return values.reindex(columns).values.astype(np.float64)
+
+        self.scale_ = _align("scale", self.scale)
+        self.offset_ = _align("offset", self.offset)
+        fill = None if self.fill is None else _align("fill", self.fill)
+        self.fill_ = None if fill is None or np.isnan(fill).all() else fill
+        self._features_original = columns.to_series()
+        return self
+
+    # noinspection PyPep8Naming
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Scale and shift the given inputs, replacing missing values.
+
+        :param X: input data frame with observations as rows and features as columns
+        :return: the transformed inputs
+        """
+        self._ensure_fitted()
+
+        features = self.feature_names_in_
+        values: np.ndarray = X.reindex(columns=features, copy=False).to_numpy(
+            dtype=np.float64, copy=True
+        )
+
+        fill = self.fill_
+        missing = None if fill is None else np.isnan(values)
+
+        values *= self.scale_
+        values += self.offset_
+
+        if missing is not None:
+            np.copyto(values, fill, where=missing)
+
+        return pd.DataFrame(data=values, index=X.index, columns=self.feature_names_out_)
+
+    # noinspection PyPep8Naming
+    def inverse_transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Reverse the scaling and shifting of the given inputs.
+
+        Replaced missing values are not restored.
+
+        :param X: input data frame with observations as rows and features as columns
+        :return: the reverse-transformed inputs
+        """
+        self._ensure_fitted()
+
+        values: np.ndarray = X.reindex(
+            columns=self.feature_names_out_, copy=False
+        ).to_numpy(dtype=np.float64, copy=True)
+
+        values -= self.offset_
+        values /= self.scale_
+
+        return pd.DataFrame(data=values, index=X.index, columns=self.feature_names_in_)
+
+    @property
+    def is_fitted(self) -> bool:
+        """[see superclass]"""
+        return self.scale_ is not None
+
+    def _get_features_original(self) -> pd.Series:
+        return self._features_original
+
+    def _get_features_in(self) -> pd.Index:
+        return self.feature_names_original_.index
+
+    def _get_n_outputs(self) -> int:
+        return 0
+
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        return self._get_features_in_required_by_lineage(features_out)
+
+    def _get_affine_parameters(
+        self,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        return (
+            self.scale_,
+            self.offset_,
+            np.full(len(self.scale_), np.nan) if self.fill_ is None else self.fill_,
+        )
+
+
+@inheritdoc(match="[see superclass]")
+class DtypeOptimizerDF(TransformerDF, BaseEstimator):
+    """
+    Convert each column to the narrowest dtype that safely represents its values,
+    to reduce the memory used by subsequent steps of a pipeline.
+
+    When fitted, this transformer determines the target dtype of each column:
+
+    - integer columns are downcast to the narrowest integer dtype holding all their
+      values
+    - 64-bit float columns are downcast to 32-bit floats if all their values are
+      preserved within the given relative tolerance
+    - string columns with no more than the given number of distinct values are
+      converted to a categorical dtype, with the distinct values as categories
+
+    The target dtypes are stored as attribute ``dtypes_``, and the number of bytes
+    saved per column by converting the data used for fitting as ``bytes_saved_``.
+
+    When transforming, only columns with a different target dtype are converted.
+    Integer columns with values outside the range of their target dtype, or with
+    values that are no longer integers, keep their original dtype, and string columns
+    with values not seen during fitting get a categorical dtype with all their values
+    as categories.
+    """
+
+    def __init__(
+        self, float_tolerance: Optional[float] = 1e-6, max_categories: int = 255
+    ) -> None:
+        """
+        :param float_tolerance: the maximum relative error for values of 64-bit float
+            columns to be downcast to 32-bit floats; ``None`` to never downcast floats
+            (default: ``1e-6``)
+        :param max_categories: the maximum number of distinct values for string
+            columns to be converted to a categorical dtype; ``0`` to never convert
+            strings (default: 255)
+        """
+        super().__init__()
+        if float_tolerance is not None and float_tolerance < 0.0:
+            raise ValueError(f"arg float_tolerance is negative: {float_tolerance}")
+        if max_categories < 0:
+            raise ValueError(f"arg max_categories is negative: {max_categories}")
+        self.float_tolerance = float_tolerance
+        self.max_categories = max_categories
+        self.dtypes_ = None
+        self.dtypes_in_ = None
+        self.bytes_saved_ = None
+        self._features_original = None
+
+    # noinspection PyPep8Naming
+    def fit(
+        self: T_Self,
+        X: pd.DataFrame,
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        **fit_params: Any,
+    ) -> T_Self:
+        """
+        Fit this transformer, determining the target dtype of each column, and the
+        number of bytes saved per column by converting the given input.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param y: an optional series or data frame with one or more outputs (ignored)
+        :param fit_params: additional fit parameters (ignored)
+        :return: ``self``
+        """
+
+        self: DtypeOptimizerDF  # support type hinting in PyCharm
+
+        dtypes = {}
+        bytes_saved = {}
+
+        for column, values in X.items():
+            dtype = self._fit_dtype(values)
+            dtypes[column] = dtype
+            bytes_saved[column] = (
+                values.memory_usage(index=False, deep=True)
+                - values.astype(dtype).memory_usage(index=False, deep=True)
+                if not pd.api.types.is_dtype_equal(dtype, values.dtype)
+                else 0
+            )
+
+        self.dtypes_ = pd.Series(dtypes, index=X.columns, dtype=object)
+        self.dtypes_in_ = X.dtypes
+        self.bytes_saved_ = pd.Series(bytes_saved, index=X.columns, dtype=np.int64)
         self._features_original = X.columns.to_series()
         return self
 
     # noinspection PyPep8Naming
     def transform(self, X: pd.DataFrame) -> pd.DataFrame:
         """
-        Return ``X`` with outliers are replaced by ``NaN``.
+        Convert the columns of the given inputs to their target dtypes.
 
         :param X: input data frame with observations as rows and features as columns
-        :return: the input data, with outliers replaced by ``NaN``
+        :return: the inputs with converted dtypes
         """
-        return X.where(cond=(X >= self.threshold_low_) & (X <= self.threshold_high_))
+        self._ensure_fitted()
+
+        X = X.reindex(columns=self.feature_names_in_, copy=False)
+
+        dtypes: Dict[Any, Any] = {}
+        for column, dtype in self.dtypes_.items():
+            values = X[column]
+            if not pd.api.types.is_dtype_equal(values.dtype, dtype):
+                dtypes[column] = _safe_dtype(values, dtype)
+
+        # only the converted columns are copied
+        transformed = X.astype(dtypes, copy=False) if dtypes else X.copy(deep=False)
+        transformed.columns = self.feature_names_out_
+        return transformed
 
     # noinspection PyPep8Naming
     def inverse_transform(self, X: pd.DataFrame) -> pd.DataFrame:
         """
-        The inverse transform of outlier removal is not implemented.
+        Convert the columns of the given inputs back to their original dtypes.
 
         :param X: input data frame with observations as rows and features as columns
-        :return: `n/a` (never returns)
-        :raises NotImplementedError:
+        :return: the inputs with their original dtypes
         """
-        raise NotImplementedError("inverse transform is not implemented")
+        self._ensure_fitted()
+
+        X = X.reindex(columns=self.feature_names_out_, copy=False)
+
+        dtypes = {
+            column: dtype
+            for column, dtype in self.dtypes_in_.items()
+            if not pd.api.types.is_dtype_equal(X[column].dtype, dtype)
+        }
+
+        restored = X.astype(dtypes, copy=False) if dtypes else X.copy(deep=False)
+        restored.columns = self.feature_names_in_
+        return restored
+
+    @property
+    def is_fitted(self) -> bool:
+        """[see superclass]"""
+        return self.dtypes_ is not None
+
+    def _fit_dtype(self, values: pd.Series) -> Any:
+        # the narrowest dtype that safely represents the given values
+        dtype = values.dtype
+
+        if not isinstance(dtype, np.dtype):
+            # keep extension dtypes, e.g., categorical or nullable integer dtypes
+            return dtype
+
+        if dtype.kind in "iu":
+            if len(values) > 0:
+                min_value, max_value = values.min(), values.max()
+                for target in _INTEGER_DTYPES:
+                    if target.itemsize >= dtype.itemsize:
+                        break
+                    info = np.iinfo(target)
+                    if info.min <= min_value and max_value <= info.max:
+                        return target
+
+        elif dtype == np.float64 and self.float_tolerance is not None:
+            with np.errstate(over="ignore"):
+                downcast = values.values.astype(np.float32)
+            if np.allclose(
+                downcast,
+                values.values,
+                rtol=self.float_tolerance,
+                atol=0.0,
+                equal_nan=True,
+            ):
+                return np.dtype(np.float32)
+
+        elif dtype == object and self.max_categories > 0:
+            if pd.api.types.infer_dtype(values, skipna=True) == "string":
+                categories = values.dropna().unique()
+                if len(categories) <= self.max_categories:
+                    return pd.CategoricalDtype(np.sort(categories))
+
+        return dtype
+
+    def _get_features_original(self) -> pd.Series:
+        return self._features_original
+
+    def _get_features_in(self) -> pd.Index:
+        return self.feature_names_original_.index
+
+    def _get_n_outputs(self) -> int:
+        return 0
+
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        return self._get_features_in_required_by_lineage(features_out)
+
+    def _prune_features_in(self, features_in: pd.Index) -> "DtypeOptimizerDF":
+        pruned = DtypeOptimizerDF(
+            float_tolerance=self.float_tolerance, max_categories=self.max_categories
+        )
+        pruned.dtypes_ = self.dtypes_.loc[features_in]
+        pruned.dtypes_in_ = self.dtypes_in_.loc[features_in]
+        pruned.bytes_saved_ = self.bytes_saved_.loc[features_in]
+        pruned._features_original = self._features_original.loc[features_in]
+        return pruned
+
+
+@inheritdoc(match="[see superclass]")
+class DeduplicateDF(TransformerDF, BaseEstimator):
+    """
+    Merge identical observations into one weighted observation, to reduce the cost
+    of fitting the learner of a pipeline.
+
+    When used as the preprocessing step of a learner pipeline, or as the last step
+    of a preprocessing pipeline, all observations with identical inputs and outputs
+    are merged into a single observation when the pipeline is fitted.
+    The sample weight of each merged observation is the number of identical
+    observations, or the sum of their sample weights if sample weights are given.
+    Learners that support sample weights are therefore fitted to the same model as
+    without de-duplication, at a lower cost for data with many duplicate
+    observations.
+
+    Pipelines raise a :class:`ValueError` if this transformer is followed by other
+    preprocessing steps, since these would be fitted to the merged observations
+    without regard to their sample weights.
+
+    Observations are matched using a 128-bit hash of their inputs and outputs,
+    computed in a vectorized way by pandas.
+
+    Transforming returns the given inputs unchanged, i.e., observations are only
+    merged when fitting the pipeline, using :meth:`.fit_transform_xy`.
+    The number of observations removed by the last fit is stored as attribute
+    ``n_duplicates_``.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.n_duplicates_ = None
+        self._features_original = None
+
+    # noinspection PyPep8Naming
+    def fit(
+        self: T_Self,
+        X: pd.DataFrame,
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        **fit_params: Any,
+    ) -> T_Self:
+        """
+        Fit this transformer, counting the duplicate observations in the given inputs
+        and outputs.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param y: an optional series or data frame with one or more outputs
+        :param fit_params: additional fit parameters (ignored)
+        :return: ``self``
+        """
+        self.fit_transform_xy(X, y, **fit_params)
+        return self
+
+    # noinspection PyPep8Naming
+    def fit_transform_xy(
+        self,
+        X: pd.DataFrame,
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        sample_weight: Optional[pd.Series] = None,
+        **fit_params: Any,
+    ) -> Tuple[
+        pd.DataFrame, Optional[Union[pd.Series, pd.DataFrame]], Optional[pd.Series]
+    ]:
+        """
+        Fit this transformer, and merge identical observations in the given inputs
+        and outputs.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param y: an optional series or data frame with one or more outputs
+        :param sample_weight: optional weights for all observations
+        :param fit_params: additional fit parameters (ignored)
+        :return: a tuple of the inputs and outputs of the first of each group of
+            identical observations, and the number of identical observations or the
+            sum of their sample weights, as sample weights
+        """
+
+        self: DeduplicateDF  # support type hinting in PyCharm
+
+        if not isinstance(X, pd.DataFrame):
+            raise TypeError("arg X must be a DataFrame")
+        if y is not None and len(y) != len(X):
+            raise ValueError("args X and y must have the same length")
+        sample_weight = _sample_weight_series(sample_weight, X)
+
+        # two 64 bit hashes per row, combined as one 128 bit key
+        xy = X if y is None else pd.concat([X, y], axis=1, ignore_index=True)
+        hashes = pd.DataFrame(
+            {
+                0: pd.util.hash_pandas_object(xy, index=False).values,
+                1: pd.util.hash_pandas_object(
+                    xy, index=False, hash_key=_HASH_KEY_2
+                ).values,
+            }
+        )
+
+        is_first: np.ndarray = ~hashes.duplicated().values
+        groups: np.ndarray = hashes.groupby([0, 1], sort=False).ngroup().values
+
+        # groups are numbered in order of their first observation
+        weights = np.bincount(
+            groups,
+            weights=(
+                None
+                if sample_weight is None
+                else np.asarray(sample_weight, dtype=float)
+            ),
+        )
+
+        X_deduplicated = X.loc[is_first]
+
+        self.n_duplicates_ = len(X) - len(X_deduplicated)
+        self._features_original = X.columns.to_series()
+
+        return (
+            X_deduplicated,
+            None if y is None else y.loc[is_first],
+            pd.Series(
+                weights,
+                index=X_deduplicated.index,
+                name=None if sample_weight is None else sample_weight.name,
+            ),
+        )
+
+    # noinspection PyPep8Naming
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return the given inputs unchanged.
+
+        :param X: input data frame with observations as rows and features as columns
+        :return: the input data
+        """
+        self._ensure_fitted()
+        return X
+
+    # noinspection PyPep8Naming
+    def inverse_transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return the given inputs unchanged.
+
+        :param X: input data frame with observations as rows and features as columns
+        :return: the input data
+        """
+        self._ensure_fitted()
+        return X
 
     @property
     def is_fitted(self) -> bool:
         """[see superclass]"""
-        return self.threshold_low_ is not None
+        return self._features_original is not None
 
     def _get_features_original(self) -> pd.Series:
         return self._features_original
@@ -124,6 +1207,217 @@ class OutlierRemoverDF(TransformerDF, BaseEstimator):
     def _get_n_outputs(self) -> int:
         return 0
 
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        return self._get_features_in_required_by_lineage(features_out)
+
+    def _prune_features_in(self, features_in: pd.Index) -> "DeduplicateDF":
+        pruned = DeduplicateDF()
+        pruned.n_duplicates_ = self.n_duplicates_
+        pruned._features_original = self._features_original.loc[features_in]
+        return pruned
+
+
+@inheritdoc(match="[see superclass]")
+class SampledFitDF(TransformerDF, BaseEstimator):
+    """
+    Fit a transformer to a random sample of the observations it is given, while
+    transforming all observations.
+
+    Useful for transformers where the cost of fitting grows with the number of
+    observations, but which can be fitted reliably to a moderately sized sample,
+    e.g., :class:`.QuantileTransformerDF`, :class:`.KBinsDiscretizerDF`,
+    :class:`.PowerTransformerDF`, :class:`.RobustScalerDF`, :class:`.IsomapDF`, or
+    :class:`.KernelPCADF`.
+
+    The sample is drawn without replacement, and is reproducible for a given random
+    state.
+    If stratified, the sample preserves the proportion of observations for each
+    distinct value of the output (requires a single output).
+    The order of the sampled observations is preserved.
+
+    The given transformer is fitted in place; all feature names are obtained from
+    the given transformer.
+    The number of observations used for fitting is stored as attribute
+    ``n_samples_fit_``.
+    """
+
+    def __init__(
+        self,
+        transformer: TransformerDF,
+        max_samples: Union[int, float] = 100_000,
+        *,
+        stratify: bool = False,
+        random_state: Optional[Union[int, np.random.RandomState]] = None,
+    ) -> None:
+        """
+        :param transformer: the transformer to fit to a sample of the observations
+        :param max_samples: the maximum number of observations to fit the transformer
+            to if an ``int``, or the share of observations to fit the transformer to
+            if a ``float`` in the range (0, 1] (default: 100,000)
+        :param stratify: if ``True``, draw a sample preserving the distribution of the
+            output (default: ``False``)
+        :param random_state: the random state used to draw the sample
+        """
+        super().__init__()
+        if not isinstance(transformer, TransformerDF):
+            raise TypeError(
+                "arg transformer expected to be a TransformerDF but is a "
+                f"{type(transformer).__name__}"
+            )
+        if isinstance(max_samples, float):
+            if not 0.0 < max_samples <= 1.0:
+                raise ValueError(
+                    f"arg max_samples must be in the range (0, 1]: {max_samples}"
+                )
+        elif max_samples < 1:
+            raise ValueError(f"arg max_samples must be positive: {max_samples}")
+        self.transformer = transformer
+        self.max_samples = max_samples
+        self.stratify = stratify
+        self.random_state = random_state
+        self.n_samples_fit_ = None
+
+    # noinspection PyPep8Naming
+    def fit(
+        self: T_Self,
+        X: pd.DataFrame,
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        **fit_params: Any,
+    ) -> T_Self:
+        """
+        Fit the transformer to a random sample of the given observations.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param y: an optional series or data frame with one or more outputs
+        :param fit_params: additional keyword parameters to be passed to the fit
+            method of the transformer; array-like parameters with one value per
+            observation, e.g., ``sample_weight``, are sampled along with ``X``
+        :return: ``self``
+        """
+
+        self: SampledFitDF  # support type hinting in PyCharm
+
+        if self.stratify and not isinstance(y, pd.Series):
+            raise ValueError("arg y must be a series to draw a stratified sample")
+
+        n = len(X)
+        max_samples = self.max_samples
+        n_samples = (
+            max(1, int(max_samples * n))
+            if isinstance(max_samples, float)
+            else min(max_samples, n)
+        )
+
+        if n_samples < n:
+            # positions of the sampled observations, in their original order
+            sample = np.sort(
+                resample(
+                    np.arange(n),
+                    replace=False,
+                    n_samples=n_samples,
+                    random_state=self.random_state,
+                    stratify=y.values if self.stratify else None,
+                )
+            )
+            X = X.iloc[sample]
+            if y is not None:
+                y = y.iloc[sample]
+            # per-row fit parameters, e.g., sample weights, are sampled along with X
+            fit_params = {
+                name: _sample_rows(value, sample, n)
+                for name, value in fit_params.items()
+            }
+
+        self.transformer.fit(X, y, **fit_params)
+        self.n_samples_fit_ = n_samples
+
+        return self
+
+    # noinspection PyPep8Naming
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Transform the given inputs using the fitted transformer.
+
+        :param X: input data frame with observations as rows and features as columns
+        :return: the transformed inputs
+        """
+        self._ensure_fitted()
+        return self.transformer.transform(X)
+
+    # noinspection PyPep8Naming
+    def inverse_transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Inverse-transform the given outputs using the fitted transformer.
+
+        :param X: data frame with transformed observations as rows
+        :return: the inverse-transformed inputs
+        """
+        self._ensure_fitted()
+        return self.transformer.inverse_transform(X)
+
+    @property
+    def is_fitted(self) -> bool:
+        """[see superclass]"""
+        return self.n_samples_fit_ is not None and self.transformer.is_fitted
+
+    @property
+    def feature_names_original_(self) -> pd.Series:
+        """[see superclass]"""
+        # not cached, since the transformer may be refitted
+        self._ensure_fitted()
+        return self.transformer.feature_names_original_
+
+    def _get_features_original(self) -> pd.Series:
+        return self.transformer.feature_names_original_
+
+    def _get_features_in(self) -> pd.Index:
+        return self.transformer.feature_names_in_
+
+    def _get_n_outputs(self) -> int:
+        return self.transformer.n_outputs_
+
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        # noinspection PyProtectedMember
+        return self.transformer._get_features_in_required(features_out)
+
+    def _prune_features_in(
+        self, features_in: pd.Index
+    ) -> Union[TransformerDF, str, None]:
+        # noinspection PyProtectedMember
+        pruned_transformer = self.transformer._prune_features_in(features_in)
+        if not isinstance(pruned_transformer, TransformerDF):
+            return pruned_transformer
+        pruned = SampledFitDF(
+            transformer=pruned_transformer,
+            max_samples=self.max_samples,
+            stratify=self.stratify,
+            random_state=self.random_state,
+        )
+        pruned.n_samples_fit_ = self.n_samples_fit_
+        return pruned
+
+    def _get_affine_parameters(
+        self,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        # noinspection PyProtectedMember
+        return self.transformer._get_affine_parameters()
+
+    def _get_linear_map(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        # noinspection PyProtectedMember
+        return self.transformer._get_linear_map()
+
+
+def _sample_rows(value: Any, sample: np.ndarray, n: int) -> Any:
+    # select the sampled rows of a per-row fit parameter with n rows; other fit
+    # parameters are returned unchanged
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return value.iloc[sample] if len(value) == n else value
+    elif isinstance(value, (np.ndarray, list)):
+        value = np.asarray(value)
+        return value[sample] if value.ndim > 0 and len(value) == n else value
+    else:
+        return value
+
 
 class BorutaPyWrapperDF(
     MetaEstimatorWrapperDF[BorutaPy],
@@ -137,9 +1431,74 @@ class BorutaPyWrapperDF(
     def _get_features_out(self) -> pd.Index:
         return self.feature_names_in_[self.native_estimator.support_]
 
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        return self._get_features_in_required_by_lineage(features_out)
+
+    def _prune_features_in(
+        self, features_in: pd.Index
+    ) -> Union[TransformerDF, str, None]:
+        # once restricted to selected columns, feature selection has no effect
+        return "passthrough"
+
+    def _get_linear_map(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        return self._get_selection_map()
+
 
 BorutaDF = make_df_transformer(
     BorutaPy, name="BorutaDF", base_wrapper=BorutaPyWrapperDF
 )
 
+
+#
+# private helper functions
+#
+
+
+# noinspection PyPep8Naming
+def _float_values(X: pd.DataFrame) -> np.ndarray:
+    # a float array with a copy of the values of the given data frame
+    values = X.to_numpy(copy=True)
+    if values.dtype.kind != "f":
+        values = values.astype(np.float64)
+    return values
+
+
+# noinspection PyPep8Naming
+def _sample_weight_series(
+    sample_weight: Optional[Any], X: pd.DataFrame
+) -> Optional[pd.Series]:
+    # the given sample weights as a series with the same index as the given inputs,
+    # so that they can be selected along with the inputs
+
+    if sample_weight is None:
+        return None
+    elif len(sample_weight) != len(X):
+        raise ValueError("args X and sample_weight must have the same length")
+    elif isinstance(sample_weight, pd.Series):
+        return sample_weight
+    else:
+        return pd.Series(np.asarray(sample_weight), index=X.index)
+
+
+def _safe_dtype(values: pd.Series, dtype: Any) -> Any:
+    # the given target dtype, or a wider dtype if the target dtype cannot represent
+    # all of the given values
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        if (values.notna() & ~values.isin(dtype.categories)).any():
+            return "category"
+
+    elif dtype.kind in "iu":
+        if not (isinstance(values.dtype, np.dtype) and values.dtype.kind in "iu"):
+            # values that are no longer integers, e.g., floats with missing values,
+            # cannot be converted without loss
+            return values.dtype
+        elif len(values) > 0:
+            info = np.iinfo(dtype)
+            if not (info.min <= values.min() and values.max() <= info.max):
+                return values.dtype
+
+    return dtype
+
+
 __tracker.validate()
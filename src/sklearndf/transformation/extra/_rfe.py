@@ -0,0 +1,417 @@
+"""
+Additional implementation of :mod:`sklearndf.transformation.extra`, providing a
+parallel implementation of recursive feature elimination with cross-validation
+"""
+
+import logging
+import time
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple, TypeVar, Union
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import BaseEstimator, clone, is_classifier
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import check_cv
+
+from pytools.api import AllTracker, inheritdoc
+
+from ... import EstimatorDF, TransformerDF
+
+log = logging.getLogger(__name__)
+
+__all__ = ["ParallelRFECVDF"]
+
+
+#
+# type variables
+#
+
+T_Self = TypeVar("T_Self")
+
+
+#
+# Ensure all symbols introduced below are included in __all__
+#
+
+__tracker = AllTracker(globals())
+
+
+#
+# Class definitions
+#
+
+
+@inheritdoc(match="[see superclass]")
+class ParallelRFECVDF(TransformerDF, BaseEstimator):
+    """
+    Select features using recursive feature elimination with cross-validation,
+    implementing the same algorithm as :class:`.RFECVDF` with lower overheads.
+
+    - The cross-validation folds are fitted in parallel worker processes, sharing
+      a memory-mapped copy of the inputs rather than pickling them for each fold.
+    - Each fold copies its training and test observations once, into column-major
+      buffers; eliminated features are removed by moving the remaining columns to
+      the front of the buffers in place, so that the estimator is fitted to a view
+      of the buffer in each elimination step.
+    - If ``warm_start`` is ``True`` and the estimator supports warm starts and has
+      coefficients, e.g., :class:`~sklearn.linear_model.LogisticRegression` or
+      :class:`~sklearn.linear_model.ElasticNet`, each elimination step starts from
+      the coefficients of the previous step for the remaining features.
+
+    The time taken to fit the estimator in each elimination step of each fold is
+    reported as attribute ``step_times_``.
+
+    Other fitted attributes follow :class:`~sklearn.feature_selection.RFECV`:
+    ``support_``, ``ranking_``, ``n_features_``, ``grid_scores_``, and
+    ``estimator_``, fitted to the selected features.
+    """
+
+    def __init__(
+        self,
+        estimator: BaseEstimator,
+        *,
+        step: Union[int, float] = 1,
+        min_features_to_select: int = 1,
+        cv: Any = None,
+        scoring: Union[str, Callable[..., float], None] = None,
+        n_jobs: Optional[int] = None,
+        warm_start: bool = True,
+    ) -> None:
+        """
+        :param estimator: an estimator with attribute ``coef_`` or
+            ``feature_importances_``; either a native scikit-learn estimator or an
+            :class:`.EstimatorDF`
+        :param step: the number of features to eliminate in each step if an ``int``,
+            or the share of all features to eliminate in each step if a ``float`` in
+            the range (0, 1) (default: 1)
+        :param min_features_to_select: the minimum number of features to select
+            (default: 1)
+        :param cv: the cross-validation strategy, as for
+            :class:`~sklearn.feature_selection.RFECV` (default: 5-fold
+            cross-validation)
+        :param scoring: the scoring method used to evaluate the elimination steps;
+            ``None`` to use the ``score`` method of the estimator (default: ``None``)
+        :param n_jobs: the number of folds to fit in parallel worker processes
+            (default: ``None``)
+        :param warm_start: if ``True``, start each elimination step from the
+            coefficients of the previous step, for estimators supporting warm starts
+            (default: ``True``)
+        """
+        super().__init__()
+        if step <= 0:
+            raise ValueError(f"arg step must be positive: {step}")
+        if min_features_to_select < 1:
+            raise ValueError(
+                f"arg min_features_to_select must be positive: {min_features_to_select}"
+            )
+        self.estimator = estimator
+        self.step = step
+        self.min_features_to_select = min_features_to_select
+        self.cv = cv
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.warm_start = warm_start
+        self.support_ = None
+        self.ranking_ = None
+        self.n_features_ = None
+        self.grid_scores_ = None
+        self.estimator_ = None
+        self.step_times_ = None
+        self._features_in = None
+
+    # noinspection PyPep8Naming
+    def fit(
+        self: T_Self,
+        X: pd.DataFrame,
+        y: Union[pd.Series, pd.DataFrame] = None,
+        groups: Optional[Any] = None,
+        **fit_params: Any,
+    ) -> T_Self:
+        """
+        Fit the recursive feature elimination to the given inputs and outputs.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param y: a series or data frame with one or more outputs
+        :param groups: optional group labels of the observations, for group-based
+            cross-validation strategies
+        :param fit_params: additional fit parameters (ignored)
+        :return: ``self``
+        """
+
+        self: ParallelRFECVDF  # support type hinting in PyCharm
+
+        if not isinstance(X, pd.DataFrame):
+            raise TypeError("arg X must be a DataFrame")
+        if y is None:
+            raise ValueError("arg y is required to select features")
+
+        self._reset_fit()
+
+        estimator = self.estimator
+        if isinstance(estimator, EstimatorDF):
+            estimator = estimator.native_estimator
+
+        x: np.ndarray = X.to_numpy(dtype=np.float64)
+        y_values = y.values
+        n_features = x.shape[1]
+        min_features_to_select = min(self.min_features_to_select, n_features)
+
+        step = self.step
+        if 0.0 < step < 1.0:
+            step = int(max(1, step * n_features))
+        else:
+            step = int(step)
+
+        cv = check_cv(self.cv, y_values, classifier=is_classifier(estimator))
+        scorer = check_scoring(estimator, scoring=self.scoring)
+
+        # the inputs are memory-mapped for all worker processes, instead of being
+        # pickled for each fold
+        folds: List[_Elimination] = Parallel(
+            n_jobs=self.n_jobs, max_nbytes="1M", mmap_mode="r"
+        )(
+            delayed(_eliminate)(
+                estimator,
+                x,
+                y_values,
+                train,
+                min_features_to_select,
+                step,
+                self.warm_start,
+                test,
+                scorer,
+            )
+            for train, test in cv.split(x, y_values, groups)
+        )
+
+        # determine the number of features with the best total score across folds,
+        # preferring fewer features in case of ties, as in RFECV
+        scores = np.sum([fold.scores for fold in folds], axis=0)
+        best_step = len(scores) - np.argmax(scores[::-1]) - 1
+        n_features_to_select = max(
+            n_features - best_step * step, min_features_to_select
+        )
+
+        final = _eliminate(
+            estimator,
+            x,
+            y_values,
+            None,
+            n_features_to_select,
+            step,
+            self.warm_start,
+        )
+
+        self.support_ = final.support
+        self.ranking_ = final.ranking
+        self.n_features_ = int(final.support.sum())
+        self.grid_scores_ = scores[::-1] / len(folds)
+        # refit a clean clone to the selected features, as in RFECV, since the
+        # estimator of the last elimination step may be warm-started
+        self.estimator_ = clone(estimator).fit(x[:, final.support], y_values)
+        self.step_times_ = pd.DataFrame(
+            {i: fold.times for i, fold in enumerate(folds)},
+            index=pd.Index(folds[0].n_features, name="n_features"),
+        ).rename_axis(columns="fold")
+        self._features_in = X.columns.rename(self.COL_FEATURE_IN)
+
+        return self
+
+    # noinspection PyPep8Naming
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Select the features retained by the recursive feature elimination from the
+        given inputs.
+
+        :param X: input data frame with observations as rows and features as columns
+        :return: the selected features
+        """
+        self._ensure_fitted()
+        return X.loc[:, self.feature_names_out_]
+
+    # noinspection PyPep8Naming
+    def inverse_transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        The inverse transform of feature selection is not implemented.
+
+        :param X: input data frame with observations as rows and features as columns
+        :return: `n/a` (never returns)
+        :raises NotImplementedError:
+        """
+        raise NotImplementedError("inverse transform is not implemented")
+
+    @property
+    def is_fitted(self) -> bool:
+        """[see superclass]"""
+        return self.support_ is not None
+
+    def _reset_fit(self) -> None:
+        self.support_ = None
+        self.ranking_ = None
+        self.n_features_ = None
+        self.grid_scores_ = None
+        self.estimator_ = None
+        self.step_times_ = None
+        self._features_in = None
+        self._features_original = None
+
+    def _get_features_original(self) -> pd.Series:
+        features_out = self._features_in[self.support_]
+        return pd.Series(features_out, index=features_out)
+
+    def _get_features_in(self) -> pd.Index:
+        return self._features_in
+
+    def _get_n_outputs(self) -> int:
+        return 0
+
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        return self._get_features_in_required_by_lineage(features_out)
+
+    def _prune_features_in(
+        self, features_in: pd.Index
+    ) -> Union[TransformerDF, str, None]:
+        # once restricted to selected columns, feature selection has no effect
+        return "passthrough"
+
+    def _get_linear_map(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        matrix = np.eye(len(self._features_in))[:, self.support_]
+        return matrix, np.zeros(matrix.shape[1])
+
+
+class _Elimination(NamedTuple):
+    # the result of a recursive feature elimination
+    support: np.ndarray
+    ranking: np.ndarray
+    estimator: BaseEstimator
+    # the number of features, fit time, and test score for each elimination step
+    n_features: List[int]
+    times: List[float]
+    scores: List[float]
+
+
+#
+# private helper functions
+#
+
+
+def _eliminate(
+    estimator: BaseEstimator,
+    x: np.ndarray,
+    y: np.ndarray,
+    train: Optional[np.ndarray],
+    n_features_to_select: int,
+    step: int,
+    warm_start: bool,
+    test: Optional[np.ndarray] = None,
+    scorer: Optional[Callable[..., float]] = None,
+) -> _Elimination:
+    # recursively eliminate the least important features, fitting the estimator
+    # to the given training observations (all observations if None), and scoring
+    # each step on the given test observations if any
+
+    n_features = x.shape[1]
+    y_train = y if train is None else y[train]
+    x_train = _make_buffer(x, train)
+    x_test = None if test is None else _make_buffer(x, test)
+
+    # original positions of the features in the first columns of the buffers
+    features = np.arange(n_features)
+    support = np.ones(n_features, dtype=bool)
+    ranking = np.ones(n_features, dtype=int)
+
+    step_n_features: List[int] = []
+    step_times: List[float] = []
+    step_scores: List[float] = []
+
+    fitted = clone(estimator)
+
+    while True:
+        n_remaining = len(features)
+
+        start = time.perf_counter()
+        fitted.fit(x_train[:, :n_remaining], y_train)
+        step_times.append(time.perf_counter() - start)
+        step_n_features.append(n_remaining)
+
+        if x_test is not None:
+            step_scores.append(scorer(fitted, x_test[:, :n_remaining], y[test]))
+
+        log.debug(
+            f"fitted {type(fitted).__name__} to {n_remaining} features in "
+            f"{step_times[-1]:.3f}s"
+        )
+
+        if n_remaining <= n_features_to_select:
+            break
+
+        n_eliminate = min(step, n_remaining - n_features_to_select)
+        order = np.argsort(_get_importance(fitted), kind="mergesort")
+        support[features[order[:n_eliminate]]] = False
+        ranking[~support] += 1
+
+        # positions of the remaining features in the buffers, in their original order
+        retained = np.sort(order[n_eliminate:])
+        _compact(x_train, retained)
+        if x_test is not None:
+            _compact(x_test, retained)
+        features = features[retained]
+
+        if warm_start and _supports_warm_start(fitted):
+            fitted.set_params(warm_start=True)
+            fitted.coef_ = fitted.coef_[..., retained]
+        else:
+            fitted = clone(estimator)
+
+    return _Elimination(
+        support=support,
+        ranking=ranking,
+        estimator=fitted,
+        n_features=step_n_features,
+        times=step_times,
+        scores=step_scores,
+    )
+
+
+def _make_buffer(x: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+    # a column-major copy of the given rows of x
+    buffer = np.empty(
+        (x.shape[0] if rows is None else len(rows), x.shape[1]),
+        dtype=x.dtype,
+        order="F",
+    )
+    if rows is None:
+        buffer[:] = x
+    else:
+        np.take(x, rows, axis=0, out=buffer, mode="clip")
+    return buffer
+
+
+def _compact(buffer: np.ndarray, retained: np.ndarray) -> None:
+    # move the given columns of the buffer to its first columns, in place; the
+    # retained column positions must be in ascending order
+    for i, j in enumerate(retained):
+        if i != j:
+            buffer[:, i] = buffer[:, j]
+
+
+def _get_importance(estimator: BaseEstimator) -> np.ndarray:
+    # the importance of each feature, as determined by RFE
+    importance = getattr(estimator, "coef_", None)
+    if importance is None:
+        importance = getattr(estimator, "feature_importances_", None)
+    if importance is None:
+        raise RuntimeError(
+            "the estimator does not expose coef_ or feature_importances_ attributes"
+        )
+    importance = np.square(importance)
+    return importance.sum(axis=0) if importance.ndim > 1 else importance
+
+
+def _supports_warm_start(estimator: BaseEstimator) -> bool:
+    # True if the estimator can be warm-started from its coefficients
+    return "warm_start" in estimator.get_params() and hasattr(estimator, "coef_")
+
+
+__tracker.validate()
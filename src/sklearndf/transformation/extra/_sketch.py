@@ -0,0 +1,191 @@
+"""
+Additional implementation of :mod:`sklearndf.transformation.extra`, providing
+mergeable quantile sketches
+"""
+
+import logging
+import math
+from typing import List, Sequence, Union
+
+import numpy as np
+
+from pytools.api import AllTracker
+
+log = logging.getLogger(__name__)
+
+__all__ = ["QuantileSketch"]
+
+
+#
+# constants
+#
+
+# ratio of the capacities of adjacent levels of the sketch
+_CAPACITY_DECAY = 2.0 / 3.0
+
+
+#
+# Ensure all symbols introduced below are included in __all__
+#
+
+__tracker = AllTracker(globals())
+
+
+#
+# Class definitions
+#
+
+
+class QuantileSketch:
+    """
+    A KLL sketch estimating the quantiles of a stream of numbers in bounded memory.
+
+    The sketch retains a sample of the values it has seen in a hierarchy of levels,
+    where each value retained at level :math:`h` stands for :math:`2^h` original
+    values.
+    When a level exceeds its capacity, its values are sorted and every other value
+    is promoted to the next level, starting from a random offset.
+    Level capacities decrease geometrically from the top level, so that the sketch
+    retains at most about :math:`3k` values regardless of the number of values it
+    has seen, and the rank error of its quantile estimates decreases in proportion
+    to :math:`1/k`.
+
+    Quantiles are exact (and interpolated linearly, as in :meth:`numpy.quantile`)
+    as long as the sketch has seen no more than :math:`k` values.
+
+    Sketches with the same size can be merged, e.g., to combine sketches of separate
+    chunks of a data set that were computed in parallel.
+    Missing values are ignored.
+    """
+
+    def __init__(self, k: int = 200, seed: int = 0) -> None:
+        """
+        :param k: the size of the sketch, i.e., the capacity of its top level
+            (default: 200)
+        :param seed: the seed of the pseudo-random generator used to compact the
+            sketch, for reproducible estimates (default: 0)
+        """
+        if k < 2:
+            raise ValueError(f"arg k must be at least 2: {k}")
+
+        self.k = k
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._n = 0
+        self._random_state = np.random.RandomState(seed)
+
+    @property
+    def n(self) -> int:
+        """
+        The number of values seen by this sketch.
+        """
+        return self._n
+
+    @property
+    def n_retained(self) -> int:
+        """
+        The number of values currently retained by this sketch, determining its
+        memory use.
+        """
+        return sum(map(len, self._levels))
+
+    @property
+    def is_exact(self) -> bool:
+        """
+        ``True`` if this sketch retains all values it has seen, ``False`` otherwise.
+        """
+        return len(self._levels) == 1
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add the given values to this sketch.
+
+        :param values: a 1-dimensional array of values; missing values are ignored
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+
+        if len(values) == 0:
+            return
+
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._n += len(values)
+        self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Add all values seen by another sketch to this sketch.
+
+        :param other: the sketch to merge into this sketch
+        :raises ValueError: if the other sketch has a different size
+        """
+        if other.k != self.k:
+            raise ValueError(
+                f"cannot merge sketch of size {other.k} into sketch of size {self.k}"
+            )
+
+        levels = self._levels
+        for h, other_level in enumerate(other._levels):
+            if h < len(levels):
+                levels[h] = np.concatenate([levels[h], other_level])
+            else:
+                levels.append(other_level.copy())
+
+        self._n += other._n
+        self._compress()
+
+    def quantile(self, q: Union[float, Sequence[float]]) -> np.ndarray:
+        """
+        Estimate the given quantiles of the values seen by this sketch.
+
+        :param q: a quantile, or a sequence of quantiles, in the range [0, 1]
+        :return: the estimated quantiles; ``NaN`` if this sketch has not seen any
+            values
+        """
+        q = np.asarray(q, dtype=np.float64)
+
+        if self._n == 0:
+            return np.full(q.shape, np.nan)
+
+        if self.is_exact:
+            return np.quantile(self._levels[0], q)
+
+        # weighted nearest-rank estimate, with each value at level h standing for 2^h
+        # original values
+        values = np.concatenate(self._levels)
+        weights = np.concatenate(
+            [np.full(len(level), 1 << h) for h, level in enumerate(self._levels)]
+        )
+        order = np.argsort(values, kind="mergesort")
+        cumulative_weights = np.cumsum(weights[order])
+        ranks = np.searchsorted(
+            cumulative_weights, q * cumulative_weights[-1], side="left"
+        )
+        return values[order][np.minimum(ranks, len(values) - 1)]
+
+    def _capacity(self, h: int) -> int:
+        return max(
+            2, math.ceil(self.k * _CAPACITY_DECAY ** (len(self._levels) - h - 1))
+        )
+
+    def _compress(self) -> None:
+        # compact levels exceeding their capacity until the sketch fits its total
+        # capacity
+        levels = self._levels
+
+        while sum(map(len, levels)) > sum(map(self._capacity, range(len(levels)))):
+            for h in range(len(levels)):
+                if len(levels[h]) > self._capacity(h):
+                    if h + 1 == len(levels):
+                        levels.append(np.empty(0))
+
+                    level = np.sort(levels[h])
+                    # with an odd number of values, the largest value is retained
+                    n_retained = len(level) % 2
+                    offset = self._random_state.randint(2)
+                    levels[h + 1] = np.concatenate(
+                        [levels[h + 1], level[offset : len(level) - n_retained : 2]]
+                    )
+                    levels[h] = level[len(level) - n_retained :]
+
+
+__tracker.validate()
@@ -4,22 +4,49 @@ Core implementation of :mod:`sklearndf.transformation.wrapper`
 
 import logging
 from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
+from copy import deepcopy
 from functools import reduce
-from typing import Any, Generic, List, Optional, TypeVar, Union
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import numpy as np
 import pandas as pd
-from sklearn.base import TransformerMixin
+from sklearn.base import TransformerMixin, clone
 from sklearn.compose import ColumnTransformer
+from sklearn.decomposition import PCA, IncrementalPCA, TruncatedSVD
 from sklearn.impute import MissingIndicator, SimpleImputer
 from sklearn.impute._iterative import IterativeImputer
 from sklearn.kernel_approximation import AdditiveChi2Sampler
 from sklearn.manifold import Isomap
-from sklearn.preprocessing import KBinsDiscretizer, OneHotEncoder, PolynomialFeatures
+from sklearn.preprocessing import (
+    Binarizer,
+    KBinsDiscretizer,
+    MaxAbsScaler,
+    MinMaxScaler,
+    OneHotEncoder,
+    OrdinalEncoder,
+    PolynomialFeatures,
+    PowerTransformer,
+    QuantileTransformer,
+    RobustScaler,
+    StandardScaler,
+)
 
 from pytools.api import AllTracker
 
-from ... import TransformerDF
+from ... import TransformerDF, __sklearn_0_22__, __sklearn_version__
+from ...parallel import BranchExecutor
 from ...wrapper import TransformerWrapperDF
 
 log = logging.getLogger(__name__)
@@ -41,6 +68,7 @@ __all__ = [
     "KBinsDiscretizerWrapperDF",
     "PolynomialFeaturesWrapperDF",
     "OneHotEncoderWrapperDF",
+    "OrdinalEncoderWrapperDF",
 ]
 
 
@@ -57,6 +85,30 @@ T_Transformer = TypeVar("T_Transformer", bound=TransformerMixin)
 T_Imputer = TypeVar("T_Imputer", SimpleImputer, IterativeImputer)
 
 
+#
+# constants
+#
+
+# fitted attributes of column-wise native transformers holding one value per input
+# column, used to restrict a fitted transformer to a subset of its input columns
+_COLUMN_WISE_ATTRIBUTES: Dict[Type[TransformerMixin], Tuple[str, ...]] = {
+    Binarizer: (),
+    MaxAbsScaler: ("max_abs_", "scale_"),
+    MinMaxScaler: ("min_", "scale_", "data_min_", "data_max_", "data_range_"),
+    OrdinalEncoder: ("categories_",),
+    RobustScaler: ("center_", "scale_"),
+    SimpleImputer: ("statistics_",),
+    StandardScaler: ("mean_", "var_", "scale_", "n_samples_seen_"),
+}
+
+# native transformers computing each output column only from the same input column
+_COLUMN_WISE_TRANSFORMERS: Tuple[Type[TransformerMixin], ...] = (
+    *_COLUMN_WISE_ATTRIBUTES.keys(),
+    PowerTransformer,
+    QuantileTransformer,
+)
+
+
 #
 # Ensure all symbols introduced below are included in __all__
 #
@@ -111,6 +163,14 @@ class ColumnSubsetTransformerWrapperDF(
         features_out = self._get_features_out()
         return pd.Series(index=features_out, data=features_out.values)
 
+    def _get_selection_map(self) -> Tuple[np.ndarray, np.ndarray]:
+        # return the linear map selecting the output columns from the input columns
+        features_in = self.feature_names_in_
+        matrix = np.eye(len(features_in))[
+            :, features_in.get_indexer(self.feature_names_out_)
+        ]
+        return matrix, np.zeros(matrix.shape[1])
+
 
 class ColumnPreservingTransformerWrapperDF(
     ColumnSubsetTransformerWrapperDF[T_Transformer],
@@ -126,6 +186,55 @@ class ColumnPreservingTransformerWrapperDF(
     def _get_features_out(self) -> pd.Index:
         return self.feature_names_in_
 
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        if isinstance(self.native_estimator, _COLUMN_WISE_TRANSFORMERS):
+            return self._get_features_in_required_by_lineage(features_out)
+        else:
+            return super()._get_features_in_required(features_out)
+
+    def _prune_features_in(
+        self, features_in: pd.Index
+    ) -> Union[TransformerDF, str, None]:
+        return _prune_column_wise_transformer(self, features_in)
+
+    def _get_affine_parameters(
+        self,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        native_transformer = self.native_estimator
+        native_type = type(native_transformer)
+        n_features = len(self.feature_names_in_)
+
+        def _center_and_scale(
+            center: Optional[np.ndarray], scale: Optional[np.ndarray]
+        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            # parameters for transformation (x - center) / scale
+            scale = np.ones(n_features) if scale is None else scale
+            center = np.zeros(n_features) if center is None else center
+            return 1.0 / scale, -center / scale, np.full(n_features, np.nan)
+
+        if native_type is StandardScaler:
+            # the mean is computed even if it is not subtracted
+            return _center_and_scale(
+                native_transformer.mean_ if native_transformer.with_mean else None,
+                native_transformer.scale_,
+            )
+        elif native_type is RobustScaler:
+            return _center_and_scale(
+                native_transformer.center_, native_transformer.scale_
+            )
+        elif native_type is MaxAbsScaler:
+            return _center_and_scale(None, native_transformer.scale_)
+        elif native_type is MinMaxScaler and not getattr(
+            native_transformer, "clip", False
+        ):
+            return (
+                native_transformer.scale_,
+                native_transformer.min_,
+                np.full(n_features, np.nan),
+            )
+        else:
+            return None
+
 
 class BaseMultipleInputsPerOutputTransformerWrapperDF(
     TransformerWrapperDF[T_Transformer], Generic[T_Transformer]
@@ -168,6 +277,21 @@ class BaseDimensionalityReductionWrapperDF(
     def _get_features_out(self) -> pd.Index:
         return pd.Index([f"x_{i}" for i in range(self._n_components_)])
 
+    def _get_linear_map(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        native_transformer = self.native_estimator
+        native_type = type(native_transformer)
+
+        if native_type is TruncatedSVD:
+            matrix = native_transformer.components_.T
+            return matrix, np.zeros(matrix.shape[1])
+        elif native_type in (PCA, IncrementalPCA):
+            matrix = native_transformer.components_.T
+            if native_transformer.whiten:
+                matrix = matrix / np.sqrt(native_transformer.explained_variance_)
+            return matrix, -native_transformer.mean_ @ matrix
+        else:
+            return None
+
 
 class NComponentsDimensionalityReductionWrapperDF(
     BaseDimensionalityReductionWrapperDF[T_Transformer],
@@ -240,6 +364,18 @@ class FeatureSelectionWrapperDF(
         get_support = getattr(self.native_estimator, self._ATTR_GET_SUPPORT)
         return self.feature_names_in_[get_support()]
 
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        return self._get_features_in_required_by_lineage(features_out)
+
+    def _prune_features_in(
+        self, features_in: pd.Index
+    ) -> Union[TransformerDF, str, None]:
+        # once restricted to selected columns, feature selection has no effect
+        return "passthrough"
+
+    def _get_linear_map(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        return self._get_selection_map()
+
 
 class ColumnTransformerWrapperDF(
     TransformerWrapperDF[ColumnTransformer], metaclass=ABCMeta
@@ -249,17 +385,143 @@ class ColumnTransformerWrapperDF(
 
     Requires all transformers passed as the ``transformers`` parameter to implement
     :class:`.TransformerDF`.
+    The ``remainder`` parameter must be ``"drop"`` or ``"passthrough"``.
+
+    Transformers are fitted using a :class:`.BranchExecutor`, sharing steps common
+    to multiple transformers that operate on the same columns, and in parallel if
+    the native column transformer has more than one job.
+
+    Fitted column transformers pass each transformer the block of input columns it
+    operates on, as a view of the input data frame if the columns are adjacent and
+    of a common dtype, and collect the transformed blocks in a single preallocated
+    output array.
     """
 
     __DROP = "drop"
     __PASSTHROUGH = "passthrough"
+    __REMAINDER = "remainder"
 
     __SPECIAL_TRANSFORMERS = (__DROP, __PASSTHROUGH)
 
+    # the keys of the fitted steps of each transformer, determined when fitting and
+    # used to share steps when transforming; None unless fitted by this wrapper
+    _step_keys: Optional[List[List[Any]]] = None
+
+    def _reset_fit(self) -> None:
+        try:
+            # noinspection PyProtectedMember
+            super()._reset_fit()
+        finally:
+            self._step_keys = None
+
+    # noinspection PyPep8Naming
+    def _post_fit(
+        self, X: pd.DataFrame, y: Optional[pd.Series] = None, **fit_params
+    ) -> None:
+        # noinspection PyProtectedMember
+        super()._post_fit(X, y, **fit_params)
+
+        # compare the fitted steps once, instead of each time we transform
+        self._step_keys = BranchExecutor(
+            n_jobs=self.native_estimator.n_jobs
+        ).fitted_step_keys(
+            [
+                df_transformer
+                for _, df_transformer, _ in self._iter_fitted_transformers()
+                if df_transformer != ColumnTransformerWrapperDF.__PASSTHROUGH
+            ]
+        )
+
+    # noinspection PyPep8Naming
+    def _fit(
+        self, X: pd.DataFrame, y: Optional[pd.Series], **fit_params
+    ) -> ColumnTransformer:
+        with self._fitting_branches_in_executor():
+            return super()._fit(X, y, **fit_params)
+
+    # noinspection PyPep8Naming
+    def _fit_transform(
+        self, X: pd.DataFrame, y: Optional[pd.Series], **fit_params
+    ) -> np.ndarray:
+        with self._fitting_branches_in_executor():
+            return super()._fit_transform(X, y, **fit_params)
+
+    @contextmanager
+    def _fitting_branches_in_executor(self) -> Iterator[None]:
+        # while in this context, the native column transformer fits its transformers
+        # using a branch executor instead of dispatching them to joblib itself; all
+        # other fitting logic, e.g., validating the columns and the remainder, stays
+        # with the native column transformer
+
+        native: ColumnTransformer = self.native_estimator
+        native_fit_transform = native._fit_transform
+
+        # noinspection PyPep8Naming
+        def _fit_transform_branches(
+            X: Any, y: Any, func: Any, fitted: bool = False, *args, **kwargs
+        ) -> List[Tuple[Any, Any]]:
+            if fitted:
+                return native_fit_transform(X, y, func, fitted, *args, **kwargs)
+
+            # noinspection PyProtectedMember
+            branches = list(native._iter(fitted=False, replace_strings=True))
+
+            # transformers operating on the same columns get the same block, so
+            # that they can share common steps
+            X_blocks: Dict[Any, Any] = {}
+            X_branches = []
+            for _, _, column, _ in branches:
+                block_key = _column_key(column)
+                if block_key not in X_blocks:
+                    X_blocks[block_key] = _select_columns(X, column)
+                X_branches.append(X_blocks[block_key])
+
+            df_branches = [
+                i
+                for i, (_, transformer, _, _) in enumerate(branches)
+                if isinstance(transformer, TransformerDF)
+            ]
+            fitted_df_branches = dict(
+                zip(
+                    df_branches,
+                    BranchExecutor(n_jobs=native.n_jobs).fit_transform(
+                        [(clone(branches[i][1]), X_branches[i]) for i in df_branches],
+                        y,
+                    ),
+                )
+            )
+
+            results: List[Tuple[Any, Any]] = []
+            for i, ((_, transformer, _, weight), X_branch) in enumerate(
+                zip(branches, X_branches)
+            ):
+                if i in fitted_df_branches:
+                    fitted_transformer, transformed = fitted_df_branches[i]
+                    results.append(
+                        (
+                            transformed if weight is None else transformed * weight,
+                            fitted_transformer,
+                        )
+                    )
+                else:
+                    # the native transformer replacing "passthrough"
+                    results.append(func(clone(transformer), X_branch, y, weight))
+
+            return results
+
+        native._fit_transform = _fit_transform_branches
+        try:
+            yield
+        finally:
+            del native._fit_transform
+
     def _validate_delegate_estimator(self) -> None:
         column_transformer: ColumnTransformer = self.native_estimator
 
-        if column_transformer.remainder != ColumnTransformerWrapperDF.__DROP:
+        if (
+            column_transformer.remainder
+            not in ColumnTransformerWrapperDF.__SPECIAL_TRANSFORMERS
+        ):
             raise ValueError(
                 f"unsupported value for arg remainder: ({column_transformer.remainder})"
             )
@@ -299,14 +561,112 @@ class ColumnTransformerWrapperDF(
                     if df_transformer == ColumnTransformerWrapperDF.__PASSTHROUGH
                     else df_transformer.feature_names_original_
                 )
-                for _, df_transformer, columns in self.native_estimator.transformers_
-                if (
-                    len(columns) > 0
-                    and df_transformer != ColumnTransformerWrapperDF.__DROP
-                )
+                for _, df_transformer, columns in self._iter_fitted_transformers()
             ),
         )
 
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        # collect the input columns required by each transformer that produces any
+        # of the given output columns
+        required = set()
+
+        for _, df_transformer, columns in self._iter_fitted_transformers():
+            if df_transformer == ColumnTransformerWrapperDF.__PASSTHROUGH:
+                required.update(columns.intersection(features_out))
+            else:
+                transformer_out = df_transformer.feature_names_out_
+                transformer_out = transformer_out[transformer_out.isin(features_out)]
+                if len(transformer_out) > 0:
+                    # noinspection PyProtectedMember
+                    required.update(
+                        df_transformer._get_features_in_required(transformer_out)
+                    )
+
+        features_in = self.feature_names_in_
+        return features_in[features_in.isin(required)]
+
+    # noinspection PyPep8Naming
+    def _transform(self, X: pd.DataFrame) -> np.ndarray:
+        # transform the column blocks of each transformer, and write the results to
+        # a single preallocated array
+
+        branches = self._get_branches(X)
+
+        # transform all blocks other than passed-through blocks, sharing common steps
+        # and in parallel if the native column transformer has more than one job
+        transformed_blocks = iter(
+            BranchExecutor(n_jobs=self.native_estimator.n_jobs).transform(
+                [
+                    (df_transformer, X_block)
+                    for _, df_transformer, X_block in branches
+                    if df_transformer != ColumnTransformerWrapperDF.__PASSTHROUGH
+                ],
+                step_keys=self._step_keys,
+            )
+        )
+
+        blocks: List[np.ndarray] = [
+            X_block.values
+            if df_transformer == ColumnTransformerWrapperDF.__PASSTHROUGH
+            else next(transformed_blocks)
+            for _, df_transformer, X_block in branches
+        ]
+
+        # apply the transformer weights, as the native column transformer does for
+        # all blocks including passed-through blocks
+        weights = self.native_estimator.transformer_weights or {}
+        blocks = [
+            block if name not in weights else block * weights[name]
+            for (name, _, _), block in zip(branches, blocks)
+        ]
+
+        transformed = np.empty(
+            shape=(len(X), sum(block.shape[1] for block in blocks)),
+            dtype=np.result_type(*(block.dtype for block in blocks)),
+        )
+
+        start = 0
+        for block in blocks:
+            end = start + block.shape[1]
+            transformed[:, start:end] = block
+            start = end
+
+        return transformed
+
+    # noinspection PyPep8Naming
+    def _get_branches(
+        self, X: pd.DataFrame
+    ) -> List[Tuple[str, Union[TransformerDF, str], pd.DataFrame]]:
+        # get the fitted transformers that produce output columns, along with their
+        # blocks of input columns; transformers operating on the same columns get the
+        # same block
+        X_blocks: Dict[Tuple[Any, ...], pd.DataFrame] = {}
+        branches = []
+
+        for name, df_transformer, columns in self._iter_fitted_transformers():
+            block_key = tuple(columns)
+            if block_key not in X_blocks:
+                X_blocks[block_key] = _column_block(X, columns)
+            branches.append((name, df_transformer, X_blocks[block_key]))
+
+        return branches
+
+    def _iter_fitted_transformers(
+        self,
+    ) -> Iterator[Tuple[str, Union[TransformerDF, str], pd.Index]]:
+        # iterate the fitted transformers that produce output columns, along with the
+        # names of their input columns, including the remainder unless it is dropped
+        features_in = self.feature_names_in_
+
+        for name, df_transformer, columns in self.native_estimator.transformers_:
+            if len(columns) == 0 or df_transformer == ColumnTransformerWrapperDF.__DROP:
+                continue
+            elif name == ColumnTransformerWrapperDF.__REMAINDER:
+                # the remainder columns are stated as indices of the input columns
+                yield name, df_transformer, features_in[columns]
+            else:
+                yield name, df_transformer, pd.Index(columns)
+
 
 class ImputerWrapperDF(TransformerWrapperDF[T_Imputer], metaclass=ABCMeta):
     """
@@ -361,6 +721,45 @@ class ImputerWrapperDF(TransformerWrapperDF[T_Imputer], metaclass=ABCMeta):
         else:
             return features_original
 
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        if isinstance(self.native_estimator, SimpleImputer):
+            return self._get_features_in_required_by_lineage(features_out)
+        else:
+            return super()._get_features_in_required(features_out)
+
+    def _prune_features_in(
+        self, features_in: pd.Index
+    ) -> Union[TransformerDF, str, None]:
+        if self.native_estimator.add_indicator:
+            return None
+        else:
+            return _prune_column_wise_transformer(self, features_in)
+
+    def _get_affine_parameters(
+        self,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        # a simple imputer replacing nan values, without dropping any columns
+        native_transformer = self.native_estimator
+        if not isinstance(native_transformer, SimpleImputer) or (
+            native_transformer.add_indicator
+        ):
+            return None
+
+        missing_values = native_transformer.missing_values
+        if not (isinstance(missing_values, float) and np.isnan(missing_values)):
+            return None
+
+        statistics: np.ndarray = native_transformer.statistics_
+        if statistics.dtype.kind not in "fiu" or np.isnan(statistics).any():
+            return None
+
+        n_features = len(statistics)
+        return (
+            np.ones(n_features),
+            np.zeros(n_features),
+            statistics.astype(np.float64),
+        )
+
 
 class MissingIndicatorWrapperDF(
     TransformerWrapperDF[MissingIndicator], metaclass=ABCMeta
@@ -376,6 +775,9 @@ class MissingIndicatorWrapperDF(
         features_out = pd.Index([f"{name}__missing" for name in features_original])
         return pd.Series(index=features_out, data=features_original)
 
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        return self._get_features_in_required_by_lineage(features_out)
+
 
 class IsomapWrapperDF(BaseDimensionalityReductionWrapperDF[Isomap], metaclass=ABCMeta):
     """
@@ -418,12 +820,71 @@ class PolynomialFeaturesWrapperDF(
 class OneHotEncoderWrapperDF(TransformerWrapperDF[OneHotEncoder], metaclass=ABCMeta):
     """
     DF wrapper for :class:`sklearn.preprocessing.OneHotEncoder`.
+
+    If all input columns have a `pandas` categorical dtype, the encoder is fitted
+    using only the categories observed in each column, and inputs are encoded
+    directly from the category codes of each column, without comparing the values
+    of individual rows.
     """
 
     def _validate_delegate_estimator(self) -> None:
         if self.native_estimator.sparse:
             raise NotImplementedError("sparse matrices not supported; use sparse=False")
 
+    # noinspection PyPep8Naming
+    def _fit(
+        self, X: pd.DataFrame, y: Optional[pd.Series], **fit_params
+    ) -> OneHotEncoder:
+        if not fit_params and _fit_categorical_encoder(self.native_estimator, X):
+            return self.native_estimator
+        else:
+            return super()._fit(X, y, **fit_params)
+
+    # noinspection PyPep8Naming
+    def _fit_transform(
+        self, X: pd.DataFrame, y: Optional[pd.Series], **fit_params
+    ) -> np.ndarray:
+        if not fit_params and _fit_categorical_encoder(self.native_estimator, X):
+            return self._transform(X)
+        else:
+            return super()._fit_transform(X, y, **fit_params)
+
+    # noinspection PyPep8Naming
+    def _transform(self, X: pd.DataFrame) -> np.ndarray:
+        native_encoder: OneHotEncoder = self.native_estimator
+        X = self._convert_X_for_delegate(X)
+
+        category_indices = _encode_categorical(native_encoder, X)
+        if category_indices is None:
+            return super()._transform(X)
+
+        # map the index of each category to its output column, or to -1 for
+        # dropped categories
+        drop_idx = getattr(native_encoder, "drop_idx_", None)
+        output_columns: List[np.ndarray] = []
+        n_columns = 0
+        for i, categories in enumerate(native_encoder.categories_):
+            category_columns = np.arange(len(categories))
+            drop = None if drop_idx is None else drop_idx[i]
+            if drop is not None:
+                category_columns[drop] = -1
+                category_columns[drop + 1 :] -= 1
+            output_columns.append(
+                np.where(category_columns < 0, -1, category_columns + n_columns)
+            )
+            n_columns += len(categories) - (drop is not None)
+
+        transformed = np.zeros((len(X), n_columns), dtype=native_encoder.dtype)
+
+        rows = np.arange(len(X))
+        for indices, category_columns in zip(category_indices.T, output_columns):
+            # unknown categories and dropped categories are encoded as all zeros
+            columns = np.where(indices < 0, -1, category_columns[indices])
+            is_encoded = columns >= 0
+            transformed[rows[is_encoded], columns[is_encoded]] = 1
+
+        return transformed
+
     def _get_features_original(self) -> pd.Series:
         # Return the series mapping output column names to original column names.
         #
@@ -461,6 +922,51 @@ class OneHotEncoderWrapperDF(TransformerWrapperDF[OneHotEncoder], metaclass=ABCM
 
         return pd.Series(index=feature_names_out, data=feature_names_in)
 
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        return self._get_features_in_required_by_lineage(features_out)
+
+
+class OrdinalEncoderWrapperDF(
+    ColumnPreservingTransformerWrapperDF[OrdinalEncoder], metaclass=ABCMeta
+):
+    """
+    DF wrapper for :class:`sklearn.preprocessing.OrdinalEncoder`.
+
+    If all input columns have a `pandas` categorical dtype, the encoder is fitted
+    using only the categories observed in each column, and inputs are encoded
+    directly from the category codes of each column, without comparing the values
+    of individual rows.
+    """
+
+    # noinspection PyPep8Naming
+    def _fit(
+        self, X: pd.DataFrame, y: Optional[pd.Series], **fit_params
+    ) -> OrdinalEncoder:
+        if not fit_params and _fit_categorical_encoder(self.native_estimator, X):
+            return self.native_estimator
+        else:
+            return super()._fit(X, y, **fit_params)
+
+    # noinspection PyPep8Naming
+    def _fit_transform(
+        self, X: pd.DataFrame, y: Optional[pd.Series], **fit_params
+    ) -> np.ndarray:
+        if not fit_params and _fit_categorical_encoder(self.native_estimator, X):
+            return self._transform(X)
+        else:
+            return super()._fit_transform(X, y, **fit_params)
+
+    # noinspection PyPep8Naming
+    def _transform(self, X: pd.DataFrame) -> np.ndarray:
+        native_encoder: OrdinalEncoder = self.native_estimator
+        X = self._convert_X_for_delegate(X)
+
+        category_indices = _encode_categorical(native_encoder, X)
+        if category_indices is None:
+            return super()._transform(X)
+        else:
+            return category_indices.astype(native_encoder.dtype)
+
 
 class KBinsDiscretizerWrapperDF(
     TransformerWrapperDF[KBinsDiscretizer], metaclass=ABCMeta
@@ -507,6 +1013,171 @@ class KBinsDiscretizerWrapperDF(
                 f"unexpected value for property encode={self.native_estimator.encode}"
             )
 
+    def _get_features_in_required(self, features_out: pd.Index) -> pd.Index:
+        return self._get_features_in_required_by_lineage(features_out)
+
+
+#
+# private helper functions
+#
+
+
+def _column_key(column: Any) -> Any:
+    # a hashable key for the given column selection of a native column transformer
+    if isinstance(column, (list, tuple, pd.Index)):
+        column = tuple(column)
+    try:
+        hash(column)
+    except TypeError:
+        return id(column)
+    return column
+
+
+# noinspection PyPep8Naming
+def _select_columns(X: Any, column: Any) -> Any:
+    # select the given columns, as the native column transformer does
+    if __sklearn_version__ >= __sklearn_0_22__:
+        from sklearn.utils import _safe_indexing
+
+        return _safe_indexing(X, column, axis=1)
+    else:
+        # noinspection PyProtectedMember
+        from sklearn.compose._column_transformer import _get_column
+
+        return _get_column(X, column)
+
+
+# noinspection PyPep8Naming
+def _column_block(X: pd.DataFrame, columns: pd.Index) -> pd.DataFrame:
+    # select the given columns; adjacent columns are selected as a slice, so that
+    # the block is a view of the data frame if the columns share a common dtype
+    positions: np.ndarray = X.columns.get_indexer(columns)
+    n = len(positions)
+    if (
+        n > 0
+        and positions[0] >= 0
+        and (positions == np.arange(positions[0], positions[0] + n)).all()
+    ):
+        return X.iloc[:, positions[0] : positions[0] + n]
+    else:
+        return X.loc[:, columns]
+
+
+# noinspection PyPep8Naming
+def _categorical_columns(X: pd.DataFrame) -> Optional[List[pd.Categorical]]:
+    # the columns of the given data frame as categorical arrays, or None if not all
+    # columns are categorical or any column has missing values
+    if X.shape[1] == 0 or not all(
+        pd.api.types.is_categorical_dtype(dtype) for dtype in X.dtypes
+    ):
+        return None
+
+    columns = [X.iloc[:, i].values for i in range(X.shape[1])]
+    if any((column.codes < 0).any() for column in columns):
+        return None
+
+    return columns
+
+
+# noinspection PyPep8Naming
+def _fit_categorical_encoder(
+    native_encoder: Union[OneHotEncoder, OrdinalEncoder], X: pd.DataFrame
+) -> bool:
+    # fit the given encoder with the categories observed in each column of the given
+    # data frame, if all its columns are categorical; return True if the encoder was
+    # fitted, or False if the encoder needs to be fitted with the data frame itself
+
+    columns = _categorical_columns(X)
+    if columns is None or len(X) == 0:
+        return False
+
+    observed = [
+        np.asarray(column.categories)[
+            np.bincount(column.codes, minlength=len(column.categories)) > 0
+        ]
+        for column in columns
+    ]
+
+    # repeat the observed categories to get columns of equal length; the native
+    # encoder determines the same categories as for the full data frame
+    n_rows = max(len(categories) for categories in observed)
+    native_encoder.fit(
+        pd.DataFrame(
+            {
+                name: np.resize(categories, n_rows)
+                for name, categories in zip(X.columns, observed)
+            },
+            columns=X.columns,
+        )
+    )
+
+    return True
+
+
+# noinspection PyPep8Naming
+def _encode_categorical(
+    native_encoder: Union[OneHotEncoder, OrdinalEncoder], X: pd.DataFrame
+) -> Optional[np.ndarray]:
+    # get the index of each value of the given data frame in the fitted categories
+    # of its column, using the category codes of the column; unknown values get
+    # index -1 if the encoder ignores them;
+    # return None if the data frame must be encoded by the native encoder
+
+    columns = _categorical_columns(X)
+    if columns is None:
+        return None
+
+    category_indices = np.empty(X.shape, dtype=np.intp)
+
+    for i, (column, categories) in enumerate(zip(columns, native_encoder.categories_)):
+        category_indices[:, i] = pd.Index(categories).get_indexer(column.categories)[
+            column.codes
+        ]
+
+    if (
+        getattr(native_encoder, "handle_unknown", "error") != "ignore"
+        and (category_indices < 0).any()
+    ):
+        # let the native encoder raise an exception for the unknown categories
+        return None
+
+    return category_indices
+
+
+def _prune_column_wise_transformer(
+    transformer: TransformerWrapperDF, features_in: pd.Index
+) -> Optional[TransformerWrapperDF]:
+    # restrict a fitted column-wise transformer to a subset of its input columns,
+    # or return None if the fitted state of the native transformer is unknown
+
+    native_transformer = transformer.native_estimator
+    attributes = _COLUMN_WISE_ATTRIBUTES.get(type(native_transformer), None)
+    if attributes is None:
+        return None
+
+    mask: np.ndarray = transformer.feature_names_in_.isin(features_in)
+    pruned_transformer = deepcopy(native_transformer)
+
+    for attribute in attributes:
+        value = getattr(native_transformer, attribute, None)
+        if isinstance(value, list):
+            value = [item for item, keep in zip(value, mask) if keep]
+        elif isinstance(value, np.ndarray) and value.ndim == 1:
+            value = value[mask]
+        else:
+            # not fitted per column, e.g., n_samples_seen_ for dense input
+            continue
+        setattr(pruned_transformer, attribute, value)
+
+    if hasattr(native_transformer, "n_features_in_"):
+        pruned_transformer.n_features_in_ = int(mask.sum())
+
+    return type(transformer).from_fitted(
+        estimator=pruned_transformer,
+        features_in=transformer.feature_names_in_[mask],
+        n_outputs=transformer.n_outputs_,
+    )
+
 
 #
 # validate __all__
@@ -12,8 +12,11 @@ In many cases, creating a DF classifier or regressor is as simple as
 For more advanced examples, including the use of custom wrapper classes, see the many
 examples in modules
 :mod:`sklearndf.transformation`,
-:mod:`sklearndf.classification`, and
+:mod:`sklearndf.classification`,
+:mod:`sklearndf.clustering`, and
 :mod:`sklearndf.regression`.
 """
 
+from ._hist_gradient_boosting import *
+from ._lgbm import *
 from ._wrapper import *
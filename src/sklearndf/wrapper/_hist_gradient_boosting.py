@@ -0,0 +1,353 @@
+"""
+Wrapper support for scikit-learn's histogram-based gradient boosting learners, with
+early stopping on validation data frames and a cap on OpenMP threads.
+"""
+
+import logging
+import threading
+from abc import ABCMeta
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+from joblib import effective_n_jobs
+from sklearn.base import ClassifierMixin, RegressorMixin
+
+from pytools.api import AllTracker, inheritdoc
+
+from ._wrapper import LearnerWrapperDF
+
+log = logging.getLogger(__name__)
+
+__all__ = ["HistGradientBoostingWrapperDF"]
+
+
+#
+# type variables
+#
+
+T_NativeLearner = TypeVar("T_NativeLearner", RegressorMixin, ClassifierMixin)
+
+
+#
+# constants
+#
+
+_PARAM_CATEGORICAL_FEATURES = "categorical_features"
+
+
+#
+# Ensure all symbols introduced below are included in __all__
+#
+
+__tracker = AllTracker(globals())
+
+
+#
+# Class definitions
+#
+
+
+@inheritdoc(match="[see superclass]")
+class HistGradientBoostingWrapperDF(
+    LearnerWrapperDF[T_NativeLearner], Generic[T_NativeLearner], metaclass=ABCMeta
+):
+    """
+    Abstract base class of DF wrappers for scikit-learn's histogram-based gradient
+    boosting learners.
+
+    These learners support additional fit parameters:
+
+    - ``eval_set``: a validation set for early stopping, as a tuple of a data frame
+      with the validation inputs and a series with the validation outputs, or as a
+      list with a single such tuple, consistent with LightGBM learners and the
+      early stopping support of :class:`.LearnerPipelineDF`; the columns of the
+      validation inputs are matched with the training inputs by name.
+      The validation set takes the place of the validation data that is otherwise
+      split off the training data, and parameter ``validation_fraction`` is ignored.
+      Early stopping must not be disabled: it is enabled if learner parameter
+      ``early_stopping`` is ``"auto"``, and for scikit-learn versions before 0.23
+      it requires learner parameter ``n_iter_no_change`` to be set
+    - ``eval_sample_weight``: sample weights for the validation set, as a list with
+      a single series
+    - ``n_jobs``: the maximum number of OpenMP threads used by this learner, for
+      fitting and for all subsequent predictions, following the joblib convention
+      for negative values; ``None`` to not limit the number of threads
+
+    Categorical features may be identified by column name in learner parameter
+    ``categorical_features``, for all scikit-learn versions with native support for
+    categorical features; names are translated to column positions when fitting.
+    """
+
+    # the maximum number of OpenMP threads set when fitting this learner
+    _n_jobs: Optional[int] = None
+
+    # noinspection PyPep8Naming
+    def predict(
+        self, X: pd.DataFrame, **predict_params: Any
+    ) -> Union[pd.Series, pd.DataFrame]:
+        """[see superclass]"""
+        with self._limit_threads():
+            return super().predict(X, **predict_params)
+
+    # noinspection PyPep8Naming
+    def score(
+        self, X: pd.DataFrame, y: pd.Series, sample_weight: Optional[pd.Series] = None
+    ) -> float:
+        """[see superclass]"""
+        with self._limit_threads():
+            return super().score(X, y, sample_weight)
+
+    def _limit_threads(self) -> ContextManager[None]:
+        # limit the number of OpenMP threads to the number set when fitting
+        return _openmp_threads_limited(self._n_jobs)
+
+    # noinspection PyPep8Naming
+    def _fit(
+        self,
+        X: pd.DataFrame,
+        y: Any,
+        eval_set: Optional[Union[Tuple[Any, Any], Sequence[Tuple[Any, Any]]]] = None,
+        eval_sample_weight: Optional[Sequence[Optional[pd.Series]]] = None,
+        n_jobs: Optional[int] = None,
+        **fit_params: Any,
+    ) -> T_NativeLearner:
+        if eval_set is not None:
+            X_val, y_val, sample_weight_val = self._get_validation_set(
+                X, eval_set, eval_sample_weight
+            )
+        elif eval_sample_weight is not None:
+            raise ValueError("fit parameter eval_sample_weight requires an eval_set")
+
+        self._n_jobs = n_jobs
+
+        with self._limit_threads(), self._categorical_features_by_position(X):
+            if eval_set is None:
+                return super()._fit(X, y, **fit_params)
+            else:
+                return self._fit_with_validation_split(
+                    X, y, X_val, y_val, sample_weight_val, **fit_params
+                )
+
+    # noinspection PyPep8Naming
+    def _fit_with_validation_split(
+        self,
+        X: pd.DataFrame,
+        y: pd.Series,
+        X_val: pd.DataFrame,
+        y_val: pd.Series,
+        sample_weight_val: Optional[pd.Series],
+        **fit_params: Any,
+    ) -> T_NativeLearner:
+        # scikit-learn only supports early stopping on validation data split off the
+        # training data; we append the validation set to the training data, and
+        # split it off again in place of the random split
+        native = self.native_estimator
+        params = native.get_params()
+
+        # the validation data is only split off if early stopping is enabled;
+        # otherwise the learner would be trained on the validation set
+        early_stopping = params.get("early_stopping")
+        if early_stopping is None:
+            # before scikit-learn 0.23, early stopping depends on n_iter_no_change
+            if not params["n_iter_no_change"]:
+                raise ValueError(
+                    "fit parameter eval_set requires early stopping, but learner "
+                    "parameter n_iter_no_change is not set"
+                )
+        elif early_stopping is False:
+            raise ValueError(
+                "fit parameter eval_set requires early stopping, but learner "
+                "parameter early_stopping is False"
+            )
+
+        sample_weight = fit_params.get("sample_weight")
+        if sample_weight is not None or sample_weight_val is not None:
+            fit_params["sample_weight"] = np.concatenate(
+                [
+                    np.ones(len(X)) if sample_weight is None else sample_weight,
+                    np.ones(len(X_val))
+                    if sample_weight_val is None
+                    else sample_weight_val,
+                ]
+            )
+
+        split_params = dict(validation_fraction=len(X_val) / (len(X) + len(X_val)))
+        if early_stopping == "auto":
+            split_params.update(early_stopping=True)
+
+        native.set_params(**split_params)
+        try:
+            with _validation_split_off(n_train=len(X)):
+                return super()._fit(
+                    pd.concat([X, X_val]),
+                    pd.concat([y, pd.Series(np.asarray(y_val), name=y.name)]),
+                    **fit_params,
+                )
+        finally:
+            native.set_params(**{name: params[name] for name in split_params})
+
+    # noinspection PyPep8Naming
+    def _get_validation_set(
+        self,
+        X: pd.DataFrame,
+        eval_set: Union[Tuple[Any, Any], Sequence[Tuple[Any, Any]]],
+        eval_sample_weight: Optional[Sequence[Optional[pd.Series]]],
+    ) -> Tuple[pd.DataFrame, Any, Optional[pd.Series]]:
+        if isinstance(eval_set, tuple):
+            eval_set = [eval_set]
+        if len(eval_set) != 1:
+            raise ValueError(
+                "fit parameter eval_set must contain exactly one validation set, "
+                f"but got {len(eval_set)}"
+            )
+        X_val, y_val = eval_set[0]
+
+        if eval_sample_weight is None:
+            sample_weight_val = None
+        elif len(eval_sample_weight) != 1:
+            raise ValueError(
+                "fit parameter eval_sample_weight must contain exactly one series of "
+                f"sample weights, but got {len(eval_sample_weight)}"
+            )
+        else:
+            (sample_weight_val,) = eval_sample_weight
+
+        if not isinstance(X_val, pd.DataFrame):
+            raise TypeError(
+                "validation inputs in fit parameter eval_set must be a DataFrame, "
+                f"but got a {type(X_val).__name__}"
+            )
+        missing = X.columns.difference(X_val.columns)
+        if len(missing) > 0:
+            raise ValueError(
+                "validation inputs in fit parameter eval_set are missing columns: "
+                f"{', '.join(map(str, missing))}"
+            )
+        if not X_val.columns.equals(X.columns):
+            X_val = X_val.loc[:, X.columns]
+
+        return X_val, y_val, sample_weight_val
+
+    # noinspection PyPep8Naming
+    @contextmanager
+    def _categorical_features_by_position(self, X: pd.DataFrame) -> Iterator[None]:
+        # temporarily translate categorical features given by column name to column
+        # positions, since scikit-learn does not support names
+        native = self.native_estimator
+        categorical_features = native.get_params().get(_PARAM_CATEGORICAL_FEATURES)
+
+        if (
+            categorical_features is None
+            or isinstance(categorical_features, str)
+            or not all(isinstance(feature, str) for feature in categorical_features)
+        ):
+            yield
+            return
+
+        positions = X.columns.get_indexer(categorical_features)
+        if (positions < 0).any():
+            raise ValueError(
+                "categorical features not found in input columns: "
+                + ", ".join(
+                    feature
+                    for feature, position in zip(categorical_features, positions)
+                    if position < 0
+                )
+            )
+
+        native.set_params(**{_PARAM_CATEGORICAL_FEATURES: positions.tolist()})
+        try:
+            yield
+        finally:
+            native.set_params(**{_PARAM_CATEGORICAL_FEATURES: categorical_features})
+
+
+#
+# private helper functions
+#
+
+# thread-local number of training samples preceding the validation samples, set
+# while fitting with a validation set
+_local = threading.local()
+
+# function train_test_split of the gradient boosting module is redirected while at
+# least one learner is being fitted with a validation set, in any thread
+_split_lock = threading.Lock()
+_split_n_fitting = 0
+_split_original: Optional[Callable[..., List[Any]]] = None
+
+
+def _train_test_split(*arrays: Any, **kwargs: Any) -> List[Any]:
+    # split off the trailing samples if requested in the current thread, otherwise
+    # split as scikit-learn does
+    n_train = getattr(_local, "n_train", None)
+    if n_train is None:
+        return _split_original(*arrays, **kwargs)
+    else:
+        return [
+            split for array in arrays for split in (array[:n_train], array[n_train:])
+        ]
+
+
+@contextmanager
+def _validation_split_off(n_train: int) -> Iterator[None]:
+    # while in this context, learners fitted in the current thread use all but the
+    # first n_train samples as their validation data
+    #
+    # HistGradientBoosting learners split their validation data off the training
+    # data using function train_test_split, so we redirect it in module
+    # gradient_boosting for the duration of this context, and restore it once no
+    # other thread is in this context
+
+    global _split_n_fitting, _split_original
+
+    # noinspection PyProtectedMember
+    from sklearn.ensemble._hist_gradient_boosting import gradient_boosting
+
+    with _split_lock:
+        if _split_n_fitting == 0:
+            _split_original = gradient_boosting.train_test_split
+            gradient_boosting.train_test_split = _train_test_split
+        _split_n_fitting += 1
+
+    previous_n_train = getattr(_local, "n_train", None)
+    _local.n_train = n_train
+    try:
+        yield
+    finally:
+        _local.n_train = previous_n_train
+        with _split_lock:
+            _split_n_fitting -= 1
+            if _split_n_fitting == 0:
+                gradient_boosting.train_test_split = _split_original
+                _split_original = None
+
+
+@contextmanager
+def _openmp_threads_limited(n_jobs: Optional[int]) -> Iterator[None]:
+    # limit the number of OpenMP threads of the current process while in this context
+    if n_jobs is None:
+        yield
+        return
+
+    from threadpoolctl import threadpool_limits
+
+    with threadpool_limits(limits=effective_n_jobs(n_jobs), user_api="openmp"):
+        yield
+
+
+__tracker.validate()
@@ -0,0 +1,759 @@
+"""
+Wrapper support for LightGBM learners, caching the datasets constructed by LightGBM
+across fits.
+"""
+
+import hashlib
+import inspect
+import logging
+import os
+import threading
+import uuid
+from abc import ABCMeta
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from weakref import WeakValueDictionary
+
+import numpy as np
+import pandas as pd
+from packaging.version import parse as parse_version
+from sklearn.base import ClassifierMixin, RegressorMixin
+
+from pytools.api import AllTracker
+
+from ._wrapper import LearnerWrapperDF
+
+log = logging.getLogger(__name__)
+
+__all__ = ["LGBMDatasetCache", "LGBMWrapperDF"]
+
+
+#
+# type variables
+#
+
+T_Self = TypeVar("T_Self")
+T_NativeLearner = TypeVar("T_NativeLearner", RegressorMixin, ClassifierMixin)
+
+
+#
+# constants
+#
+
+# supported data files
+_FORMAT_PARQUET = "parquet"
+_FORMAT_CSV = "CSV"
+_FORMAT_BINARY = "binary"
+_SUFFIXES_PARQUET = {".parquet", ".pq"}
+_SUFFIXES_CSV = {".csv", ".tsv", ".txt"}
+_SUFFIXES_BINARY = {".bin"}
+
+# parquet files are streamed into LightGBM as a lightgbm.Sequence
+_LIGHTGBM_VERSION_PARQUET = "3.3"
+
+# LightGBM parameters that determine the construction of a dataset, including their
+# aliases; datasets are only shared between fits with the same values for these
+# parameters, since LightGBM rejects changes to them once a dataset is constructed
+_DATASET_PARAMS = frozenset(
+    {
+        # binning
+        "max_bin",
+        "max_bins",
+        "max_bin_by_feature",
+        "min_data_in_bin",
+        "bin_construct_sample_cnt",
+        "subsample_for_bin",
+        "forcedbins_filename",
+        # sampling for the bins
+        "data_random_seed",
+        "data_seed",
+        "seed",
+        "random_seed",
+        "random_state",
+        # feature handling
+        "categorical_feature",
+        "cat_feature",
+        "categorical_column",
+        "cat_column",
+        "categorical_features",
+        "is_enable_sparse",
+        "is_sparse",
+        "enable_sparse",
+        "sparse",
+        "enable_bundle",
+        "is_enable_bundle",
+        "bundle",
+        "use_missing",
+        "zero_as_missing",
+        "linear_tree",
+        "linear_trees",
+        # features are pre-filtered based on the minimum leaf size
+        "feature_pre_filter",
+        "min_data_in_leaf",
+        "min_data_per_leaf",
+        "min_data",
+        "min_child_samples",
+        "min_samples_leaf",
+        "min_sum_hessian_in_leaf",
+        "min_sum_hessian_per_leaf",
+        "min_sum_hessian",
+        "min_hessian",
+        "min_child_weight",
+        # data loading
+        "two_round",
+        "two_round_loading",
+        "use_two_round_loading",
+        "pre_partition",
+        "is_pre_partition",
+        "precise_float_parser",
+    }
+)
+
+# fit parameters of LightGBM learners that determine the construction of a dataset;
+# LightGBM 3 passes these to the training function rather than to the dataset
+_DATASET_FIT_PARAMS = ("categorical_feature", "feature_name")
+
+
+#
+# Ensure all symbols introduced below are included in __all__
+#
+
+__tracker = AllTracker(globals())
+
+
+#
+# Class definitions
+#
+
+
+class LGBMDatasetCache:
+    """
+    A cache of LightGBM datasets, for reuse across fits of LightGBM learners with the
+    same training data.
+
+    LightGBM constructs a :class:`lightgbm.Dataset` from the training data in each
+    fit, mapping all feature values to histogram bins; for small to medium-sized
+    models this can take as long as the training itself.
+    When a cache is passed to the ``fit`` method of an LGBM learner as fit parameter
+    ``dataset_cache``, e.g., ``LGBMRegressorDF().fit(X, y, dataset_cache=cache)``,
+    the constructed training dataset is stored in the cache and reused by
+    subsequent fits with the same data and dataset parameters, e.g., for other
+    hyperparameter candidates on the same cross-validation fold.
+
+    Datasets are identified by a fingerprint of the training data, outputs, sample
+    weights, groups, and initial scores, and by all LightGBM parameters relevant to
+    the construction of the dataset, e.g., ``max_bin`` or ``min_data_in_bin``
+    (LightGBM also pre-filters features using ``min_child_samples`` unless
+    ``feature_pre_filter`` is ``False``).
+
+    The cache evicts the least recently used datasets once their estimated memory use
+    exceeds ``max_bytes``.
+    Datasets are not shared between processes: when a cache is passed to parallel
+    worker processes, each process maintains its own cache with the same identity,
+    which persists across tasks for the lifetime of the process.
+    Fits with an initial model (fit parameter ``init_model``) do not use the cache.
+    """
+
+    def __init__(self, max_bytes: int = 1 << 30) -> None:
+        """
+        :param max_bytes: the maximum estimated memory use of all cached datasets,
+            in bytes (default: 1 GiB)
+        """
+        if max_bytes < 0:
+            raise ValueError(f"arg max_bytes must not be negative: {max_bytes}")
+        self._init(max_bytes=max_bytes, cache_id=uuid.uuid4().hex)
+        _caches[self._cache_id] = self
+
+    @property
+    def max_bytes(self) -> int:
+        """
+        The maximum estimated memory use of all cached datasets, in bytes.
+        """
+        return self._max_bytes
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The estimated memory use of all cached datasets, in bytes.
+        """
+        return sum(nbytes for _, nbytes in self._entries.values())
+
+    @property
+    def hits(self) -> int:
+        """
+        The number of fits that reused a cached dataset.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        The number of fits that constructed a new dataset.
+        """
+        return self._misses
+
+    def clear(self) -> None:
+        """
+        Remove all datasets from this cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __reduce__(self) -> Tuple[Callable[..., "LGBMDatasetCache"], Tuple[Any, ...]]:
+        # datasets cannot be pickled; unpickling resolves to the cache with the same
+        # identity in the current process
+        return _get_cache, (self._cache_id, self._max_bytes)
+
+    def _init(self, max_bytes: int, cache_id: str) -> None:
+        self._max_bytes = max_bytes
+        self._cache_id = cache_id
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _get_dataset(
+        self,
+        dataset_type: type,
+        *args,
+        fit_params: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Any:
+        arguments = _bind_dataset_arguments(dataset_type, *args, **kwargs)
+
+        # construct the dataset with the categorical features and feature names
+        # given as fit parameters, so that they are part of the key, and training
+        # does not need to change them once the dataset is constructed
+        for name, value in (fit_params or {}).items():
+            if arguments[name] == "auto":
+                arguments[name] = value
+
+        if arguments.get("reference") is not None:
+            return dataset_type(**arguments)
+
+        try:
+            fingerprint = _fingerprint(
+                arguments.get(name)
+                for name in (
+                    "data",
+                    "label",
+                    "weight",
+                    "group",
+                    "init_score",
+                    "position",
+                )
+            )
+        except TypeError:
+            # unsupported data type, e.g., a sparse matrix
+            return dataset_type(**arguments)
+
+        params = arguments["params"] or {}
+        key = (
+            fingerprint,
+            repr(arguments["categorical_feature"]),
+            repr(arguments["feature_name"]),
+            tuple(
+                sorted(
+                    (name, repr(value))
+                    for name, value in params.items()
+                    if name in _DATASET_PARAMS
+                )
+            ),
+        )
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        # LightGBM only accepts a changed list of categorical features for datasets
+        # that keep their raw data; we keep the raw data only if we need to
+        keep_raw_data = arguments["categorical_feature"] != "auto"
+        arguments["free_raw_data"] = not keep_raw_data
+        dataset = dataset_type(**arguments).construct()
+
+        nbytes = _estimate_dataset_nbytes(dataset, params)
+        if keep_raw_data:
+            nbytes += _estimate_data_nbytes(arguments["data"])
+
+        if nbytes <= self._max_bytes:
+            with self._lock:
+                self._entries[key] = (dataset, nbytes)
+                self._entries.move_to_end(key)
+                while self.nbytes > self._max_bytes:
+                    evicted_key, _ = self._entries.popitem(last=False)
+                    log.debug(f"evicted LightGBM dataset {evicted_key[0]} from cache")
+
+        return dataset
+
+
+class LGBMWrapperDF(
+    LearnerWrapperDF[T_NativeLearner], Generic[T_NativeLearner], metaclass=ABCMeta
+):
+    """
+    Abstract base class of DF wrappers for LightGBM learners.
+
+    LightGBM learners support an additional fit parameter ``dataset_cache`` to reuse
+    datasets constructed by LightGBM across fits (see :class:`.LGBMDatasetCache`),
+    and can be fitted to data files that do not fit into memory as a data frame,
+    using :meth:`.fit_from_file`.
+    """
+
+    def fit_from_file(
+        self: T_Self,
+        path: Union[str, "os.PathLike[str]"],
+        *,
+        label: Optional[str] = None,
+        weight: Optional[str] = None,
+        **fit_params: Any,
+    ) -> T_Self:
+        """
+        Fit this learner to the training data in the given file, without loading the
+        data into a data frame.
+
+        Supported files are
+
+        - parquet files (``.parquet``, ``.pq``), which are read one row group at a
+          time; all columns other than the label and weight columns are features;
+          requires LightGBM 3.3 or later
+        - CSV files with a header (``.csv``, ``.tsv``, ``.txt``), which are loaded by
+          LightGBM's native parser; all columns other than the label column are
+          features
+        - binary LightGBM datasets (``.bin``) saved using
+          :meth:`lightgbm.Dataset.save_binary`, which include the outputs and sample
+          weights
+
+        The features, outputs, and sample weights are streamed into a LightGBM
+        dataset; only the outputs and sample weights are loaded into memory in
+        full, to be validated and label-encoded as for a regular fit.
+
+        Once fitted, the learner behaves as if fitted to a data frame with the
+        features in the file, e.g., :attr:`.feature_names_in_` lists the feature
+        columns in the order they appear in the file.
+
+        :param path: the path to the data file
+        :param label: the name of the output column; required for parquet and CSV
+            files, and not supported for binary datasets
+        :param weight: the name of an optional column with sample weights; only
+            supported for parquet files
+        :param fit_params: additional fit parameters, as for :meth:`.fit`
+        :return: ``self``
+        """
+
+        self: LGBMWrapperDF  # support type hinting in PyCharm
+
+        if "dataset_cache" in fit_params:
+            raise ValueError("fit parameter dataset_cache is not supported for files")
+
+        data_file = _DataFile(path, label=label, weight=weight)
+
+        if data_file.weight is not None:
+            if "sample_weight" in fit_params:
+                raise ValueError(
+                    "fit parameter sample_weight is not supported for files with a "
+                    "weight column"
+                )
+            fit_params["sample_weight"] = data_file.weight
+
+        with _serve_training_dataset(data_file.get_dataset):
+            return self.fit(
+                # the inputs are only used for their columns, to record the features
+                pd.DataFrame(columns=data_file.feature_names, dtype=np.float64),
+                data_file.label,
+                **fit_params,
+            )
+
+    # noinspection PyPep8Naming
+    def _fit(
+        self,
+        X: pd.DataFrame,
+        y: Any,
+        dataset_cache: Optional[LGBMDatasetCache] = None,
+        **fit_params: Any,
+    ) -> T_NativeLearner:
+        if dataset_cache is None or fit_params.get("init_model") is not None:
+            return super()._fit(X, y, **fit_params)
+
+        if not isinstance(dataset_cache, LGBMDatasetCache):
+            raise TypeError(
+                "fit parameter dataset_cache must be an LGBMDatasetCache, but got a "
+                f"{type(dataset_cache).__name__}"
+            )
+
+        # noinspection PyProtectedMember
+        with _serve_training_dataset(
+            partial(
+                dataset_cache._get_dataset,
+                fit_params={
+                    name: fit_params[name]
+                    for name in _DATASET_FIT_PARAMS
+                    if name in fit_params
+                },
+            )
+        ):
+            return super()._fit(X, y, **fit_params)
+
+
+class _DataFile:
+    # a file with training data for a LightGBM learner, with its feature names, and
+    # its outputs and sample weights loaded into memory
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        label: Optional[str],
+        weight: Optional[str],
+    ) -> None:
+        self.path = os.fspath(path)
+        suffix = os.path.splitext(self.path)[1].lower()
+
+        if suffix in _SUFFIXES_PARQUET:
+            self.file_format = _FORMAT_PARQUET
+        elif suffix in _SUFFIXES_CSV:
+            self.file_format = _FORMAT_CSV
+        elif suffix in _SUFFIXES_BINARY:
+            self.file_format = _FORMAT_BINARY
+        else:
+            raise ValueError(f"unsupported type of data file: {self.path}")
+
+        if self.file_format == _FORMAT_BINARY:
+            if label is not None or weight is not None:
+                raise ValueError(
+                    "args label and weight are not supported for binary datasets, "
+                    "which include their outputs and sample weights"
+                )
+        elif label is None:
+            raise ValueError(f"arg label is required for {self.file_format} files")
+        elif weight is not None and self.file_format == _FORMAT_CSV:
+            raise ValueError("arg weight is not supported for CSV files")
+
+        self.label_name = label
+        self.binary_dataset: Any = None
+
+        if self.file_format == _FORMAT_PARQUET:
+            import lightgbm
+            import pyarrow.parquet as pq
+
+            if parse_version(lightgbm.__version__) < parse_version(
+                _LIGHTGBM_VERSION_PARQUET
+            ):
+                raise RuntimeError(
+                    f"parquet files require LightGBM {_LIGHTGBM_VERSION_PARQUET} or "
+                    f"later, but found LightGBM {lightgbm.__version__}"
+                )
+
+            parquet_file = pq.ParquetFile(self.path)
+            columns: List[str] = parquet_file.schema_arrow.names
+        elif self.file_format == _FORMAT_CSV:
+            # LightGBM detects tab or comma separated values
+            with open(self.path) as f:
+                separator = "\t" if "\t" in f.readline() else ","
+            columns = pd.read_csv(self.path, sep=separator, nrows=0).columns.tolist()
+        else:
+            from lightgbm import Dataset
+
+            # loading a binary dataset does not require binning, so we load it once
+            # and reuse it for training
+            self.binary_dataset = Dataset(
+                self.path, params={"verbose": -1}, free_raw_data=False
+            ).construct()
+            columns = self.binary_dataset.get_feature_name()
+
+        for name in (label, weight):
+            if name is not None and name not in columns:
+                raise ValueError(f"column {name} not found in data file {self.path}")
+
+        self.feature_names: List[str] = [
+            column for column in columns if column not in (label, weight)
+        ]
+
+        self.weight: Optional[pd.Series] = None
+        if self.file_format == _FORMAT_PARQUET:
+            self.label = pd.Series(
+                parquet_file.read(columns=[label]).column(0).to_numpy(), name=label
+            )
+            if weight is not None:
+                self.weight = pd.Series(
+                    parquet_file.read(columns=[weight]).column(0).to_numpy(),
+                    name=weight,
+                )
+        elif self.file_format == _FORMAT_CSV:
+            self.label = pd.read_csv(self.path, sep=separator, usecols=[label])[label]
+        else:
+            self.label = pd.Series(self.binary_dataset.get_label())
+            weight_values = self.binary_dataset.get_weight()
+            if weight_values is not None:
+                self.weight = pd.Series(weight_values)
+
+    def get_dataset(self, dataset_type: type, *args, **kwargs) -> Any:
+        # construct a LightGBM dataset from this file, using the outputs and sample
+        # weights prepared by the learner
+        arguments = _bind_dataset_arguments(dataset_type, *args, **kwargs)
+
+        if self.file_format == _FORMAT_BINARY:
+            dataset = self.binary_dataset
+            dataset.set_label(arguments["label"])
+            if arguments["weight"] is not None:
+                dataset.set_weight(arguments["weight"])
+            return dataset
+
+        elif self.file_format == _FORMAT_PARQUET:
+            _register_sequence_type()
+            arguments["data"] = _ParquetSequence(self.path, self.feature_names)
+            if arguments["feature_name"] == "auto":
+                arguments["feature_name"] = self.feature_names
+
+        else:
+            # LightGBM parses the CSV file, excluding the label column from the
+            # features; the labels themselves are replaced by the prepared outputs
+            arguments["data"] = self.path
+            arguments["params"] = {
+                **(arguments["params"] or {}),
+                "header": True,
+                "label_column": f"name:{self.label_name}",
+            }
+
+        return dataset_type(**arguments)
+
+
+class _ParquetSequence:
+    # random and range access to the feature columns of a parquet file, for
+    # constructing a LightGBM dataset, reading one row group at a time; registered
+    # as a virtual subclass of lightgbm.Sequence
+
+    batch_size = 4096
+
+    def __init__(self, path: str, columns: List[str]) -> None:
+        import pyarrow.parquet as pq
+
+        self._file = pq.ParquetFile(path)
+        self._columns = columns
+        metadata = self._file.metadata
+        self._offsets = np.cumsum(
+            [0]
+            + [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+        )
+        self._row_group: Optional[int] = None
+        self._row_group_values: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    def __getitem__(self, idx: Union[int, slice, List[int]]) -> np.ndarray:
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(len(self))
+            if step != 1:
+                return self[list(range(start, stop, step))]
+            parts = []
+            while start < stop:
+                row_group = self._get_row_group(start)
+                offset = self._offsets[row_group]
+                end = min(stop, self._offsets[row_group + 1])
+                parts.append(
+                    self._read_row_group(row_group)[start - offset : end - offset]
+                )
+                start = end
+            if len(parts) == 1:
+                return parts[0]
+            else:
+                return (
+                    np.concatenate(parts)
+                    if parts
+                    else np.empty((0, len(self._columns)))
+                )
+        elif isinstance(idx, list):
+            return np.array([self[i] for i in idx])
+        else:
+            row_group = self._get_row_group(idx)
+            return self._read_row_group(row_group)[idx - self._offsets[row_group]]
+
+    def _get_row_group(self, row: int) -> int:
+        return int(np.searchsorted(self._offsets, row, side="right")) - 1
+
+    def _read_row_group(self, row_group: int) -> np.ndarray:
+        # rows are accessed in ascending order, so we only keep the last row group
+        if row_group != self._row_group:
+            table = self._file.read_row_group(row_group, columns=self._columns)
+            values = np.empty((table.num_rows, len(self._columns)), dtype=np.float64)
+            for i, column in enumerate(table.columns):
+                values[:, i] = column.to_numpy()
+            self._row_group = row_group
+            self._row_group_values = values
+        return self._row_group_values
+
+
+#
+# private helper functions
+#
+
+# caches in this process, by identity; caches unpickled in a worker process are
+# also held in _worker_caches to keep them alive across tasks
+_caches: "WeakValueDictionary[str, LGBMDatasetCache]" = WeakValueDictionary()
+_worker_caches: Dict[str, LGBMDatasetCache] = {}
+_caches_lock = threading.Lock()
+
+# thread-local dataset factory, set while fitting with a dataset cache or file
+_local = threading.local()
+
+# class Dataset of module lightgbm.sklearn is redirected while at least one learner
+# is being fitted with a dataset cache or file, in any thread
+_factory_lock = threading.Lock()
+_factory_n_fitting = 0
+_factory_original: Optional[type] = None
+_sequence_type_registered = False
+
+
+def _get_cache(cache_id: str, max_bytes: int) -> LGBMDatasetCache:
+    with _caches_lock:
+        cache = _caches.get(cache_id)
+        if cache is None:
+            cache = LGBMDatasetCache.__new__(LGBMDatasetCache)
+            # noinspection PyProtectedMember
+            cache._init(max_bytes=max_bytes, cache_id=cache_id)
+            _caches[cache_id] = cache
+            _worker_caches[cache_id] = cache
+            log.debug(f"created dataset cache {cache_id} in process {os.getpid()}")
+        return cache
+
+
+def _dataset(*args, **kwargs) -> Any:
+    # construct a dataset using the factory of the current thread, if any
+    factory = getattr(_local, "factory", None)
+    if factory is None:
+        return _factory_original(*args, **kwargs)
+    else:
+        return factory(_factory_original, *args, **kwargs)
+
+
+@contextmanager
+def _serve_training_dataset(get_dataset: Callable[..., Any]) -> Iterator[None]:
+    # construct the first dataset in this context, i.e., the training dataset, using
+    # the given function; validation datasets are constructed as usual
+    #
+    # LGBMModel.fit constructs its training dataset internally, so we redirect
+    # dataset construction in module lightgbm.sklearn for the duration of this
+    # context, and restore it once no other thread is in this context
+
+    global _factory_n_fitting, _factory_original
+
+    import lightgbm.sklearn
+
+    previous_factory = getattr(_local, "factory", None)
+    served = False
+
+    def _factory(dataset_type: type, *args, **kwargs) -> Any:
+        nonlocal served
+        if served:
+            return dataset_type(*args, **kwargs)
+        served = True
+        return get_dataset(dataset_type, *args, **kwargs)
+
+    with _factory_lock:
+        if _factory_n_fitting == 0:
+            _factory_original = lightgbm.sklearn.Dataset
+            lightgbm.sklearn.Dataset = _dataset
+        _factory_n_fitting += 1
+
+    _local.factory = _factory
+    try:
+        yield
+    finally:
+        _local.factory = previous_factory
+        with _factory_lock:
+            _factory_n_fitting -= 1
+            if _factory_n_fitting == 0:
+                lightgbm.sklearn.Dataset = _factory_original
+                _factory_original = None
+
+
+def _bind_dataset_arguments(dataset_type: type, *args, **kwargs) -> Dict[str, Any]:
+    # all arguments for constructing a dataset, by name
+    arguments = inspect.signature(dataset_type).bind(*args, **kwargs)
+    arguments.apply_defaults()
+    return dict(arguments.arguments)
+
+
+def _register_sequence_type() -> None:
+    global _sequence_type_registered
+
+    with _factory_lock:
+        if not _sequence_type_registered:
+            from lightgbm import Sequence
+
+            Sequence.register(_ParquetSequence)
+            _sequence_type_registered = True
+
+
+def _fingerprint(arrays: Iterable[Any]) -> str:
+    # a hash of the contents of the given arrays, data frames, or series
+    fingerprint = hashlib.blake2b(digest_size=16)
+
+    for array in arrays:
+        if array is None:
+            fingerprint.update(b"none")
+        elif isinstance(array, (pd.DataFrame, pd.Series)):
+            fingerprint.update(
+                repr(
+                    (
+                        array.shape,
+                        array.columns.tolist()
+                        if isinstance(array, pd.DataFrame)
+                        else array.name,
+                        array.dtypes.tolist()
+                        if isinstance(array, pd.DataFrame)
+                        else array.dtype,
+                    )
+                ).encode()
+            )
+            fingerprint.update(pd.util.hash_pandas_object(array, index=False).values)
+        else:
+            if not isinstance(array, (np.ndarray, list)):
+                raise TypeError(f"cannot fingerprint a {type(array).__name__}")
+            array = np.asarray(array)
+            if array.dtype == object:
+                raise TypeError("cannot fingerprint an object array")
+            fingerprint.update(repr((array.shape, array.dtype.str)).encode())
+            fingerprint.update(np.ascontiguousarray(array).data)
+
+    return fingerprint.hexdigest()
+
+
+def _estimate_dataset_nbytes(dataset: Any, params: Dict[str, Any]) -> int:
+    # LightGBM stores one bin index per value, using the narrowest integer type for
+    # the maximum number of bins
+    max_bin = max(
+        [value for name, value in params.items() if name in ("max_bin", "max_bins")],
+        default=255,
+    )
+    bytes_per_value = 1 if max_bin <= 256 else 2 if max_bin <= 65536 else 4
+    return dataset.num_data() * dataset.num_feature() * bytes_per_value
+
+
+def _estimate_data_nbytes(data: Any) -> int:
+    if isinstance(data, pd.DataFrame):
+        return int(data.memory_usage(index=False).sum())
+    else:
+        return int(getattr(data, "nbytes", 0))
+
+
+__tracker.validate()
@@ -39,6 +39,7 @@ import pandas as pd
 from sklearn.base import (
     BaseEstimator,
     ClassifierMixin,
+    ClusterMixin,
     MetaEstimatorMixin,
     RegressorMixin,
     TransformerMixin,
@@ -47,12 +48,20 @@ from sklearn.base import (
 from pytools.api import AllTracker, inheritdoc, public_module_prefix
 from pytools.meta import compose_meta
 
-from sklearndf import ClassifierDF, EstimatorDF, LearnerDF, RegressorDF, TransformerDF
+from sklearndf import (
+    ClassifierDF,
+    ClusterDF,
+    EstimatorDF,
+    LearnerDF,
+    RegressorDF,
+    TransformerDF,
+)
 
 log = logging.getLogger(__name__)
 
 __all__ = [
     "ClassifierWrapperDF",
+    "ClusterWrapperDF",
     "EstimatorWrapperDF",
     "EstimatorWrapperDFMeta",
     "LearnerWrapperDF",
@@ -61,6 +70,7 @@ __all__ = [
     "StackingEstimatorWrapperDF",
     "TransformerWrapperDF",
     "make_df_classifier",
+    "make_df_clusterer",
     "make_df_estimator",
     "make_df_regressor",
     "make_df_transformer",
@@ -78,6 +88,7 @@ T_NativeTransformer = TypeVar("T_NativeTransformer", bound=TransformerMixin)
 T_NativeLearner = TypeVar("T_NativeLearner", RegressorMixin, ClassifierMixin)
 T_NativeRegressor = TypeVar("T_NativeRegressor", bound=RegressorMixin)
 T_NativeClassifier = TypeVar("T_NativeClassifier", bound=ClassifierMixin)
+T_NativeCluster = TypeVar("T_NativeCluster", bound=ClusterMixin)
 
 # noinspection PyTypeChecker
 T_EstimatorWrapperDF = TypeVar("T_EstimatorWrapperDF", bound="EstimatorWrapperDF")
@@ -567,6 +578,13 @@ class LearnerWrapperDF(
             sample_weight,
         )
 
+    def _ensure_delegate_method(self, method: str) -> None:
+        if not hasattr(self.native_estimator, method):
+            raise NotImplementedError(
+                f"{type(self.native_estimator).__name__} does not implement method "
+                f"{method}"
+            )
+
     # noinspection PyPep8Naming
     def _prediction_to_series_or_frame(
         self, X: pd.DataFrame, y: Union[np.ndarray, pd.Series, pd.DataFrame]
@@ -684,13 +702,6 @@ class ClassifierWrapperDF(
             ),
         )
 
-    def _ensure_delegate_method(self, method: str) -> None:
-        if not hasattr(self.native_estimator, method):
-            raise NotImplementedError(
-                f"{type(self.native_estimator).__name__} does not implement method "
-                f"{method}"
-            )
-
     # noinspection PyPep8Naming
     def _prediction_with_class_labels(
         self,
@@ -724,6 +735,117 @@ class ClassifierWrapperDF(
             raise TypeError(f"unexpected type or prediction result: {type(y).__name__}")
 
 
+@inheritdoc(match="[see superclass]")
+class ClusterWrapperDF(
+    ClusterDF,
+    LearnerWrapperDF[T_NativeCluster],
+    Generic[T_NativeCluster],
+    metaclass=ABCMeta,
+):
+    """
+    Base class of DF wrappers for native clusterers conforming with the scikit-learn
+    API.
+
+    Cluster labels are predicted as a series, indexed by the index of the inputs.
+    Large inputs can be processed in chunks of rows using parameter ``chunk_size`` of
+    method :meth:`.predict`, so that intermediate results of the native clusterer,
+    e.g., the distances of all observations to all cluster centers, never exceed the
+    size of a single chunk.
+
+    Clusterer wrapper classes should be created using function
+    :func:`.make_df_clusterer`.
+    """
+
+    #: Name of :class:`pd.Series` objects containing the cluster labels predicted
+    #: by clusterers.
+    #:
+    #: See :meth:`~.LearnerDF.predict`.
+    COL_PREDICTION = "cluster"
+
+    # noinspection PyPep8Naming
+    def predict(
+        self, X: pd.DataFrame, chunk_size: Optional[int] = None, **predict_params: Any
+    ) -> pd.Series:
+        """
+        Predict the cluster of each observation in the given inputs.
+
+        The inputs must have the same features as the inputs used to fit
+        this clusterer.
+        The features can be provided in any order since they are identified by their
+        column names.
+
+        :param X: input data frame with observations as rows and features as columns
+        :param chunk_size: if given, predict clusters in chunks of at most this many
+            rows
+        :param predict_params: optional keyword parameters as required by specific
+            clusterer implementations
+        :return: the cluster labels per observation as a series
+        """
+        if chunk_size is None:
+            return super().predict(X, **predict_params)
+
+        self._check_parameter_types(X, None)
+
+        return self._prediction_to_series_or_frame(
+            X, self._call_in_chunks("predict", X, chunk_size, **predict_params)
+        )
+
+    # noinspection PyPep8Naming
+    def fit_predict(
+        self,
+        X: pd.DataFrame,
+        y: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        **fit_params: Any,
+    ) -> pd.Series:
+        """[see superclass]"""
+        # bypass the abstract method of ClusterDF, which precedes the learner
+        # wrapper implementation in the method resolution order
+        return LearnerWrapperDF.fit_predict(self, X, y, **fit_params)
+
+    # noinspection PyPep8Naming
+    def score(
+        self,
+        X: pd.DataFrame,
+        y: Optional[pd.Series] = None,
+        sample_weight: Optional[pd.Series] = None,
+    ) -> float:
+        """[see superclass]"""
+
+        self._ensure_delegate_method("score")
+
+        self._check_parameter_types(X, y)
+        if sample_weight is not None and not isinstance(sample_weight, pd.Series):
+            raise TypeError("arg sample_weight must be None or a Series")
+
+        return self.native_estimator.score(
+            self._convert_X_for_delegate(X),
+            self._convert_y_for_delegate(y),
+            sample_weight,
+        )
+
+    # noinspection PyPep8Naming
+    def _call_in_chunks(
+        self, method: str, X: pd.DataFrame, chunk_size: int, **params: Any
+    ) -> np.ndarray:
+        # call the given method of the native clusterer for consecutive chunks of
+        # rows, and concatenate the results
+        if chunk_size < 1:
+            raise ValueError(f"arg chunk_size must be positive but is {chunk_size}")
+
+        native_method = getattr(self.native_estimator, method)
+        X = self._convert_X_for_delegate(X)
+
+        if len(X) <= chunk_size:
+            return native_method(X, **params)
+
+        return np.concatenate(
+            [
+                native_method(X.iloc[start : start + chunk_size], **params)
+                for start in range(0, len(X), chunk_size)
+            ]
+        )
+
+
 #
 # Meta estimator wrappers
 #
@@ -964,6 +1086,39 @@ def make_df_regressor(
     )
 
 
+def make_df_clusterer(
+    native_clusterer: Type[T_NativeEstimator] = None,
+    *,
+    name: Optional[str] = None,
+    base_wrapper: Optional[Type[EstimatorWrapperDF[T_NativeEstimator]]] = None,
+) -> Union[Type[EstimatorWrapperDF[T_NativeEstimator]], T_NativeEstimator]:
+    """
+    Create an augmented version of a given clusterer that conforms with the
+    scikit-learn API.
+
+    The augmented version is realised as a wrapper class that
+
+    - implements enhanced functionality introduced by :class:`.ClusterDF`
+    - adopts all additional methods and attributes from the wrapped native clusterer
+    - delegates relevant method calls and attribute access to the native clusterer,
+      thus replicating the original clusterer's behaviour except for the enhanced
+      functionality introduced by :class:`.ClusterDF`
+
+    :param native_clusterer: the native clusterer to be augmented
+    :param name: the name of the resulting augmented clusterer, defaults to the name
+        of the native clusterer with "DF" appended
+    :param base_wrapper: the wrapper class used to create the augmented version
+    :return: the augmented clusterer class
+    """
+    return _wrap(
+        native_estimator=native_clusterer,
+        name=name,
+        base_wrapper=base_wrapper,
+        native_estimator_bound=ClusterMixin,
+        base_wrapper_bound=ClusterWrapperDF,
+    )
+
+
 #
 # private factory implementation
 #
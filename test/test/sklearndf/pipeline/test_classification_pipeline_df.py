@@ -5,6 +5,7 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import OneHotEncoder
 
 from sklearndf.classification import RandomForestClassifierDF
+from sklearndf.classification.extra import LGBMClassifierDF
 from sklearndf.pipeline import ClassifierPipelineDF
 from test.sklearndf.pipeline import make_simple_transformer
 
@@ -32,3 +33,63 @@ def test_classification_pipeline_df(
         ClassifierPipelineDF(
             classifier=RandomForestClassifier(), preprocessing=OneHotEncoder()
         )
+
+
+def test_classification_pipeline_df_native_categorical(
+    iris_features: pd.DataFrame, iris_target_sr: pd.DataFrame
+) -> None:
+    """ Test passing categorical columns to LightGBM instead of one-hot encoding """
+
+    numeric_columns = iris_features.columns
+    X = iris_features.assign(
+        petal_size=pd.cut(
+            iris_features.iloc[:, 2], bins=5, labels=list("abcde")
+        ).astype(object),
+        sepal_size=pd.cut(iris_features.iloc[:, 0], bins=3, labels=list("xyz")),
+    )
+
+    def _make_pipeline(native_categorical: bool) -> ClassifierPipelineDF:
+        return ClassifierPipelineDF(
+            classifier=LGBMClassifierDF(n_estimators=10, random_state=42),
+            preprocessing=make_simple_transformer(
+                impute_median_columns=numeric_columns,
+                one_hot_encode_columns=["petal_size", "sepal_size"],
+            ),
+            native_categorical=native_categorical,
+        ).fit(X, iris_target_sr)
+
+    pipeline_one_hot = _make_pipeline(native_categorical=False)
+    assert len(pipeline_one_hot.feature_names_out_) == len(numeric_columns) + 8
+
+    pipeline = _make_pipeline(native_categorical=True)
+    assert pipeline.get_params()["native_categorical"]
+
+    features_expected = [*numeric_columns, "petal_size", "sepal_size"]
+    assert pipeline.feature_names_out_.tolist() == features_expected
+    assert pipeline.final_estimator.feature_names_in_.tolist() == features_expected
+    assert pipeline.feature_names_original_.tolist() == features_expected
+    assert pipeline.required_features_in_.equals(X.columns)
+
+    # the learner receives the categorical columns as pandas categoricals
+    X_preprocessed = pipeline._pre_transform(X)
+    assert X_preprocessed.loc[:, "petal_size"].dtype == "category"
+    assert X_preprocessed.loc[:, "sepal_size"].dtype == "category"
+
+    # predictions tolerate reordered columns and unseen categories
+    X_test = X.iloc[:, ::-1].copy()
+    X_test.loc[X_test.index[0], "petal_size"] = "unseen"
+    predictions = pipeline.predict(X_test)
+    assert predictions.index.equals(X.index)
+    assert (predictions.iloc[1:] == pipeline.predict(X).iloc[1:]).all()
+    assert pipeline.predict_proba(X).shape == (len(X), 3)
+
+    # predictions tolerate categorical dtypes that differ from the fitted dtypes,
+    # e.g., for single observations with only their own categories
+    i = int(np.flatnonzero(X.loc[:, "sepal_size"] != X.loc[:, "sepal_size"].iloc[0])[0])
+    X_row = X.iloc[[i]].astype(
+        {
+            column: pd.CategoricalDtype([X.loc[:, column].iloc[i]])
+            for column in ["petal_size", "sepal_size"]
+        }
+    )
+    assert pipeline.predict(X_row).item() == pipeline.predict(X).iloc[i]
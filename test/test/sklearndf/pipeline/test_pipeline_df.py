@@ -18,12 +18,21 @@ from numpy.testing import (
 )
 from sklearn import clone
 from sklearn.base import BaseEstimator, TransformerMixin
-from sklearn.feature_selection import f_classif
+from sklearn.feature_selection import f_classif, f_regression
 
 from sklearndf.classification import SVCDF, LogisticRegressionDF
-from sklearndf.pipeline import PipelineDF
+from sklearndf.pipeline import ClassifierPipelineDF, PipelineDF, RegressorPipelineDF
 from sklearndf.regression import DummyRegressorDF, LassoDF, LinearRegressionDF
-from sklearndf.transformation import SelectKBestDF, SimpleImputerDF
+from sklearndf.transformation import (
+    ColumnTransformerDF,
+    MaxAbsScalerDF,
+    MinMaxScalerDF,
+    OneHotEncoderDF,
+    SelectKBestDF,
+    SimpleImputerDF,
+    StandardScalerDF,
+)
+from sklearndf.transformation.extra import AffineScalerDF
 from sklearndf.transformation.wrapper import ColumnPreservingTransformerWrapperDF
 from sklearndf.wrapper import make_df_estimator, make_df_transformer
 
@@ -200,6 +209,39 @@ def test_pipeline_df_memory(
         shutil.rmtree(cache_dir)
 
 
+def test_pipeline_df_memory_fit_transform_xy(
+    iris_features: pd.DataFrame, iris_target_sr: pd.Series
+) -> None:
+    """ Test memory caching of pipelines used as preprocessing steps """
+
+    cache_dir = mkdtemp()
+
+    try:
+        memory = joblib.Memory(location=cache_dir, verbose=0)
+
+        tx = DummyTransformerDF()
+        classifier_pipeline = ClassifierPipelineDF(
+            preprocessing=PipelineDF([("tx", tx)], memory=memory),
+            classifier=SVCDF(),
+        )
+
+        # the preprocessing pipeline is fitted through fit_transform_xy, caching
+        # a fitted clone of the transformer at the first fit
+        classifier_pipeline.fit(iris_features, iris_target_sr)
+        assert not hasattr(tx, "means_")
+        ts = classifier_pipeline.preprocessing.named_steps["tx"].timestamp_
+        predictions = classifier_pipeline.predict(iris_features)
+
+        # the cached transformer is loaded when fitting a second time
+        classifier_pipeline.fit(iris_features, iris_target_sr)
+        assert ts == classifier_pipeline.preprocessing.named_steps["tx"].timestamp_
+        pd.testing.assert_series_equal(
+            classifier_pipeline.predict(iris_features), predictions
+        )
+    finally:
+        shutil.rmtree(cache_dir)
+
+
 def test_pipeline_df__init() -> None:
     """ Test the various init parameters of the pipeline. """
 
@@ -290,3 +332,186 @@ def test_pipeline_df_raise_set_params_error() -> None:
         pipe.set_params,
         fake__estimator="nope",
     )
+
+
+def test_pipeline_df_prune_features_in(
+    boston_features: pd.DataFrame, boston_target_sr: pd.Series
+) -> None:
+    """ Test required input features and pruning of fitted pipelines """
+
+    pipeline = PipelineDF(
+        [
+            ("impute", SimpleImputerDF()),
+            ("scale", StandardScalerDF()),
+            ("select", SelectKBestDF(score_func=f_regression, k=4)),
+        ]
+    ).fit(boston_features, boston_target_sr)
+
+    required = pipeline.required_features_in_
+    assert len(required) == 4
+    assert required.isin(boston_features.columns).all()
+    assert required.isin(pipeline.feature_names_out_).all()
+
+    pruned = pipeline.prune_features_in()
+    assert pruned.steps[-1][1] == "passthrough"
+    assert pruned.feature_names_in_.equals(required)
+    assert_array_equal(
+        pruned.steps[1][1].mean_,
+        pipeline.steps[1][1].mean_[pipeline.feature_names_in_.isin(required)],
+    )
+    pd.testing.assert_frame_equal(
+        pruned.transform(boston_features.loc[:, required]),
+        pipeline.transform(boston_features),
+    )
+
+    # the original pipeline is left unchanged
+    assert pipeline.feature_names_in_.equals(boston_features.columns)
+
+    # column transformers only require the columns they do not drop, but are not
+    # rewritten when pruning
+    regressor_pipeline = RegressorPipelineDF(
+        preprocessing=ColumnTransformerDF(
+            [
+                ("encode", OneHotEncoderDF(sparse=False), ["CHAS", "RAD"]),
+                ("scale", StandardScalerDF(), ["CRIM", "ZN"]),
+                ("drop", "drop", ["AGE"]),
+            ]
+        ),
+        regressor=LinearRegressionDF(),
+    ).fit(boston_features, boston_target_sr)
+
+    assert set(regressor_pipeline.required_features_in_) == {
+        "CHAS",
+        "RAD",
+        "CRIM",
+        "ZN",
+    }
+    pruned_regressor_pipeline = regressor_pipeline.prune_features_in()
+    assert pruned_regressor_pipeline.feature_names_in_.equals(
+        regressor_pipeline.feature_names_in_
+    )
+    pd.testing.assert_series_equal(
+        pruned_regressor_pipeline.predict(boston_features),
+        regressor_pipeline.predict(boston_features),
+    )
+
+
+def test_pipeline_df_prune_nested_pipeline(
+    boston_features: pd.DataFrame, boston_target_sr: pd.Series
+) -> None:
+    """ Test pruning pipelines nested in pipelines and column transformers """
+
+    # a nested pipeline is pruned to the columns required by the outer pipeline
+    pipeline = PipelineDF(
+        [
+            (
+                "preprocess",
+                PipelineDF(
+                    [("impute", SimpleImputerDF()), ("scale", StandardScalerDF())]
+                ),
+            ),
+            ("select", SelectKBestDF(score_func=f_regression, k=4)),
+        ]
+    ).fit(boston_features, boston_target_sr)
+
+    required = pipeline.required_features_in_
+    assert len(required) == 4
+
+    pruned = pipeline.prune_features_in()
+    assert pruned.feature_names_in_.equals(required)
+    assert pruned.steps[0][1].feature_names_in_.equals(required)
+    assert pruned.steps[-1][1] == "passthrough"
+    pd.testing.assert_frame_equal(
+        pruned.transform(boston_features.loc[:, required]),
+        pipeline.transform(boston_features),
+    )
+
+    # a pipeline nested in a column transformer is pruned to the columns passed
+    # to it, not to the columns it requires itself
+    columns = ["CRIM", "ZN", "INDUS", "NOX"]
+    column_transformer = ColumnTransformerDF(
+        [
+            (
+                "numeric",
+                PipelineDF(
+                    [("impute", SimpleImputerDF()), ("scale", StandardScalerDF())]
+                ),
+                columns,
+            )
+        ]
+    ).fit(boston_features, boston_target_sr)
+    nested = column_transformer.native_estimator.transformers_[0][1]
+    assert nested.required_features_in_.equals(pd.Index(columns))
+
+    features_in = pd.Index(columns[1:])
+    # noinspection PyProtectedMember
+    pruned_nested = nested._prune_features_in(features_in)
+    assert pruned_nested.feature_names_in_.equals(features_in)
+    assert pruned_nested.feature_names_out_.equals(features_in)
+    pd.testing.assert_frame_equal(
+        pruned_nested.transform(boston_features.loc[:, features_in]),
+        nested.transform(boston_features.loc[:, columns]).loc[:, features_in],
+    )
+
+    # columns not passing a feature selection step cannot be kept
+    nested_select = PipelineDF(
+        [
+            ("scale", StandardScalerDF()),
+            ("select", SelectKBestDF(score_func=f_regression, k=2)),
+        ]
+    ).fit(boston_features.loc[:, columns], boston_target_sr)
+    selected = nested_select.feature_names_out_
+    # noinspection PyProtectedMember
+    assert nested_select._prune_features_in(selected).feature_names_out_.equals(
+        selected
+    )
+    # noinspection PyProtectedMember
+    assert nested_select._prune_features_in(pd.Index(columns[:3])) is None
+
+
+def test_pipeline_df_fuse_affine_steps(
+    boston_features: pd.DataFrame, boston_target_sr: pd.Series
+) -> None:
+    """ Test fusing consecutive scaling and imputation steps of fitted pipelines """
+
+    X = boston_features.mask(
+        np.random.RandomState(42).random_sample(boston_features.shape) < 0.1
+    )
+
+    pipeline = PipelineDF(
+        [
+            ("scale", StandardScalerDF()),
+            ("impute", SimpleImputerDF(strategy="median")),
+            ("min_max", MinMaxScalerDF()),
+            ("select", SelectKBestDF(score_func=f_regression, k=5)),
+            ("max_abs", MaxAbsScalerDF()),
+            ("regress", LinearRegressionDF()),
+        ]
+    ).fit(X, boston_target_sr)
+
+    fused = pipeline.fuse_affine_steps(validation_data=X)
+
+    assert [name for name, _ in fused.steps] == [
+        "scale+impute+min_max",
+        "select",
+        "max_abs",
+        "regress",
+    ]
+    assert isinstance(fused.steps[0][1], AffineScalerDF)
+    assert fused.feature_names_out_.equals(pipeline.feature_names_out_)
+
+    expected = X
+    for _, transformer in pipeline.steps[:3]:
+        expected = transformer.transform(expected)
+    pd.testing.assert_frame_equal(fused.steps[0][1].transform(X), expected)
+    pd.testing.assert_series_equal(fused.predict(X), pipeline.predict(X))
+
+    # the original pipeline is left unchanged
+    assert isinstance(pipeline.steps[0][1], StandardScalerDF)
+
+    # scalers that do not center their inputs
+    for scaler in [StandardScalerDF(with_mean=False), StandardScalerDF(with_std=False)]:
+        pipeline = PipelineDF([("scale", scaler), ("min_max", MinMaxScalerDF())]).fit(X)
+        pd.testing.assert_frame_equal(
+            pipeline.fuse_affine_steps().transform(X), pipeline.transform(X)
+        )
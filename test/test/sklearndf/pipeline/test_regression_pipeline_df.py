@@ -1,11 +1,20 @@
 import numpy as np
 import pandas as pd
 import pytest
-from lightgbm import LGBMRegressor
+from lightgbm import LGBMRegressor, early_stopping
+from sklearn.feature_selection import f_regression
 from sklearn.preprocessing import OneHotEncoder
 
-from sklearndf.pipeline import RegressorPipelineDF
+from sklearndf.pipeline import PipelineDF, RegressorPipelineDF
+from sklearndf.regression import LinearRegressionDF, RidgeDF
 from sklearndf.regression.extra import LGBMRegressorDF
+from sklearndf.transformation import (
+    PCADF,
+    MinMaxScalerDF,
+    SelectKBestDF,
+    StandardScalerDF,
+)
+from sklearndf.transformation.extra import DeduplicateDF
 from test.sklearndf.pipeline import make_simple_transformer
 
 
@@ -32,3 +41,120 @@ def test_regression_pipeline_df(
     with pytest.raises(TypeError):
         # noinspection PyTypeChecker
         RegressorPipelineDF(regressor=LGBMRegressor(), preprocessing=OneHotEncoder())
+
+
+def test_regression_pipeline_df_fold_linear(
+    boston_features: pd.DataFrame, boston_target_sr: pd.Series
+) -> None:
+    """ Test folding linear preprocessing into the coefficients of linear models """
+
+    for preprocessing in [
+        StandardScalerDF(),
+        StandardScalerDF(with_mean=False),
+        PipelineDF(
+            [
+                ("scale", MinMaxScalerDF()),
+                ("select", SelectKBestDF(score_func=f_regression, k=8)),
+                ("pca", PCADF(n_components=5, whiten=True)),
+            ]
+        ),
+    ]:
+        for regressor in [LinearRegressionDF(), RidgeDF(alpha=0.5)]:
+            pipeline = RegressorPipelineDF(
+                preprocessing=preprocessing, regressor=regressor
+            ).fit(boston_features, boston_target_sr)
+
+            folded = pipeline.fold_linear()
+
+            assert isinstance(folded, type(regressor))
+            assert folded.feature_names_in_.equals(boston_features.columns)
+            if hasattr(folded.native_estimator, "n_features_in_"):
+                assert folded.native_estimator.n_features_in_ == len(
+                    boston_features.columns
+                )
+            pd.testing.assert_series_equal(
+                folded.predict(boston_features),
+                pipeline.predict(boston_features),
+                check_names=False,
+            )
+
+    with pytest.raises(ValueError):
+        RegressorPipelineDF(
+            preprocessing=StandardScalerDF(), regressor=LGBMRegressorDF()
+        ).fit(boston_features, boston_target_sr).fold_linear()
+
+
+def test_regression_pipeline_df_eval_set(
+    boston_features: pd.DataFrame, boston_target_sr: pd.Series
+) -> None:
+    """ Test early stopping with validation sets passed through the preprocessing """
+
+    n_train = len(boston_features) * 3 // 4
+    X_train = boston_features.iloc[:n_train]
+    y_train = boston_target_sr.iloc[:n_train]
+    # validation inputs with columns in reverse order, to test their alignment
+    X_eval = boston_features.iloc[n_train:, ::-1]
+    y_eval = boston_target_sr.iloc[n_train:]
+
+    pipeline = RegressorPipelineDF(
+        preprocessing=PipelineDF(
+            [
+                ("scale", StandardScalerDF()),
+                ("pca", PCADF(n_components=8)),
+            ]
+        ),
+        regressor=LGBMRegressorDF(n_estimators=1000, random_state=42),
+    ).fit(
+        X_train,
+        y_train,
+        eval_set=[(X_eval, y_eval), (X_train, y_train)],
+        callbacks=[early_stopping(stopping_rounds=5, verbose=False)],
+    )
+
+    # fit the same model, preprocessing the validation set manually
+    X_train_preprocessed = pipeline.preprocessing.transform(X_train)
+    X_eval_preprocessed = pipeline.preprocessing.transform(X_eval)
+    regressor = LGBMRegressorDF(n_estimators=1000, random_state=42).fit(
+        X_train_preprocessed,
+        y_train,
+        eval_set=[(X_eval_preprocessed, y_eval)],
+        callbacks=[early_stopping(stopping_rounds=5, verbose=False)],
+    )
+
+    # LightGBM 3.0 sets attribute best_iteration_ only for early_stopping_rounds
+    best_iteration = pipeline.final_estimator.native_estimator.booster_.best_iteration
+    assert 0 < best_iteration < 1000
+    assert best_iteration == regressor.native_estimator.booster_.best_iteration
+    # the training set is recognised as a validation set
+    assert "training" in pipeline.final_estimator.native_estimator.evals_result_
+    pd.testing.assert_series_equal(
+        pipeline.predict(X_eval), regressor.predict(X_eval_preprocessed)
+    )
+
+    with pytest.raises(ValueError):
+        pipeline.fit(
+            X_train,
+            y_train,
+            eval_set=[(X_eval, y_eval)],
+            eval_sample_weight=[None, None],
+        )
+
+    # the training set as a validation set keeps the counts of the observations
+    # merged by DeduplicateDF as its sample weights
+    X_duplicated = pd.concat([X_train, X_train.iloc[:50]])
+    y_duplicated = pd.concat([y_train, y_train.iloc[:50]])
+    pipeline = RegressorPipelineDF(
+        preprocessing=DeduplicateDF(),
+        regressor=LGBMRegressorDF(n_estimators=10, random_state=42),
+    ).fit(X_duplicated, y_duplicated, eval_set=[(X_duplicated, y_duplicated)])
+
+    training_set_preprocessed = pipeline.preprocessing.fit_transform_xy(
+        X_duplicated, y_duplicated
+    )
+    (weight_eval,) = pipeline._pre_transform_eval_params(
+        {"eval_set": [(X_duplicated, y_duplicated)]},
+        training_set=(X_duplicated, y_duplicated, None),
+        training_set_preprocessed=training_set_preprocessed,
+    )["eval_sample_weight"]
+    assert weight_eval is training_set_preprocessed[2]
+    assert weight_eval.sum() == len(X_duplicated)
@@ -0,0 +1,133 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pytest
+
+from sklearndf.classification import RandomForestClassifierDF
+from sklearndf.regression import RandomForestRegressorDF
+from sklearndf.transformation import StandardScalerDF
+
+
+def test_apredict(boston_features: pd.DataFrame, boston_target_sr: pd.Series) -> None:
+    """ Test asynchronous prediction, with and without micro-batching """
+
+    regressor = RandomForestRegressorDF(n_estimators=10, random_state=42).fit(
+        boston_features, boston_target_sr
+    )
+    expected = regressor.predict(boston_features)
+
+    async def _predict_rows(**kwargs) -> pd.Series:
+        return pd.concat(
+            await asyncio.gather(
+                *(
+                    regressor.apredict(boston_features.iloc[[i]], **kwargs)
+                    for i in range(len(boston_features))
+                )
+            )
+        )
+
+    loop = asyncio.get_event_loop()
+
+    pd.testing.assert_series_equal(
+        loop.run_until_complete(regressor.apredict(boston_features)), expected
+    )
+
+    for batch_kwargs in [{}, dict(max_wait=0.01), dict(max_wait=1, max_batch_size=7)]:
+        pd.testing.assert_series_equal(
+            loop.run_until_complete(_predict_rows(**batch_kwargs)), expected
+        )
+
+    with pytest.raises(TypeError):
+        # noinspection PyTypeChecker
+        loop.run_until_complete(regressor.apredict(boston_features.values))
+
+    # invalid inputs of one call do not fail the other calls in the same batch
+    X_missing_column = boston_features.iloc[[3], 1:]
+    X_invalid_value = boston_features.iloc[[5]].astype(object)
+    X_invalid_value.iloc[0, 0] = "invalid"
+    invalid = {3: X_missing_column, 5: X_invalid_value}
+
+    async def _predict_with_invalid_rows() -> list:
+        return await asyncio.gather(
+            *(
+                regressor.apredict(
+                    invalid.get(i, boston_features.iloc[[i]]),
+                    max_wait=1,
+                    max_batch_size=10,
+                )
+                for i in range(10)
+            ),
+            return_exceptions=True,
+        )
+
+    results = loop.run_until_complete(_predict_with_invalid_rows())
+    valid = [i for i in range(10) if i not in invalid]
+    assert all(isinstance(results[i], ValueError) for i in invalid)
+    pd.testing.assert_series_equal(
+        pd.concat([results[i] for i in valid]), expected.iloc[valid]
+    )
+
+
+def test_apredict_proba(iris_features: pd.DataFrame, iris_target_sr: pd.Series) -> None:
+    """ Test asynchronous, micro-batched prediction of class probabilities """
+
+    classifier = RandomForestClassifierDF(n_estimators=10, random_state=42).fit(
+        iris_features, iris_target_sr
+    )
+    X = iris_features.iloc[:20]
+
+    async def _predict_proba_rows() -> pd.DataFrame:
+        return pd.concat(
+            await asyncio.gather(
+                *(
+                    classifier.apredict_proba(X.iloc[[i]], max_wait=0.01)
+                    for i in range(len(X))
+                )
+            )
+        )
+
+    pd.testing.assert_frame_equal(
+        asyncio.get_event_loop().run_until_complete(_predict_proba_rows()),
+        classifier.predict_proba(X),
+    )
+
+
+def test_atransform(iris_features: pd.DataFrame) -> None:
+    """ Test asynchronous transformation, with and without micro-batching """
+
+    scaler = StandardScalerDF().fit(iris_features)
+    # use a non-default index to test that rows are returned with their own index
+    X = iris_features.iloc[:20].set_axis(range(100, 120), axis=0)
+    expected = scaler.transform(X)
+
+    async def _transform_rows(**kwargs) -> pd.DataFrame:
+        return pd.concat(
+            await asyncio.gather(
+                *(scaler.atransform(X.iloc[[i]], **kwargs) for i in range(len(X)))
+            )
+        )
+
+    loop = asyncio.get_event_loop()
+
+    pd.testing.assert_frame_equal(
+        loop.run_until_complete(scaler.atransform(X)), expected
+    )
+
+    for batch_kwargs in [{}, dict(max_wait=0.01), dict(max_wait=1, max_batch_size=7)]:
+        pd.testing.assert_frame_equal(
+            loop.run_until_complete(_transform_rows(**batch_kwargs)), expected
+        )
+
+    # micro-batches can be transformed in worker processes
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        pd.testing.assert_frame_equal(
+            loop.run_until_complete(
+                _transform_rows(executor=executor, max_wait=0.01, max_batch_size=7)
+            ),
+            expected,
+        )
+
+    with pytest.raises(TypeError):
+        # noinspection PyTypeChecker
+        loop.run_until_complete(scaler.atransform(X.values))
@@ -0,0 +1,106 @@
+from typing import Type
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import ClusterMixin
+from sklearn.cluster import KMeans
+
+import sklearndf.clustering as clustering
+from sklearndf import ClusterDF
+from test.sklearndf import check_expected_not_fitted_error, list_classes
+
+CLUSTERERS_TO_TEST = list_classes(
+    from_modules=clustering,
+    matching=r".*DF",
+    excluding=[ClusterDF.__name__, r".*WrapperDF"],
+)
+
+
+@pytest.mark.parametrize(argnames="sklearndf_cls", argvalues=CLUSTERERS_TO_TEST)
+def test_wrapped_fit_predict(
+    sklearndf_cls: Type[ClusterDF], iris_features: pd.DataFrame
+) -> None:
+    """ Test fit & predict & transform of wrapped sklearn clusterers """
+    clusterer: ClusterDF = sklearndf_cls(n_clusters=3)
+
+    assert isinstance(clusterer, ClusterDF)
+    assert isinstance(clusterer.native_estimator, ClusterMixin)
+
+    check_expected_not_fitted_error(estimator=clusterer)
+
+    clusterer.fit(X=iris_features)
+
+    clusters = clusterer.predict(X=iris_features)
+    assert isinstance(clusters, pd.Series)
+    assert clusters.index.equals(iris_features.index)
+    assert clusters.nunique() == 3
+
+    # chunked predictions match unchunked predictions, regardless of column order
+    pd.testing.assert_series_equal(
+        clusterer.predict(X=iris_features.iloc[:, ::-1], chunk_size=40), clusters
+    )
+
+    distances = clusterer.transform(X=iris_features)
+    assert distances.index.equals(iris_features.index)
+    assert distances.columns.str.startswith("cluster_").all()
+    pd.testing.assert_frame_equal(
+        clusterer.transform(X=iris_features, chunk_size=40), distances
+    )
+    with pytest.raises(NotImplementedError):
+        _ = clusterer.feature_names_original_
+
+    with pytest.raises(ValueError):
+        clusterer.predict(X=iris_features, chunk_size=0)
+
+
+def test_kmeans_df(iris_features: pd.DataFrame) -> None:
+    """ Test KMeansDF against its native counterpart """
+    clusterer = clustering.KMeansDF(n_clusters=3, n_init=3, random_state=42)
+    native = KMeans(n_clusters=3, n_init=3, random_state=42)
+
+    clusters = clusterer.fit_predict(X=iris_features)
+    assert (clusters.values == native.fit_predict(X=iris_features)).all()
+    assert clusters.name == "cluster"
+
+    distances = clusterer.transform(X=iris_features)
+    assert distances.columns.tolist() == ["cluster_0", "cluster_1", "cluster_2"]
+    assert np.allclose(distances.values, native.transform(X=iris_features))
+    assert clusterer.score(X=iris_features) == pytest.approx(
+        native.score(X=iris_features)
+    )
+
+    # k-means does not support incremental fitting
+    assert not hasattr(clusterer, "partial_fit")
+
+
+@pytest.mark.parametrize(
+    argnames="sklearndf_cls",
+    argvalues=[clustering.MiniBatchKMeansDF, clustering.BirchDF],
+)
+def test_partial_fit(
+    sklearndf_cls: Type[ClusterDF], iris_features: pd.DataFrame
+) -> None:
+    """ Test incremental fitting of clusterers over chunks of a data frame """
+    params = dict(n_clusters=3)
+    if sklearndf_cls is clustering.MiniBatchKMeansDF:
+        params.update(random_state=42, n_init=3)
+
+    clusterer = sklearndf_cls(**params)
+    native = sklearndf_cls.native_estimator_type(**params)
+
+    for start in range(0, len(iris_features), 50):
+        chunk = iris_features.iloc[start : start + 50]
+        # the columns of subsequent chunks may be provided in any order
+        clusterer.partial_fit(X=chunk if start == 0 else chunk.iloc[:, ::-1])
+        native.partial_fit(X=chunk)
+
+    assert clusterer.is_fitted
+    assert clusterer.feature_names_in_.equals(iris_features.columns)
+    assert (
+        clusterer.predict(X=iris_features, chunk_size=40).values
+        == native.predict(X=iris_features)
+    ).all()
+
+    with pytest.raises(ValueError):
+        clusterer.partial_fit(X=iris_features.iloc[:, :2])
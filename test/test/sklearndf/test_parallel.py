@@ -0,0 +1,300 @@
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+from sklearn.impute import SimpleImputer
+
+from sklearndf.classification import RandomForestClassifierDF
+from sklearndf.parallel import BranchExecutor, ScoringPool
+from sklearndf.pipeline import FeatureUnionDF, PipelineDF
+from sklearndf.transformation import (
+    PCADF,
+    ColumnTransformerDF,
+    FunctionTransformerDF,
+    KBinsDiscretizerDF,
+    MinMaxScalerDF,
+    OneHotEncoderDF,
+    SimpleImputerDF,
+    StandardScalerDF,
+)
+from sklearndf.transformation.extra import OutlierRemoverDF
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="requires Python 3.8 or later")
+def test_scoring_pool(iris_features: pd.DataFrame, iris_target_sr: pd.Series) -> None:
+    """ Test parallel scoring through shared memory """
+
+    classifier = RandomForestClassifierDF(n_estimators=10, random_state=42).fit(
+        iris_features, iris_target_sr
+    )
+
+    # non-numeric columns are passed to the workers as pickled chunks
+    X_categorical = iris_features.round().astype(int).astype(str)
+    encoder = OneHotEncoderDF(sparse=False, handle_unknown="ignore").fit(X_categorical)
+
+    with ScoringPool(classifier, n_workers=3) as pool:
+        pd.testing.assert_series_equal(
+            pool.predict(iris_features), classifier.predict(iris_features)
+        )
+        pd.testing.assert_frame_equal(
+            pool.predict_proba(iris_features), classifier.predict_proba(iris_features)
+        )
+
+    with ScoringPool(encoder, n_workers=2) as pool:
+        pd.testing.assert_frame_equal(
+            pool.transform(X_categorical), encoder.transform(X_categorical)
+        )
+
+    # results of a wider dtype than the result for the first row are not truncated
+    X_mixed = iris_features.astype(object)
+    X_mixed.iloc[0] = iris_features.iloc[0].round().astype(int)
+    inferrer = FunctionTransformerDF(func=pd.DataFrame.infer_objects).fit(X_mixed)
+    assert inferrer.transform(X_mixed.iloc[:1]).dtypes.eq(int).all()
+
+    with ScoringPool(inferrer, n_workers=3) as pool:
+        pd.testing.assert_frame_equal(
+            pool.transform(X_mixed), inferrer.transform(X_mixed)
+        )
+
+    # columns with extension dtypes are passed to the workers with their dtypes
+    X_extension = pd.DataFrame(
+        {
+            "float": np.linspace(0.0, 1.0, 10),
+            "category": pd.Categorical(list("abcabcabca")),
+            "datetime_tz": pd.date_range("2021-01-01", periods=10, tz="UTC"),
+            "nullable_int": pd.array([1, None, 3, 4, 5, 6, 7, 8, 9, 10], dtype="Int64"),
+        }
+    )
+    copier = FunctionTransformerDF(func=pd.DataFrame.copy, validate=False).fit(
+        X_extension
+    )
+
+    with ScoringPool(copier, n_workers=2) as pool:
+        pd.testing.assert_frame_equal(
+            pool.transform(X_extension), copier.transform(X_extension)
+        )
+
+    with pytest.raises(RuntimeError):
+        pool.predict(iris_features)
+
+    with pytest.raises(ValueError):
+        ScoringPool(RandomForestClassifierDF())
+
+
+def test_branch_executor(boston_features: pd.DataFrame) -> None:
+    """ Test parallel execution of feature union and column transformer branches """
+
+    executor = BranchExecutor(n_jobs=2)
+    assert executor.is_parallel
+    assert not BranchExecutor().is_parallel
+
+    # scalers run in threads, other transformers in worker processes
+    assert executor.releases_gil(StandardScalerDF())
+    assert executor.releases_gil(PipelineDF([("scale", StandardScalerDF())]))
+    assert executor.releases_gil("passthrough")
+    assert not executor.releases_gil(OutlierRemoverDF())
+
+    def _make_union(n_jobs) -> FeatureUnionDF:
+        return FeatureUnionDF(
+            transformer_list=[
+                ("scale", StandardScalerDF()),
+                ("pca", PCADF(n_components=3, random_state=42)),
+                ("outliers", OutlierRemoverDF()),
+                ("drop", "drop"),
+            ],
+            transformer_weights={"pca": 2.0},
+            n_jobs=n_jobs,
+        )
+
+    union_serial = _make_union(n_jobs=None)
+    union_parallel = _make_union(n_jobs=2)
+
+    transformed_serial = union_serial.fit_transform(boston_features)
+    pd.testing.assert_frame_equal(
+        union_parallel.fit_transform(boston_features), transformed_serial
+    )
+    pd.testing.assert_frame_equal(
+        union_parallel.transform(boston_features), transformed_serial
+    )
+    pd.testing.assert_index_equal(
+        union_parallel.feature_names_out_, union_serial.feature_names_out_
+    )
+
+    # older versions of scikit-learn do not accept numpy strings as column names
+    columns = [str(column) for column in boston_features.columns]
+
+    def _make_column_transformer(n_jobs) -> ColumnTransformerDF:
+        return ColumnTransformerDF(
+            transformers=[
+                ("impute", SimpleImputerDF(), columns[:4]),
+                (
+                    "bins",
+                    KBinsDiscretizerDF(n_bins=3, encode="ordinal"),
+                    columns[4:8],
+                ),
+                ("outliers", OutlierRemoverDF(), columns[8:10]),
+            ],
+            remainder="passthrough",
+            transformer_weights={"impute": 2.0, "remainder": 0.5},
+            n_jobs=n_jobs,
+        )
+
+    column_transformer_serial = _make_column_transformer(n_jobs=None)
+    column_transformer_parallel = _make_column_transformer(n_jobs=2)
+
+    pd.testing.assert_frame_equal(
+        column_transformer_parallel.fit(boston_features).transform(boston_features),
+        column_transformer_serial.fit(boston_features).transform(boston_features),
+    )
+    pd.testing.assert_frame_equal(
+        column_transformer_parallel.fit_transform(boston_features),
+        column_transformer_serial.transform(boston_features),
+    )
+
+
+def test_branch_executor_shared_steps(
+    boston_features: pd.DataFrame, monkeypatch
+) -> None:
+    """ Test that steps common to multiple branches are fitted only once """
+
+    def _make_pipeline(scaler) -> PipelineDF:
+        return PipelineDF(steps=[("impute", SimpleImputerDF()), ("scale", scaler)])
+
+    union = FeatureUnionDF(
+        transformer_list=[
+            ("standard", _make_pipeline(StandardScalerDF())),
+            ("min_max", _make_pipeline(MinMaxScalerDF())),
+            ("pca", PCADF(n_components=2, random_state=42)),
+        ]
+    )
+    transformed = union.fit_transform(boston_features)
+
+    standard, min_max, _ = (
+        transformer for _, transformer in union.native_estimator.transformer_list
+    )
+    # shared steps are fitted once, but each branch keeps its own copy
+    assert standard.steps[0][1] is not min_max.steps[0][1]
+    assert (
+        standard.steps[0][1].native_estimator.statistics_.tolist()
+        == min_max.steps[0][1].native_estimator.statistics_.tolist()
+    )
+
+    expected = np.hstack(
+        [
+            _make_pipeline(StandardScalerDF()).fit_transform(boston_features).values,
+            _make_pipeline(MinMaxScalerDF()).fit_transform(boston_features).values,
+            PCADF(n_components=2, random_state=42)
+            .fit_transform(boston_features)
+            .values,
+        ]
+    )
+    assert np.allclose(transformed.values, expected)
+    assert np.allclose(union.transform(boston_features).values, expected)
+    for branch in (standard, min_max):
+        assert (
+            branch.feature_names_original_.tolist() == boston_features.columns.tolist()
+        )
+
+    # changing the parameters of a shared step only affects its own branch
+    union.set_params(standard__impute__strategy="median")
+    assert min_max.steps[0][1].strategy == "mean"
+    assert clone(union).get_params()["min_max__impute__strategy"] == "mean"
+
+    # the second branch gets a copy of the step fitted for the first branch
+    standard, min_max = (
+        _make_pipeline(StandardScalerDF()),
+        _make_pipeline(MinMaxScalerDF()),
+    )
+    (standard_fitted, _), (min_max_fitted, _) = BranchExecutor().fit_transform(
+        [(standard, boston_features), (min_max, boston_features)]
+    )
+    assert standard_fitted.steps[0][1] is standard.steps[0][1]
+    assert not min_max.steps[0][1].is_fitted
+    assert min_max_fitted.steps[0][1] is not standard.steps[0][1]
+    assert min_max_fitted.steps[0][1].is_fitted
+
+    # column transformer branches with equal leading steps run these steps once
+    imputer_fits = []
+    imputer_fit = SimpleImputer.fit
+    monkeypatch.setattr(
+        SimpleImputer,
+        "fit",
+        lambda self, *args, **kwargs: (
+            imputer_fits.append(self) or imputer_fit(self, *args, **kwargs)
+        ),
+    )
+
+    columns = [str(column) for column in boston_features.columns[:5]]
+    column_transformer = ColumnTransformerDF(
+        transformers=[
+            ("standard", _make_pipeline(StandardScalerDF()), columns),
+            ("min_max", _make_pipeline(MinMaxScalerDF()), columns),
+        ]
+    ).fit(boston_features)
+    assert len(imputer_fits) == 1
+    monkeypatch.undo()
+
+    standard, min_max = (
+        transformer
+        for _, transformer, _ in column_transformer.native_estimator.transformers_[:2]
+    )
+    assert standard.steps[0][1] is not min_max.steps[0][1]
+    assert np.allclose(
+        column_transformer.transform(boston_features).values,
+        np.hstack(
+            [
+                _make_pipeline(StandardScalerDF())
+                .fit_transform(boston_features.loc[:, columns])
+                .values,
+                _make_pipeline(MinMaxScalerDF())
+                .fit_transform(boston_features.loc[:, columns])
+                .values,
+            ]
+        ),
+    )
+
+
+def test_branch_executor_transform_without_hashing(
+    boston_features: pd.DataFrame, monkeypatch
+) -> None:
+    """ Test that fitted steps are compared when fitting, not when transforming """
+
+    def _make_pipeline(scaler) -> PipelineDF:
+        return PipelineDF(steps=[("impute", SimpleImputerDF()), ("scale", scaler)])
+
+    columns = [str(column) for column in boston_features.columns[:5]]
+    union = FeatureUnionDF(
+        transformer_list=[
+            ("standard", _make_pipeline(StandardScalerDF())),
+            ("min_max", _make_pipeline(MinMaxScalerDF())),
+        ]
+    ).fit(boston_features)
+    column_transformer = ColumnTransformerDF(
+        transformers=[
+            ("standard", _make_pipeline(StandardScalerDF()), columns),
+            ("min_max", _make_pipeline(MinMaxScalerDF()), columns),
+        ]
+    ).fit(boston_features)
+
+    # the leading imputers have the same fitted state, and will be shared
+    for fitted in (union, column_transformer):
+        # noinspection PyProtectedMember
+        (impute_1, scale_1), (impute_2, scale_2) = fitted._step_keys
+        assert impute_1 == impute_2
+        assert scale_1 != scale_2
+
+    expected_union = union.transform(boston_features)
+    expected_column_transformer = column_transformer.transform(boston_features)
+
+    def _hash(*args, **kwargs):
+        raise AssertionError("joblib.hash must not be called when transforming")
+
+    monkeypatch.setattr(joblib, "hash", _hash)
+
+    pd.testing.assert_frame_equal(union.transform(boston_features), expected_union)
+    pd.testing.assert_frame_equal(
+        column_transformer.transform(boston_features), expected_column_transformer
+    )
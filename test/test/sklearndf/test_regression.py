@@ -1,18 +1,30 @@
+import pickle
 from typing import List, Type
 
+import lightgbm
+import numpy as np
 import pandas as pd
 import pytest
+from packaging.version import parse as parse_version
 from sklearn.multioutput import MultiOutputRegressor, RegressorChain
 
 import sklearndf.regression
-from sklearndf import RegressorDF, TransformerDF
+from sklearndf import (
+    RegressorDF,
+    TransformerDF,
+    __sklearn_0_23__,
+    __sklearn_0_24__,
+    __sklearn_version__,
+)
 from sklearndf.regression import (
     SVRDF,
+    HistGradientBoostingRegressorDF,
     IsotonicRegressionDF,
     LinearRegressionDF,
     RandomForestRegressorDF,
 )
-from sklearndf.wrapper import EstimatorWrapperDF
+from sklearndf.regression.extra import LGBMRegressorDF
+from sklearndf.wrapper import EstimatorWrapperDF, LGBMDatasetCache
 from test.sklearndf import check_expected_not_fitted_error, list_classes
 
 REGRESSORS_TO_TEST: List[Type[EstimatorWrapperDF]] = list_classes(
@@ -81,3 +93,232 @@ def test_wrapped_fit_predict(
     # test predictions data-type, length and values
     assert isinstance(predictions, (pd.Series, pd.DataFrame))
     assert len(predictions) == len(boston_target_sr)
+
+
+def test_lgbm_dataset_cache() -> None:
+    """ Test reusing LightGBM datasets across fits """
+    rng = np.random.RandomState(42)
+    x = pd.DataFrame(data=rng.normal(size=(500, 5)), columns=list("abcde"))
+    y = x["a"] * 2 + rng.normal(size=500)
+
+    cache = LGBMDatasetCache()
+    for learning_rate in (0.1, 0.2):
+        cached = LGBMRegressorDF(learning_rate=learning_rate).fit(
+            x, y, dataset_cache=cache
+        )
+        pd.testing.assert_series_equal(
+            cached.predict(x),
+            LGBMRegressorDF(learning_rate=learning_rate).fit(x, y).predict(x),
+        )
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+    # dataset construction of LightGBM is only redirected while fitting
+    assert lightgbm.sklearn.Dataset is lightgbm.Dataset
+
+    # different data or binning parameters require a new dataset
+    LGBMRegressorDF().fit(x.iloc[:400], y.iloc[:400], dataset_cache=cache)
+    LGBMRegressorDF(max_bin=31).fit(x, y, dataset_cache=cache)
+    assert (cache.hits, cache.misses, len(cache)) == (1, 3, 3)
+
+    # categorical features given as a fit parameter are part of the dataset
+    x_cat = x.assign(f=rng.randint(5, size=500))
+    cat_cache = LGBMDatasetCache()
+    for learning_rate in (0.1, 0.2):
+        cached = LGBMRegressorDF(learning_rate=learning_rate).fit(
+            x_cat, y, dataset_cache=cat_cache, categorical_feature=["f"]
+        )
+        pd.testing.assert_series_equal(
+            cached.predict(x_cat),
+            LGBMRegressorDF(learning_rate=learning_rate)
+            .fit(x_cat, y, categorical_feature=["f"])
+            .predict(x_cat),
+        )
+    LGBMRegressorDF().fit(x_cat, y, dataset_cache=cat_cache)
+    assert (cat_cache.hits, cat_cache.misses, len(cat_cache)) == (1, 2, 2)
+
+    # so are feature names given as a fit parameter
+    feature_names = [f"x{i}" for i in range(6)]
+    for fit_params in (dict(feature_name=feature_names), {}):
+        booster = (
+            LGBMRegressorDF()
+            .fit(x_cat, y, dataset_cache=cat_cache, **fit_params)
+            .native_estimator.booster_
+        )
+        assert booster.feature_name() == fit_params.get(
+            "feature_name", x_cat.columns.tolist()
+        )
+    assert (cat_cache.hits, cat_cache.misses, len(cat_cache)) == (2, 3, 3)
+
+    # the least recently used datasets are evicted
+    small_cache = LGBMDatasetCache(max_bytes=cache.nbytes // 2)
+    LGBMRegressorDF().fit(x, y, dataset_cache=small_cache)
+    LGBMRegressorDF().fit(x.iloc[:400], y.iloc[:400], dataset_cache=small_cache)
+    assert len(small_cache) == 1
+    assert small_cache.nbytes <= small_cache.max_bytes
+
+    # caches keep their identity when pickled, e.g., for parallel processes
+    assert pickle.loads(pickle.dumps(cache)) is cache
+
+
+def test_lgbm_fit_from_file(tmp_path) -> None:
+    """ Test fitting LightGBM regressors to data files """
+    rng = np.random.RandomState(42)
+    df = pd.DataFrame(data=rng.normal(size=(500, 5)), columns=list("abcde"))
+    df["y"] = df["a"] * 2 + rng.normal(size=500)
+    x = df.drop(columns="y")
+
+    expected = LGBMRegressorDF().fit(x, df["y"]).predict(x)
+
+    csv_path = tmp_path / "data.csv"
+    df.to_csv(csv_path, index=False)
+    regressor = LGBMRegressorDF().fit_from_file(csv_path, label="y")
+    assert regressor.feature_names_in_.tolist() == list("abcde")
+    assert regressor.n_outputs_ == 1
+    pd.testing.assert_series_equal(regressor.predict(x), expected)
+
+    bin_path = str(tmp_path / "data.bin")
+    lightgbm.Dataset(x, label=df["y"]).save_binary(bin_path)
+    regressor = LGBMRegressorDF().fit_from_file(bin_path)
+    assert regressor.feature_names_in_.tolist() == list("abcde")
+    pd.testing.assert_series_equal(regressor.predict(x), expected)
+
+    with pytest.raises(ValueError):
+        LGBMRegressorDF().fit_from_file(csv_path)
+    with pytest.raises(ValueError):
+        LGBMRegressorDF().fit_from_file(csv_path, label="z")
+    with pytest.raises(ValueError):
+        LGBMRegressorDF().fit_from_file(bin_path, label="y")
+
+
+def test_lgbm_fit_from_parquet(tmp_path) -> None:
+    """ Test fitting LightGBM regressors to parquet files """
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    rng = np.random.RandomState(42)
+    df = pd.DataFrame(data=rng.normal(size=(500, 5)), columns=list("abcde"))
+    df["y"] = df["a"] * 2 + rng.normal(size=500)
+    df["w"] = rng.uniform(0.5, 2.0, size=500)
+    x = df.loc[:, list("abcde")]
+
+    # the label and weight columns may appear anywhere in the file, and rows are
+    # read across several row groups
+    parquet_path = tmp_path / "data.parquet"
+    pq.write_table(
+        pyarrow.Table.from_pandas(
+            df.loc[:, ["a", "b", "y", "c", "w", "d", "e"]], preserve_index=False
+        ),
+        str(parquet_path),
+        row_group_size=150,
+    )
+
+    if parse_version(lightgbm.__version__) < parse_version("3.3"):
+        with pytest.raises(RuntimeError):
+            LGBMRegressorDF().fit_from_file(parquet_path, label="y", weight="w")
+        return
+
+    regressor = LGBMRegressorDF().fit_from_file(parquet_path, label="y", weight="w")
+    assert regressor.feature_names_in_.tolist() == list("abcde")
+    assert regressor.n_outputs_ == 1
+    pd.testing.assert_series_equal(
+        regressor.predict(x),
+        LGBMRegressorDF().fit(x, df["y"], sample_weight=df["w"]).predict(x),
+    )
+
+    with pytest.raises(ValueError):
+        LGBMRegressorDF().fit_from_file(parquet_path, label="y", weight="z")
+    with pytest.raises(ValueError):
+        LGBMRegressorDF().fit_from_file(
+            parquet_path, label="y", weight="w", sample_weight=df["w"]
+        )
+
+
+def test_hist_gradient_boosting_regressor_df(
+    boston_features: pd.DataFrame, boston_target_sr: pd.Series
+) -> None:
+    """ Test early stopping, categorical features, and thread limits """
+
+    n_train = len(boston_features) * 3 // 4
+    X_train = boston_features.iloc[:n_train]
+    y_train = boston_target_sr.iloc[:n_train]
+    X_val = boston_features.iloc[n_train:]
+    y_val = boston_target_sr.iloc[n_train:]
+
+    # limiting the number of threads does not change the predictions
+    regressor = HistGradientBoostingRegressorDF(max_iter=20).fit(X_train, y_train)
+    regressor_limited = HistGradientBoostingRegressorDF(max_iter=20).fit(
+        X_train, y_train, n_jobs=1
+    )
+    pd.testing.assert_series_equal(
+        regressor_limited.predict(X_val), regressor.predict(X_val)
+    )
+    pd.testing.assert_series_equal(
+        pickle.loads(pickle.dumps(regressor_limited)).predict(X_val),
+        regressor.predict(X_val),
+    )
+
+    if __sklearn_version__ >= __sklearn_0_24__:
+        categorical_features = ["CHAS", "RAD"]
+        regressor = HistGradientBoostingRegressorDF(
+            max_iter=20, categorical_features=categorical_features
+        ).fit(X_train, y_train)
+        assert regressor.native_estimator.is_categorical_.tolist() == [
+            feature in categorical_features for feature in boston_features.columns
+        ]
+        assert regressor.get_params()["categorical_features"] == categorical_features
+
+        with pytest.raises(ValueError):
+            HistGradientBoostingRegressorDF(categorical_features=["unknown"]).fit(
+                X_train, y_train
+            )
+
+    params = dict(max_iter=1000, n_iter_no_change=5, scoring="r2", random_state=42)
+    if __sklearn_version__ >= __sklearn_0_23__:
+        params.update(early_stopping=True)
+    regressor = HistGradientBoostingRegressorDF(**params)
+
+    # noinspection PyProtectedMember
+    from sklearn.ensemble._hist_gradient_boosting import gradient_boosting
+
+    train_test_split = gradient_boosting.train_test_split
+
+    # validation inputs with columns in reverse order, to test their alignment
+    regressor.fit(X_train, y_train, eval_set=[(X_val.iloc[:, ::-1], y_val)])
+    n_iter = regressor.native_estimator.n_iter_
+    assert n_iter < 1000
+
+    # the validation split of scikit-learn is only redirected while fitting
+    assert gradient_boosting.train_test_split is train_test_split
+
+    # the validation set is scored for early stopping, and not used for training
+    assert regressor.native_estimator.validation_score_[-1] == pytest.approx(
+        regressor.score(X_val, y_val)
+    )
+    pd.testing.assert_series_equal(
+        regressor.predict(X_val),
+        HistGradientBoostingRegressorDF(max_iter=n_iter, random_state=42)
+        .fit(X_train, y_train)
+        .predict(X_val),
+    )
+
+    # a validation set enables early stopping if it is not configured explicitly,
+    # and is never used for training if early stopping is disabled
+    if __sklearn_version__ >= __sklearn_0_23__:
+        regressor = HistGradientBoostingRegressorDF(
+            **dict(params, early_stopping="auto")
+        ).fit(X_train, y_train, eval_set=[(X_val, y_val)])
+        assert regressor.native_estimator.n_iter_ == n_iter
+        assert regressor.get_params()["early_stopping"] == "auto"
+
+        with pytest.raises(ValueError):
+            HistGradientBoostingRegressorDF(early_stopping=False).fit(
+                X_train, y_train, eval_set=[(X_val, y_val)]
+            )
+    else:
+        with pytest.raises(ValueError):
+            HistGradientBoostingRegressorDF().fit(
+                X_train, y_train, eval_set=[(X_val, y_val)]
+            )
+
+    with pytest.raises(ValueError):
+        regressor.fit(X_train, y_train, eval_set=[(X_val, y_val), (X_val, y_val)])
@@ -0,0 +1,104 @@
+from pathlib import Path
+
+import joblib
+import pandas as pd
+import pytest
+
+from sklearndf.regression import RandomForestRegressorDF
+from sklearndf.score import score_file
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_score_file(
+    boston_df: pd.DataFrame,
+    boston_features: pd.DataFrame,
+    boston_target_sr: pd.Series,
+    tmp_path: Path,
+    n_workers: int,
+) -> None:
+    """ Test chunked batch scoring of CSV files """
+
+    regressor = RandomForestRegressorDF(n_estimators=10, random_state=42).fit(
+        boston_features, boston_target_sr
+    )
+    model_path = str(tmp_path / "model.pkl")
+    joblib.dump(regressor, model_path)
+
+    # the input file has additional columns, and columns in a different order
+    input_path = str(tmp_path / "input.csv")
+    boston_df.assign(id=range(len(boston_df))).iloc[:, ::-1].to_csv(
+        input_path, index=False
+    )
+    output_path = str(tmp_path / "output.csv")
+
+    statistics = score_file(
+        model_path,
+        input_path,
+        output_path,
+        n_workers=n_workers,
+        chunk_size=50,
+        keep_columns=["id"],
+    )
+
+    assert statistics["rows"] == len(boston_df)
+    assert statistics["chunks"] == -(-len(boston_df) // 50)
+
+    scores = pd.read_csv(output_path)
+    assert list(scores.columns) == ["id", "prediction"]
+    assert scores["id"].tolist() == list(range(len(boston_df)))
+    pd.testing.assert_series_equal(
+        scores["prediction"],
+        regressor.predict(boston_features).reset_index(drop=True),
+        check_names=False,
+    )
+
+
+def test_score_file_parquet(
+    boston_df: pd.DataFrame,
+    boston_features: pd.DataFrame,
+    boston_target_sr: pd.Series,
+    tmp_path: Path,
+) -> None:
+    """ Test chunked batch scoring of parquet files """
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    regressor = RandomForestRegressorDF(n_estimators=10, random_state=42).fit(
+        boston_features, boston_target_sr
+    )
+    model_path = str(tmp_path / "model.pkl")
+    joblib.dump(regressor, model_path)
+
+    expected = regressor.predict(boston_features).reset_index(drop=True)
+
+    # parquet to parquet, in row groups of 100 rows
+    input_path = str(tmp_path / "input.parquet")
+    boston_df.assign(id=range(len(boston_df))).to_parquet(
+        input_path, index=False, row_group_size=100
+    )
+    output_path = str(tmp_path / "output.parquet")
+
+    statistics = score_file(model_path, input_path, output_path, keep_columns=["id"])
+
+    assert statistics["chunks"] == -(-len(boston_df) // 100)
+    scores = pd.read_parquet(output_path)
+    assert list(scores.columns) == ["id", "prediction"]
+    assert scores["id"].tolist() == list(range(len(boston_df)))
+    pd.testing.assert_series_equal(scores["prediction"], expected, check_names=False)
+
+    # CSV to parquet, with integer ids read as floats from later chunks with
+    # missing ids
+    ids = pd.Series(range(len(boston_df)), dtype=float)
+    ids.iloc[100:] = ids.iloc[100:].where(ids.iloc[100:] % 2 == 0)
+    input_path = str(tmp_path / "input.csv")
+    boston_df.iloc[:100].assign(id=range(100)).to_csv(input_path, index=False)
+    boston_df.iloc[100:].assign(id=ids.iloc[100:].to_numpy()).to_csv(
+        input_path, mode="a", header=False, index=False
+    )
+
+    score_file(model_path, input_path, output_path, chunk_size=100, keep_columns=["id"])
+
+    assert pq.read_schema(output_path).field("id").type == pa.int64()
+    scores = pd.read_parquet(output_path)
+    pd.testing.assert_series_equal(scores["id"], ids, check_names=False)
+    pd.testing.assert_series_equal(scores["prediction"], expected, check_names=False)
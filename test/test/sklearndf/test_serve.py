@@ -0,0 +1,59 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import joblib
+import pandas as pd
+import pytest
+
+from sklearndf.regression import RandomForestRegressorDF
+from sklearndf.serve import ModelServer
+
+
+def test_model_server(
+    boston_features: pd.DataFrame, boston_target_sr: pd.Series, tmp_path: Path
+) -> None:
+    """ Test batched serving of predictions, using a local stand-in client """
+
+    regressor = RandomForestRegressorDF(n_estimators=10, random_state=42).fit(
+        boston_features, boston_target_sr
+    )
+    model_path = str(tmp_path / "model.pkl")
+    joblib.dump(regressor, model_path)
+
+    X = boston_features.iloc[:50]
+    expected = regressor.predict(X)
+
+    def _request(i: int) -> pd.Series:
+        status, content_type, body = server.handle(
+            "POST", "/predict", X.iloc[[i]].to_json(orient="split").encode()
+        )
+        assert status == 200
+        return pd.read_json(body, orient="split", typ="series")
+
+    with ModelServer(model_path, n_workers=2, max_batch=8, max_wait_ms=20) as server:
+        assert server.methods == ["predict"]
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            predicted = pd.concat(executor.map(_request, range(len(X))))
+
+        pd.testing.assert_series_equal(
+            predicted, expected, check_names=False, check_index_type=False
+        )
+
+        status, _, body = server.handle("POST", "/predict", b"not json")
+        assert status == 400
+        status, _, _ = server.handle("POST", "/predict_proba", b"{}")
+        assert status == 404
+
+        status, _, body = server.handle("GET", "/stats")
+        assert status == 200
+        stats = json.loads(body)
+
+    assert stats["requests"] == len(X)
+    assert stats["batch_size"]["count"] < len(X)
+    assert stats["batch_size"]["max"] <= 8
+    assert sum(stats["latency_ms"]["histogram"].values()) == len(X)
+
+    with pytest.raises(RuntimeError):
+        server.process("predict", X)
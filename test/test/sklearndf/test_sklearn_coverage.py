@@ -6,17 +6,19 @@ import sklearn
 from sklearn.base import (
     BaseEstimator,
     ClassifierMixin,
+    ClusterMixin,
     RegressorMixin,
     TransformerMixin,
 )
 from sklearn.utils.metaestimators import _BaseComposition
 
 import sklearndf.classification
+import sklearndf.clustering
 import sklearndf.pipeline
 import sklearndf.regression
 import sklearndf.transformation
 from .. import check_sklearn_version
-from ..conftest import UNSUPPORTED_SKLEARN_PACKAGES
+from ..conftest import UNSUPPORTED_SKLEARN_CLUSTERERS, UNSUPPORTED_SKLEARN_PACKAGES
 from ..sklearndf import find_all_submodules, list_classes, sklearn_delegate_classes
 from sklearndf import EstimatorDF
 
@@ -54,12 +56,31 @@ REGRESSOR_COVERAGE_EXCLUDES = {
 TRANSFORMER_COVERAGE_EXCLUDES = (
     {
         # class "Imputer" was deprecated in 0.20 and removed in 0.22
-        "Imputer"
+        "Imputer",
+        # private binning transformer of histogram-based gradient boosting
+        "_BinMapper",
     }
     | CLASSIFIER_COVERAGE_EXCLUDES
     | REGRESSOR_COVERAGE_EXCLUDES
 )
 
+if check_sklearn_version(minimum="0.24"):
+    # transformers added in scikit-learn 0.24 are deliberately not wrapped:
+    # sklearndf supports scikit-learn 0.24 as a dependency, without extending its
+    # API to the transformers new in that release
+    added_in_v024 = ("PolynomialCountSketch", "SequentialFeatureSelector")
+    TRANSFORMER_COVERAGE_EXCLUDES.update(added_in_v024)
+
+
+CLUSTERER_COVERAGE_EXCLUDES = {
+    # exclude all Base classes, named starting with "Base" or "_Base":
+    r"^_?Base.*",
+    # exclude all Mixin classes, named ending on Mixin:
+    r".*Mixin$",
+}
+
+# mixin of FeatureAgglomeration, not following the naming convention
+TRANSFORMER_COVERAGE_EXCLUDES.add("AgglomerationTransform")
 
 PIPELINE_COVERAGE_EXCLUDES = {
     # exclude all Base classes, named starting with "Base" or "_Base":
@@ -76,7 +97,7 @@ UNSUPPORTED_SKLEARN_CLASSES = {
         ),
         matching=".*",
     )
-}
+} | UNSUPPORTED_SKLEARN_CLUSTERERS
 
 
 def _find_sklearn_classes_to_cover(
@@ -109,6 +130,14 @@ def sklearn_regressor_classes() -> List[Type]:
     )
 
 
+def sklearn_clusterer_classes() -> List[Type]:
+    return _find_sklearn_classes_to_cover(
+        from_modules=find_all_submodules(sklearn),
+        subclass_of=ClusterMixin,
+        excluding=CLUSTERER_COVERAGE_EXCLUDES,
+    )
+
+
 def sklearn_pipeline_classes() -> List[Type]:
 
     pipeline_modules = find_all_submodules(sklearn.pipeline)
@@ -183,14 +212,32 @@ def test_regressor_coverage(sklearn_regressor_cls: Type[RegressorMixin]) -> None
 def test_transformer_coverage(sklearn_transformer_cls: Type[TransformerMixin]) -> None:
     """ Check if each sklearn transformer has a wrapped sklearndf counterpart. """
 
-    sklearn_classes: Dict[
-        Type[BaseEstimator], Type[EstimatorDF]
-    ] = sklearn_delegate_classes(sklearndf.transformation)
+    # clusterers such as KMeans are transformers, too
+    sklearn_classes: Dict[Type[BaseEstimator], Type[EstimatorDF]] = {
+        **sklearn_delegate_classes(sklearndf.transformation),
+        **sklearn_delegate_classes(sklearndf.clustering),
+    }
 
     if sklearn_transformer_cls not in sklearn_classes:
         _check_unexpected_sklearn_class(sklearn_transformer_cls)
 
 
+@pytest.mark.parametrize(
+    argnames="sklearn_clusterer_cls", argvalues=sklearn_clusterer_classes()
+)
+def test_clusterer_coverage(sklearn_clusterer_cls: Type[ClusterMixin]) -> None:
+    """ Check if each sklearn clusterer has a wrapped sklearndf counterpart. """
+
+    # feature agglomeration is a transformer, not a clusterer
+    sklearn_classes: Dict[Type[BaseEstimator], Type[EstimatorDF]] = {
+        **sklearn_delegate_classes(sklearndf.clustering),
+        **sklearn_delegate_classes(sklearndf.transformation),
+    }
+
+    if sklearn_clusterer_cls not in sklearn_classes:
+        _check_unexpected_sklearn_class(sklearn_clusterer_cls)
+
+
 @pytest.mark.parametrize(
     argnames="sklearn_pipeline_cls", argvalues=sklearn_pipeline_classes()
 )
@@ -1,11 +1,25 @@
+import joblib
 import numpy as np
 import pandas as pd
+import pytest
 from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.preprocessing import QuantileTransformer, RobustScaler
 
-from sklearndf.pipeline import PipelineDF
-from sklearndf.regression import RandomForestRegressorDF
-from sklearndf.transformation import SimpleImputerDF
-from sklearndf.transformation.extra import BorutaDF
+from sklearndf.pipeline import PipelineDF, RegressorPipelineDF
+from sklearndf.regression import LinearRegressionDF, RandomForestRegressorDF, RidgeDF
+from sklearndf.transformation import RFECVDF, SimpleImputerDF, StandardScalerDF
+from sklearndf.transformation.extra import (
+    BorutaDF,
+    DeduplicateDF,
+    DtypeOptimizerDF,
+    ParallelBorutaDF,
+    ParallelRFECVDF,
+    SampledFitDF,
+    StreamingQuantileTransformerDF,
+    StreamingRobustScalerDF,
+)
+from test import check_sklearn_version
 
 
 def test_boruta_df() -> None:
@@ -40,3 +54,346 @@ def test_boruta_pipeline(boston_df: pd.DataFrame, boston_target: str) -> None:
     y = boston_df.loc[:, boston_target]
 
     boruta_selector.fit(x, y)
+
+
+def test_parallel_boruta_df(tmp_path, monkeypatch) -> None:
+    """ Test the native Boruta implementation, resuming runs from checkpoints """
+    rng = np.random.RandomState(42)
+    x = pd.DataFrame(data=rng.normal(size=(300, 8)), columns=list("abcdefgh"))
+    y = x["a"] * 2 + x["b"] + rng.normal(size=300) * 0.1
+
+    def _boruta(**kwargs) -> ParallelBorutaDF:
+        return ParallelBorutaDF(
+            RandomForestRegressorDF(max_depth=5),
+            n_estimators=30,
+            random_state=42,
+            **kwargs,
+        )
+
+    boruta = _boruta(max_iter=20).fit(x, y)
+    assert {"a", "b"} <= set(boruta.feature_names_out_)
+    assert boruta.feature_names_out_.tolist() == x.columns[boruta.support_].tolist()
+    assert boruta.transform(x).columns.tolist() == boruta.feature_names_out_.tolist()
+    assert (boruta.ranking_[boruta.support_] == 1).all()
+    assert boruta.importance_history_.shape == (20, 8)
+
+    # an interrupted run resumes from its checkpoint, with the same results
+    checkpoint = str(tmp_path / "boruta.checkpoint")
+    _boruta(max_iter=5, checkpoint=checkpoint).fit(x, y)
+    resumed = _boruta(max_iter=20, checkpoint=checkpoint).fit(x, y)
+    np.testing.assert_array_equal(
+        resumed.importance_history_, boruta.importance_history_
+    )
+    np.testing.assert_array_equal(resumed.ranking_, boruta.ranking_)
+
+    # the inputs are hashed once per fit, not after every round
+    hash_calls = []
+    joblib_hash = joblib.hash
+    monkeypatch.setattr(
+        joblib, "hash", lambda *args: hash_calls.append(args) or joblib_hash(*args)
+    )
+    _boruta(max_iter=10, checkpoint=str(tmp_path / "hashed.checkpoint")).fit(x, y)
+    assert len(hash_calls) == 1
+    monkeypatch.undo()
+
+    # a checkpoint is never resumed with other data or parameters
+    with pytest.raises(ValueError):
+        _boruta(max_iter=20, checkpoint=checkpoint).fit(x, y + 1.0)
+    with pytest.raises(ValueError):
+        _boruta(max_iter=20, perc=90, checkpoint=checkpoint).fit(x, y)
+
+    # parallel rounds and early stopping
+    assert {"a", "b"} <= set(
+        _boruta(max_iter=20, n_jobs=2).fit(x, y).feature_names_out_
+    )
+
+    # early stopping only counts rounds in which features can be decided, i.e.,
+    # from round 8 with the default alpha
+    n_rounds = len(_boruta(n_iter_no_change=3).fit(x, y).importance_history_)
+    assert 10 <= n_rounds < 100
+
+
+def test_parallel_rfecv_df() -> None:
+    """ Test the native RFECV implementation against RFECVDF """
+    rng = np.random.RandomState(42)
+    x = pd.DataFrame(data=rng.normal(size=(300, 10)), columns=list("abcdefghij"))
+    y = x["a"] * 3 + x["b"] * 2 + x["c"] + rng.normal(size=300)
+
+    for step in (1, 3):
+        # RFECV before scikit-learn 1.0 fits its estimator to numpy arrays
+        rfecv = RFECVDF(LinearRegression(), step=step, cv=3).fit(x, y)
+        parallel = ParallelRFECVDF(LinearRegressionDF(), step=step, cv=3, n_jobs=2)
+        parallel.fit(x, y)
+
+        assert parallel.feature_names_out_.equals(rfecv.feature_names_out_)
+        assert parallel.transform(x).columns.equals(rfecv.transform(x).columns)
+        np.testing.assert_array_equal(
+            parallel.ranking_, rfecv.native_estimator.ranking_
+        )
+        np.testing.assert_allclose(
+            parallel.grid_scores_, rfecv.native_estimator.grid_scores_
+        )
+        assert parallel.step_times_.shape == (len(parallel.grid_scores_), 3)
+
+    # warm-started elimination selects the same features
+    x_class = x.iloc[:, :6]
+    y_class = (y > 0).astype(int)
+    selected = [
+        ParallelRFECVDF(LogisticRegression(tol=1e-8), cv=3, warm_start=warm_start)
+        .fit(x_class, y_class)
+        .feature_names_out_.tolist()
+        for warm_start in (False, True)
+    ]
+    assert selected[0] == selected[1]
+    assert {"a", "b", "c"} <= set(selected[0])
+
+    # the final estimator is a clean fit to the selected features
+    parallel = ParallelRFECVDF(LogisticRegression(tol=1e-8), cv=3).fit(x_class, y_class)
+    assert not parallel.estimator_.warm_start
+    assert parallel.estimator_.coef_.shape == (1, parallel.n_features_)
+
+    # float steps of at least 1 are numbers of features
+    assert (
+        ParallelRFECVDF(LinearRegressionDF(), step=3.0, cv=3)
+        .fit(x, y)
+        .ranking_.tolist()
+        == rfecv.native_estimator.ranking_.tolist()
+    )
+
+
+def test_dtype_optimizer_df() -> None:
+    """ Test conversion of columns to narrower dtypes """
+    df = pd.DataFrame(
+        data={
+            "small_int": np.arange(100, dtype=np.int64),
+            "large_int": np.arange(100, dtype=np.int64) * 100_000,
+            "float": np.linspace(0.0, 1.0, 100),
+            "precise_float": np.linspace(0.0, 1.0, 100) + 1e-12,
+            "string": np.array(["a", "b", "c", "d"] * 25, dtype=object),
+            "unique_string": np.array([str(i) for i in range(100)], dtype=object),
+        }
+    )
+
+    optimizer = DtypeOptimizerDF(float_tolerance=1e-6, max_categories=10).fit(df)
+
+    transformed = optimizer.transform(df)
+    assert transformed.dtypes.tolist() == [
+        np.dtype(np.uint8),
+        np.dtype(np.uint32),
+        np.dtype(np.float32),
+        np.dtype(np.float32),
+        pd.CategoricalDtype(["a", "b", "c", "d"]),
+        np.dtype(object),
+    ]
+    assert (
+        DtypeOptimizerDF(float_tolerance=0.0).fit(df).dtypes_["precise_float"]
+        == np.float64
+    )
+
+    assert optimizer.bytes_saved_.sum() > 0
+    assert optimizer.bytes_saved_["unique_string"] == 0
+    pd.testing.assert_series_equal(
+        optimizer.feature_names_original_,
+        pd.Series(df.columns, index=df.columns),
+        check_names=False,
+    )
+    assert transformed.columns.name == "feature_out"
+    pd.testing.assert_frame_equal(
+        optimizer.inverse_transform(transformed),
+        df.rename_axis(columns="feature_in"),
+        check_exact=False,
+        rtol=1e-6,
+    )
+
+    # values that do not fit the target dtypes are kept safely
+    df_unseen = df.copy()
+    df_unseen.loc[0, "small_int"] = 1_000
+    df_unseen.loc[0, "string"] = "e"
+
+    transformed_unseen = optimizer.transform(df_unseen)
+    assert transformed_unseen["small_int"].dtype == np.int64
+    assert transformed_unseen["string"].tolist() == df_unseen["string"].tolist()
+
+    # integer columns arriving as floats are not truncated
+    df_float = df.astype({"small_int": float, "large_int": float})
+    df_float.loc[0, "small_int"] = np.nan
+    df_float.loc[1, "large_int"] = 0.5
+
+    transformed_float = optimizer.transform(df_float)
+    assert transformed_float["small_int"].dtype == np.float64
+    assert transformed_float["large_int"].dtype == np.float64
+    pd.testing.assert_frame_equal(
+        transformed_float.loc[:, ["small_int", "large_int"]],
+        df_float.loc[:, ["small_int", "large_int"]],
+        check_names=False,
+    )
+
+
+def test_deduplicate_df() -> None:
+    """ Test fitting a learner pipeline on de-duplicated, weighted observations """
+    rng = np.random.RandomState(42)
+    df = pd.DataFrame(
+        data={"a": rng.randint(0, 3, 200), "b": rng.randint(0, 4, 200)}
+    ).astype(float)
+    y = pd.Series(rng.randint(0, 2, 200), name="target").astype(float)
+
+    x_dedup, y_dedup, weights = DeduplicateDF().fit_transform_xy(df, y)
+    assert (
+        len(x_dedup)
+        == len(y_dedup)
+        == len(weights)
+        == len(df.join(y).drop_duplicates())
+    )
+    assert weights.sum() == len(df)
+    assert weights.index.equals(x_dedup.index)
+
+    # sample weights are summed per group of identical observations
+    _, _, weights_2 = DeduplicateDF().fit_transform_xy(
+        df, y, sample_weight=pd.Series(2.0, index=df.index)
+    )
+    assert (weights_2 == weights * 2.0).all()
+
+    # a regularised learner is fitted to the same model as without de-duplication
+    pipeline_dedup = RegressorPipelineDF(
+        preprocessing=PipelineDF(
+            steps=[("scale", StandardScalerDF()), ("dedup", DeduplicateDF())]
+        ),
+        regressor=RidgeDF(alpha=10.0),
+    ).fit(df, y)
+    pipeline = RegressorPipelineDF(
+        preprocessing=StandardScalerDF(), regressor=RidgeDF(alpha=10.0)
+    ).fit(df, y)
+
+    assert pipeline_dedup.preprocessing["dedup"].n_duplicates_ == len(df) - len(x_dedup)
+    pd.testing.assert_series_equal(
+        pipeline_dedup.predict(df), pipeline.predict(df), check_exact=False
+    )
+    assert pipeline_dedup.preprocessing.transform(df).shape == df.shape
+
+    # preprocessing steps after de-duplication would ignore the merged counts
+    with pytest.raises(ValueError):
+        RegressorPipelineDF(
+            preprocessing=PipelineDF(
+                steps=[("dedup", DeduplicateDF()), ("scale", StandardScalerDF())]
+            ),
+            regressor=RidgeDF(alpha=10.0),
+        ).fit(df, y)
+
+
+def test_sampled_fit_df() -> None:
+    """ Test fitting a transformer to a sample of the observations """
+    rng = np.random.RandomState(42)
+    df = pd.DataFrame(data={"a": rng.normal(size=1000), "b": rng.normal(size=1000)})
+    y = pd.Series(np.repeat([0, 1], [900, 100]), name="target")
+
+    sampled = SampledFitDF(StandardScalerDF(), max_samples=100, random_state=42)
+    transformed = sampled.fit_transform(df)
+
+    assert sampled.n_samples_fit_ == 100
+    assert sampled.transformer.native_estimator.n_samples_seen_ == 100
+    assert transformed.index.equals(df.index)
+    assert sampled.feature_names_out_.tolist() == ["a", "b"]
+    assert sampled.feature_names_original_.tolist() == ["a", "b"]
+
+    # refitting to other features updates the feature lineage
+    sampled.fit(df.loc[:, ["b"]])
+    assert sampled.feature_names_original_.tolist() == ["b"]
+    sampled.fit(df)
+
+    # the sample is reproducible
+    np.testing.assert_array_equal(
+        sampled.transformer.native_estimator.mean_,
+        SampledFitDF(StandardScalerDF(), max_samples=100, random_state=42)
+        .fit(df)
+        .transformer.native_estimator.mean_,
+    )
+
+    # a share of the observations, stratified by the output
+    stratified = SampledFitDF(
+        StandardScalerDF(), max_samples=0.1, stratify=True, random_state=42
+    ).fit(df, y)
+    assert stratified.n_samples_fit_ == 100
+
+    if check_sklearn_version(minimum="0.24"):
+        # per-row fit parameters are sampled along with the observations
+        for sample_weight in [np.ones(1000), pd.Series(1.0, index=df.index)]:
+            weighted = SampledFitDF(
+                StandardScalerDF(), max_samples=100, random_state=42
+            ).fit(df, sample_weight=sample_weight)
+            np.testing.assert_array_almost_equal(
+                weighted.transformer.native_estimator.mean_,
+                sampled.transformer.native_estimator.mean_,
+            )
+
+    with pytest.raises(ValueError):
+        SampledFitDF(StandardScalerDF(), max_samples=1.5)
+    with pytest.raises(TypeError):
+        SampledFitDF("scaler")
+
+
+def test_streaming_scalers_df() -> None:
+    """ Test sketch-based scalers against their exact counterparts """
+    rng = np.random.RandomState(42)
+    df = pd.DataFrame(
+        data={"a": rng.normal(size=1000), "b": rng.exponential(size=1000)}
+    )
+    df.iloc[::10, 1] = np.nan
+
+    # exact results for up to sketch_size observations
+    for streaming, exact in [
+        (StreamingRobustScalerDF(), RobustScaler()),
+        (
+            StreamingRobustScalerDF(quantile_range=(10.0, 90.0)),
+            RobustScaler(quantile_range=(10.0, 90.0)),
+        ),
+        (
+            StreamingQuantileTransformerDF(n_quantiles=100),
+            QuantileTransformer(n_quantiles=100),
+        ),
+        (
+            StreamingQuantileTransformerDF(
+                n_quantiles=100, output_distribution="normal"
+            ),
+            QuantileTransformer(n_quantiles=100, output_distribution="normal"),
+        ),
+    ]:
+        transformed = streaming.fit_transform(df)
+        np.testing.assert_allclose(transformed.values, exact.fit_transform(df))
+        assert transformed.columns.equals(df.columns)
+        assert transformed.columns.name == "feature_out"
+        restored = streaming.inverse_transform(transformed)
+        assert restored.columns.name == "feature_in"
+        np.testing.assert_allclose(restored.values, df.values, atol=1e-9)
+
+    # partial fits over chunks and merged fits yield the same results
+    scaler = StreamingRobustScalerDF().fit(df)
+    chunked = StreamingRobustScalerDF()
+    for chunk in np.array_split(df, 4):
+        chunked.partial_fit(chunk)
+    merged = (
+        StreamingRobustScalerDF()
+        .fit(df.iloc[:500])
+        .merge(StreamingRobustScalerDF().fit(df.iloc[500:]))
+    )
+    for other in (chunked, merged):
+        assert other.n_samples_seen_ == len(df)
+        pd.testing.assert_series_equal(other.center_, scaler.center_)
+        pd.testing.assert_series_equal(other.scale_, scaler.scale_)
+
+    with pytest.raises(TypeError):
+        scaler.merge(StreamingQuantileTransformerDF().fit(df))
+
+    # accuracy and memory use of the sketches for larger data sets
+    df_large = pd.DataFrame(data={"a": rng.normal(size=200_000)})
+    sketched = StreamingQuantileTransformerDF(n_quantiles=100, sketch_size=500)
+    for chunk in np.array_split(df_large, 20):
+        sketched.partial_fit(chunk)
+
+    assert sketched.sketches_["a"].n_retained < 3 * 500 + 50
+    np.testing.assert_allclose(
+        sketched.transform(df_large).values,
+        QuantileTransformer(n_quantiles=100, subsample=len(df_large)).fit_transform(
+            df_large
+        ),
+        atol=0.02,
+    )
@@ -4,14 +4,16 @@ import numpy as np
 import pandas as pd
 import pytest
 import sklearn
-from pandas.testing import assert_frame_equal
-from sklearn.base import BaseEstimator
+from pandas.testing import assert_frame_equal, assert_series_equal
+from sklearn.base import BaseEstimator, clone
 from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import Normalizer
+from sklearn.preprocessing import Normalizer, StandardScaler
 
 import sklearndf.transformation
 from sklearndf import TransformerDF
 from sklearndf.classification import RandomForestClassifierDF
+from sklearndf.pipeline import PipelineDF
+from sklearndf.regression import DummyRegressorDF
 from sklearndf.transformation import (
     RFECVDF,
     RFEDF,
@@ -19,8 +21,10 @@ from sklearndf.transformation import (
     KBinsDiscretizerDF,
     NormalizerDF,
     OneHotEncoderDF,
+    OrdinalEncoderDF,
     SelectFromModelDF,
     SparseCoderDF,
+    StandardScalerDF,
 )
 from sklearndf.transformation.extra import OutlierRemoverDF
 from test import check_sklearn_version
@@ -122,6 +126,59 @@ def test_various_transformers(
     )
 
 
+def test_column_transformer_df_remainder() -> None:
+    """ Test column transformers passing through the remainder columns """
+
+    x = pd.DataFrame(
+        data=np.random.RandomState(42).normal(size=(20, 6)),
+        columns=[f"c{i}" for i in range(6)],
+    )
+
+    transformers = [("scale", ["c1", "c2"]), ("normalize", ["c5", "c0"])]
+
+    df_col_t = ColumnTransformerDF(
+        transformers=[
+            (name, NormalizerDF() if name == "normalize" else StandardScalerDF(), cols)
+            for name, cols in transformers
+        ],
+        remainder="passthrough",
+    )
+    non_df_col_t = ColumnTransformer(
+        transformers=[
+            (name, Normalizer() if name == "normalize" else StandardScaler(), cols)
+            for name, cols in transformers
+        ],
+        remainder="passthrough",
+    )
+
+    transformed_df = df_col_t.fit_transform(X=x)
+    transformed_non_df = non_df_col_t.fit_transform(X=x)
+
+    assert list(transformed_df.columns) == ["c1", "c2", "c5", "c0", "c3", "c4"]
+    assert df_col_t.feature_names_original_.to_dict() == {
+        column: column for column in x.columns
+    }
+    np.testing.assert_array_almost_equal(transformed_df.values, transformed_non_df)
+
+    # transforming column blocks with the fitted transformer gives the same result
+    assert_frame_equal(df_col_t.transform(x), transformed_df)
+    assert_frame_equal(df_col_t.transform(x.iloc[:, ::-1]), transformed_df)
+
+    # transformer weights are applied when transforming column blocks
+    transformer_weights = {"scale": 2.0, "normalize": 0.5, "remainder": 3.0}
+    df_col_t.set_params(transformer_weights=transformer_weights)
+    non_df_col_t.set_params(transformer_weights=transformer_weights)
+
+    transformed_df = df_col_t.fit_transform(X=x)
+    np.testing.assert_array_almost_equal(
+        transformed_df.values, non_df_col_t.fit_transform(X=x)
+    )
+    assert_frame_equal(df_col_t.transform(x), transformed_df)
+
+    with pytest.raises(ValueError):
+        ColumnTransformerDF(transformers=[], remainder=StandardScalerDF())
+
+
 def test_normalizer_df() -> None:
     x = [[4, 1, 2, 2], [1, 3, 9, 3], [5, 7, 5, 1]]
     test_df = pd.DataFrame(x)
@@ -165,6 +222,147 @@ def test_outlier_remover(df_outlier: pd.DataFrame) -> None:
     assert_frame_equal(df_transformed, df_transformed_expected)
 
 
+def test_outlier_remover_drop(df_outlier: pd.DataFrame) -> None:
+    y = pd.Series(np.arange(5.0), name="target")
+    sample_weight = pd.Series(np.arange(5.0) + 1.0)
+
+    outlier_remover = OutlierRemoverDF(iqr_multiple=2, mode="drop")
+    x_dropped, y_dropped, weight_dropped = outlier_remover.fit_transform_xy(
+        df_outlier, y, sample_weight
+    )
+    assert_frame_equal(x_dropped, df_outlier.iloc[1:4])
+    assert y_dropped.index.equals(x_dropped.index)
+    assert weight_dropped.tolist() == [2.0, 3.0, 4.0]
+
+    # plain transform preserves all observations
+    assert outlier_remover.transform(df_outlier).index.equals(df_outlier.index)
+
+    with pytest.raises(ValueError):
+        OutlierRemoverDF(mode="invalid")
+
+    # subsequent pipeline steps are fitted only to the remaining observations
+    pipeline = PipelineDF(
+        steps=[
+            ("outliers", OutlierRemoverDF(iqr_multiple=2, mode="drop")),
+            ("scaler", StandardScalerDF()),
+        ]
+    )
+    x_scaled, y_scaled, _ = pipeline.fit_transform_xy(df_outlier, y)
+    assert len(x_scaled) == len(y_scaled) == 3
+    assert pipeline["scaler"].native_estimator.n_samples_seen_ == 3
+    assert len(pipeline.transform_xy(df_outlier)[0]) == 3
+
+    # a final learner is fitted only to the remaining observations and weights
+    pipeline = PipelineDF(
+        steps=[
+            ("outliers", OutlierRemoverDF(iqr_multiple=2, mode="drop")),
+            ("scaler", StandardScalerDF()),
+            ("regressor", DummyRegressorDF()),
+        ]
+    ).fit(df_outlier, y, regressor__sample_weight=sample_weight)
+    assert pipeline["scaler"].native_estimator.n_samples_seen_ == 3
+    assert pipeline["regressor"].native_estimator.constant_.item() == pytest.approx(
+        np.average([1.0, 2.0, 3.0], weights=[2.0, 3.0, 4.0])
+    )
+
+    # sample weights for the final learner can also be passed as an array
+    pipeline.fit(df_outlier, y, regressor__sample_weight=sample_weight.values)
+    assert pipeline["regressor"].native_estimator.constant_.item() == pytest.approx(
+        np.average([1.0, 2.0, 3.0], weights=[2.0, 3.0, 4.0])
+    )
+
+    if check_sklearn_version(minimum="0.24"):
+        # intermediate steps are fitted with their own sample weights, if given
+        pipeline = PipelineDF(
+            steps=[("scaler", StandardScalerDF()), ("regressor", DummyRegressorDF())]
+        ).fit(
+            df_outlier,
+            y,
+            scaler__sample_weight=sample_weight,
+            regressor__sample_weight=sample_weight.values,
+        )
+        assert np.allclose(
+            pipeline["scaler"].native_estimator.mean_,
+            np.average(df_outlier.values, axis=0, weights=sample_weight),
+        )
+        assert pipeline["regressor"].native_estimator.constant_.item() == pytest.approx(
+            np.average(y, weights=sample_weight)
+        )
+
+        # own sample weights are matched with the observations remaining after
+        # preceding steps removed observations
+        for scaler_sample_weight in [sample_weight, sample_weight.values]:
+            pipeline = PipelineDF(
+                steps=[
+                    ("outliers", OutlierRemoverDF(iqr_multiple=2, mode="drop")),
+                    ("scaler", StandardScalerDF()),
+                    ("regressor", DummyRegressorDF()),
+                ]
+            ).fit(
+                df_outlier,
+                y,
+                scaler__sample_weight=scaler_sample_weight,
+                regressor__sample_weight=sample_weight,
+            )
+            assert np.allclose(
+                pipeline["scaler"].native_estimator.mean_,
+                np.average(df_outlier.values[1:4], axis=0, weights=[2.0, 3.0, 4.0]),
+            )
+            regressor = pipeline["regressor"].native_estimator
+            assert regressor.constant_.item() == pytest.approx(
+                np.average([1.0, 2.0, 3.0], weights=[2.0, 3.0, 4.0])
+            )
+
+
+def test_outlier_remover_partial_fit(df_outlier: pd.DataFrame) -> None:
+    outlier_remover = OutlierRemoverDF(iqr_multiple=2).fit(df_outlier)
+
+    # fitting over chunks, or merging the chunks, yields the same thresholds
+    chunked = OutlierRemoverDF(iqr_multiple=2)
+    for start in range(0, 5, 2):
+        chunked.partial_fit(df_outlier.iloc[start : start + 2])
+    merged = (
+        OutlierRemoverDF(iqr_multiple=2)
+        .fit(df_outlier.iloc[:3])
+        .merge(OutlierRemoverDF(iqr_multiple=2).fit(df_outlier.iloc[3:]))
+    )
+    for other in (chunked, merged):
+        assert_series_equal(other.threshold_low_, outlier_remover.threshold_low_)
+        assert_series_equal(other.threshold_high_, outlier_remover.threshold_high_)
+
+    # later chunks must have the same columns as the first chunk
+    with pytest.raises(ValueError):
+        chunked.partial_fit(df_outlier.iloc[:2, :3])
+
+    # pruned transformers do not share sketches with the original transformer
+    pruned = chunked._prune_features_in(df_outlier.columns[:2])
+    pruned.partial_fit(df_outlier.iloc[:2, :2])
+    assert pruned.sketches_["c0"].n == 7
+    assert chunked.sketches_["c0"].n == 5
+    assert chunked.n_samples_seen_ == 5
+
+    # thresholds for large data sets are estimated within a small rank error
+    rng = np.random.RandomState(42)
+    df_large = pd.DataFrame(data={"a": rng.normal(size=100_000)})
+    sketched = OutlierRemoverDF(iqr_multiple=0, sketch_size=200)
+    for chunk in np.array_split(df_large, 10):
+        sketched.partial_fit(chunk)
+    assert sketched.sketches_["a"].n == len(df_large)
+    assert not sketched.sketches_["a"].is_exact
+    ranks = (
+        df_large["a"].values[:, np.newaxis]
+        < [sketched.threshold_low_["a"], sketched.threshold_high_["a"]]
+    ).mean(axis=0)
+    np.testing.assert_allclose(ranks, [0.25, 0.75], atol=0.02)
+
+    # single pass over float frames
+    df_float = df_outlier.astype(float)
+    assert_frame_equal(
+        outlier_remover.transform(df_float),
+        outlier_remover.transform(df_outlier).astype(float),
+    )
+
+
 def test_one_hot_encoding() -> None:
     test_data_categorical = pd.DataFrame(
         data=[
@@ -223,3 +421,61 @@ def test_one_hot_encoding() -> None:
             }
         ).rename_axis(columns="feature_out"),
     )
+
+
+def test_categorical_encoding() -> None:
+    test_data = pd.DataFrame(
+        data=[
+            ["yes", "red", "child"],
+            ["yes", "blue", "father"],
+            ["no", "green", "mother"],
+            ["no", "red", "child"],
+        ],
+        columns=["a", "b", "c"],
+    )
+
+    # categorical columns with unused categories, and categories in non-sorted order
+    test_data_categorical = test_data.astype(
+        {
+            "a": "category",
+            "b": pd.CategoricalDtype(["red", "green", "blue", "purple"]),
+            "c": pd.CategoricalDtype(["mother", "father", "child", "uncle"]),
+        }
+    )
+
+    # the same values, with a category not seen during fit
+    test_data_unknown = test_data_categorical.copy()
+    test_data_unknown.loc[1, "b"] = "purple"
+
+    for encoder in [
+        OneHotEncoderDF(sparse=False),
+        OneHotEncoderDF(drop="first", sparse=False),
+        OneHotEncoderDF(handle_unknown="ignore", sparse=False),
+        OrdinalEncoderDF(),
+    ]:
+        encoder_categorical = clone(encoder).fit(test_data_categorical)
+        encoder.fit(test_data)
+
+        for expected, actual in zip(
+            encoder.native_estimator.categories_,
+            encoder_categorical.native_estimator.categories_,
+        ):
+            assert actual.tolist() == expected.tolist()
+
+        assert_frame_equal(
+            encoder_categorical.transform(test_data_categorical),
+            encoder.transform(test_data),
+        )
+        assert_frame_equal(
+            clone(encoder).fit_transform(test_data_categorical),
+            encoder.transform(test_data),
+        )
+
+        if getattr(encoder, "handle_unknown", "error") == "ignore":
+            assert_frame_equal(
+                encoder_categorical.transform(test_data_unknown),
+                encoder.transform(test_data_unknown.astype(object)),
+            )
+        else:
+            with pytest.raises(ValueError):
+                encoder_categorical.transform(test_data_unknown)